@@ -0,0 +1,301 @@
+import json
+import re
+
+from django.db.models import ProtectedError
+from django.forms import modelform_factory
+from django.forms.models import model_to_dict
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from jobinfo.forms import AppCycleForm, ApplicationForm, CompanyForm, JobRecruiterForm, JobSeekerForm, PositionForm
+from jobinfo.models import AppCycle, Application, Company, JobRecruiter, JobSeeker, Position, Season, Year
+from jobinfo.utils import MAX_PK, InvalidCursor, KeysetPageLinksMixin, KeysetPaginator, parse_pk
+
+FIELDS_RE = re.compile(r'^fields\[(?P<path>[\w.]+)\]$')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ApiResource:
+    # The JSON shape of a model. Foreign keys appear as primary keys
+    # unless they are named in include=, which embeds the related row
+    # from the same query. 'id' is always the primary key.
+
+    def __init__(self, name, model, fields, filters=None, form_class=None):
+        self.name = name
+        self.model = model
+        self.fields = ('id',) + tuple(fields)
+        self.filters = filters or {}
+        self.form_class = form_class or modelform_factory(model, fields='__all__')
+
+    @property
+    def list_url_name(self):
+        return 'jobinfo_api_%s_list_urlpattern' % self.name
+
+    @property
+    def detail_url_name(self):
+        return 'jobinfo_api_%s_detail_urlpattern' % self.name
+
+    def permission(self, action):
+        return '%s.%s_%s' % (self.model._meta.app_label, action, self.model._meta.model_name)
+
+    @staticmethod
+    def lookup(name):
+        return 'pk' if name == 'id' else name
+
+    def related(self, name):
+        if name not in self.fields or name == 'id':
+            return None
+        field = self.model._meta.get_field(name)
+        if not field.many_to_one:
+            return None
+        return API_MODELS[field.related_model]
+
+    def parse_fields(self, value, path=''):
+        if not value:
+            return self.fields
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError('Unknown field%s for %s: %s.' % (
+                's' if len(unknown) > 1 else '', path or 'the results', ', '.join(unknown)))
+        return ('id',) + tuple(name for name in self.fields if name in names and name != 'id')
+
+    # [(path, resource), ...] for include=a,b.c, parents before children,
+    # each parent added when only its child was asked for.
+    def parse_includes(self, value):
+        includes = {}
+        for dotted in filter(None, (part.strip() for part in (value or '').split(','))):
+            resource, path = self, ()
+            for name in dotted.split('.'):
+                related = resource.related(name)
+                if related is None:
+                    raise ApiError('Cannot include %r.' % dotted)
+                resource, path = related, path + (name,)
+                includes.setdefault(path, resource)
+        return sorted(includes.items(), key=lambda item: len(item[0]))
+
+    # The fields, includes and their fields asked for in a query string,
+    # as (fields, [(path, resource, fields), ...]).
+    def parse(self, query):
+        includes = self.parse_includes(query.get('include'))
+        known = {'.'.join(path) for path, resource in includes}
+        for key in query:
+            match = FIELDS_RE.match(key)
+            if match and match['path'] not in known:
+                raise ApiError('%s sets the fields of a relation that is not included.' % key)
+        return self.parse_fields(query.get('fields')), [
+            (path, resource, resource.parse_fields(query.get('fields[%s]' % '.'.join(path)), '.'.join(path)))
+            for path, resource in includes
+        ]
+
+    # What to pass to values(): the included rows come from joins in the
+    # same query.
+    def values(self, fields, includes):
+        lookups = [self.lookup(name) for name in fields]
+        for path, resource, include_fields in includes:
+            lookups += ['__'.join(path + (resource.lookup(name),)) for name in include_fields]
+        return lookups
+
+    def serialize(self, row, fields, includes):
+        data = {name: row[self.lookup(name)] for name in fields}
+        for path, resource, include_fields in includes:
+            parent = data
+            for name in path[:-1]:
+                parent = parent and parent[name]
+            if parent is None:
+                continue
+            prefix = '__'.join(path) + '__'
+            if row[prefix + 'pk'] is None:
+                parent[path[-1]] = None
+            else:
+                parent[path[-1]] = {name: row[prefix + resource.lookup(name)] for name in include_fields}
+        return data
+
+    def filter(self, queryset, query):
+        filters = {}
+        for kwarg, lookup in self.filters.items():
+            value = query.get(kwarg)
+            if value:
+                try:
+                    filters[lookup] = parse_pk(value)
+                except ValueError:
+                    raise ApiError('%s must be a primary key.' % kwarg)
+        return queryset.filter(**filters)
+
+
+API_RESOURCES = {resource.name: resource for resource in (
+    ApiResource('season', Season, ('season_sequence', 'season_name', 'updated_at')),
+    ApiResource('year', Year, ('year', 'updated_at')),
+    ApiResource(
+        'appCycle', AppCycle, ('year', 'season', 'updated_at'),
+        filters={'year': 'year', 'season': 'season'},
+        form_class=AppCycleForm),
+    ApiResource(
+        'position', Position, ('position_number', 'position_name', 'updated_at'),
+        form_class=PositionForm),
+    ApiResource(
+        'jobRecruiter', JobRecruiter, ('first_name', 'last_name', 'disambiguator', 'updated_at'),
+        form_class=JobRecruiterForm),
+    ApiResource(
+        'jobSeeker', JobSeeker, ('first_name', 'last_name', 'disambiguator', 'updated_at'),
+        form_class=JobSeekerForm),
+    ApiResource(
+        'company', Company,
+        ('company_name', 'appCycle', 'position', 'jobRecruiter', 'display_label', 'updated_at'),
+        filters={'appCycle': 'appCycle', 'position': 'position', 'jobRecruiter': 'jobRecruiter'},
+        form_class=CompanyForm),
+    ApiResource(
+        'application', Application, ('company', 'jobSeeker', 'display_label', 'updated_at'),
+        filters={
+            'appCycle': 'company__appCycle',
+            'company': 'company',
+            'jobRecruiter': 'company__jobRecruiter',
+            'jobSeeker': 'jobSeeker',
+        },
+        form_class=ApplicationForm),
+)}
+
+API_MODELS = {resource.model: resource for resource in API_RESOURCES.values()}
+
+
+# JSON views over an ApiResource. Anonymous requests get a 401 and
+# missing model permissions a 403 instead of the login redirect, and
+# every error is a JSON object with an 'error' or 'errors' key.
+class ApiMixin:
+    resource = None
+    permission_required = None
+    write_actions = {'POST': 'add', 'PUT': 'change', 'PATCH': 'change', 'DELETE': 'delete'}
+
+    @property
+    def model(self):
+        return self.resource.model
+
+    def get_permission_required(self):
+        action = self.write_actions.get(self.request.method)
+        if action is None:
+            return [self.permission_required]
+        return [self.resource.permission(action)]
+
+    def error(self, message, status):
+        return JsonResponse({'error': message}, status=status)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.error('Authentication required.', 401)
+        if not request.user.has_perms(self.get_permission_required()):
+            return self.error('Permission denied.', 403)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return self.error(error.message, error.status)
+        except Http404 as error:
+            return self.error(str(error), 404)
+
+    def parse(self):
+        fields, includes = self.resource.parse(self.request.GET)
+        for path, resource, include_fields in includes:
+            if not self.request.user.has_perm(resource.permission('view')):
+                raise ApiError('Permission denied for %s.' % '.'.join(path), 403)
+        return fields, includes
+
+    def get_body(self):
+        try:
+            body = json.loads(self.request.body or b'null')
+        except ValueError:
+            raise ApiError('The body is not valid JSON.')
+        if not isinstance(body, dict):
+            raise ApiError('The body must be a JSON object.')
+        return body
+
+    def serialize_object(self, pk, fields=None, includes=()):
+        fields = fields or self.resource.fields
+        row = self.model._default_manager.filter(pk=pk).values(*self.resource.values(fields, includes)).first()
+        if row is None:
+            raise Http404('No %s matches the given query.' % self.model._meta.verbose_name)
+        return self.resource.serialize(row, fields, includes)
+
+    def save_form(self, data, instance=None, status=200):
+        form = self.resource.form_class(data, instance=instance)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+        obj = form.save()
+        response = JsonResponse(self.serialize_object(obj.pk), status=status)
+        response['Location'] = reverse(self.resource.detail_url_name, kwargs={'pk': obj.pk})
+        return response
+
+
+class PrimaryKeyPaginator(KeysetPaginator):
+    def __init__(self, object_list, per_page):
+        super().__init__(object_list, per_page, ['pk'])
+
+    @staticmethod
+    def valid_value(value):
+        return isinstance(value, int) and not isinstance(value, bool) and 0 < value <= MAX_PK
+
+
+# One values() query per page, ordered and paginated by primary key,
+# which also makes the cursor stable while rows are added.
+class ApiListMixin(ApiMixin, KeysetPageLinksMixin):
+    paginate_by = 100
+    max_paginate_by = 500
+    limit_kwarg = 'limit'
+
+    def get_limit(self):
+        value = self.request.GET.get(self.limit_kwarg)
+        if not value:
+            return self.paginate_by
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.max_paginate_by:
+            raise ApiError('%s must be between 1 and %d.' % (self.limit_kwarg, self.max_paginate_by))
+        return limit
+
+    def get(self, request):
+        fields, includes = self.parse()
+        queryset = self.resource.filter(self.model._default_manager.all(), request.GET)
+        paginator = PrimaryKeyPaginator(
+            queryset.values(*self.resource.values(fields, includes)), self.get_limit())
+        try:
+            page = paginator.page(request.GET.get(self.page_kwarg))
+        except InvalidCursor:
+            raise ApiError('Invalid cursor.')
+        return JsonResponse({
+            'results': [self.resource.serialize(row, fields, includes) for row in page],
+            'next': self.next_page(page),
+            'previous': self.previous_page(page),
+        })
+
+    def post(self, request):
+        return self.save_form(self.get_body(), status=201)
+
+
+class ApiDetailMixin(ApiMixin):
+    def get_object(self):
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
+
+    def get(self, request, pk):
+        return JsonResponse(self.serialize_object(pk, *self.parse()))
+
+    def put(self, request, pk):
+        return self.save_form(self.get_body(), self.get_object())
+
+    def patch(self, request, pk):
+        obj = self.get_object()
+        return self.save_form({**model_to_dict(obj), **self.get_body()}, obj)
+
+    def delete(self, request, pk):
+        try:
+            self.get_object().delete()
+        except ProtectedError as error:
+            raise ApiError('%d related objects refer to this %s.' % (
+                len(error.protected_objects), self.model._meta.verbose_name), 409)
+        return HttpResponse(status=204)
@@ -1,6 +1,30 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def install_search(sender, using, **kwargs):
+    from jobinfo.search import install
+    install(using)
+
+
+def install_change_triggers(sender, using, **kwargs):
+    from jobinfo.changes import install
+    install(using)
 
 
 class JobinfoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "jobinfo"
+
+    def ready(self):
+        from jobinfo.signals import LABEL_DEPENDENCIES, bump_version, refresh_display_labels
+        from jobinfo.sqlite import configure_connection
+        for model in self.get_models():
+            post_save.connect(bump_version, sender=model)
+            post_delete.connect(bump_version, sender=model)
+        for model in LABEL_DEPENDENCIES:
+            post_save.connect(refresh_display_labels, sender=model)
+        post_migrate.connect(install_search, sender=self)
+        post_migrate.connect(install_change_triggers, sender=self)
+        connection_created.connect(configure_connection)
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Now
+
+from jobinfo.models import AppCycle, Application, ArchivedApplication, ArchivedCompany, Company
+from jobinfo.utils import bump_model_version
+
+ArchiveResult = namedtuple('ArchiveResult', ['companies', 'applications'])
+
+ARCHIVE_MODELS = (ArchivedCompany, ArchivedApplication)
+HOT_MODELS = (Company, Application)
+
+
+class RestoreConflict(Exception):
+    def __init__(self, cycle, companies):
+        super().__init__('%d archived companies of %s are already live: %s.' % (
+            len(companies), cycle, ', '.join(company.display_label for company in companies)))
+        self.cycle = cycle
+        self.companies = companies
+
+
+def copy_sql(connection, source, target, field_name, count):
+    quote = connection.ops.quote_name
+    fields = source._meta.concrete_fields
+    return 'INSERT INTO %s (%s) SELECT %s FROM %s WHERE %s IN (%s)' % (
+        quote(target._meta.db_table),
+        ', '.join(quote(target._meta.get_field(field.name).column) for field in fields),
+        ', '.join(quote(field.column) for field in fields),
+        quote(source._meta.db_table),
+        quote(source._meta.get_field(field_name).column),
+        ', '.join(['%s'] * count))
+
+
+def delete_sql(connection, model, field_name, count):
+    quote = connection.ops.quote_name
+    return 'DELETE FROM %s WHERE %s IN (%s)' % (
+        quote(model._meta.db_table), quote(model._meta.get_field(field_name).column), ', '.join(['%s'] * count))
+
+
+# Moves the companies with primary keys pks and their applications from
+# one pair of tables to the other: two INSERT ... SELECT and two DELETE.
+def move_batch(connection, source, target, pks):
+    (source_company, source_application), (target_company, target_application) = source, target
+    with connection.cursor() as cursor:
+        cursor.execute(copy_sql(connection, source_company, target_company, 'company_id', len(pks)), pks)
+        cursor.execute(copy_sql(connection, source_application, target_application, 'company', len(pks)), pks)
+        applications = cursor.rowcount
+        cursor.execute(delete_sql(connection, source_application, 'company', len(pks)), pks)
+        cursor.execute(delete_sql(connection, source_company, 'company_id', len(pks)), pks)
+        companies = cursor.rowcount
+    return companies, applications
+
+
+# Archived companies that unique_company would refuse to restore,
+# because a live company with the same name and position has been
+# added to the cycle since.
+def restore_conflicts(cycle):
+    return ArchivedCompany.objects.filter(appCycle=cycle).filter(Exists(Company.objects.filter(
+        appCycle=OuterRef('appCycle'), position=OuterRef('position'), company_name=OuterRef('company_name'))))
+
+
+def check_restore(cycle, pks=None):
+    conflicts = restore_conflicts(cycle)
+    if pks is not None:
+        conflicts = conflicts.filter(pk__in=pks)
+    conflicts = list(conflicts.only('company_id', 'display_label'))
+    if conflicts:
+        raise RestoreConflict(cycle, conflicts)
+
+
+# One transaction per batch of batch_size companies, so the write lock
+# is never held for a whole cycle. An interrupted move leaves whole
+# batches on either side and is finished by running it again. check is
+# called with each batch's primary keys before anything moves.
+def move_cycle(cycle, source, target, batch_size, check=None):
+    connection = connections[router.db_for_write(Company)]
+    companies = applications = 0
+    while True:
+        with transaction.atomic(using=connection.alias):
+            pks = list(source[0]._default_manager.using(connection.alias).filter(
+                appCycle=cycle).order_by().values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            if check is not None:
+                check(pks)
+            moved = move_batch(connection, source, target, pks)
+        companies += moved[0]
+        applications += moved[1]
+    if companies:
+        for model in HOT_MODELS + ARCHIVE_MODELS:
+            bump_model_version(model)
+    return ArchiveResult(companies, applications)
+
+
+def set_archived_at(cycle, archived_at):
+    AppCycle.objects.filter(pk=cycle.pk).update(archived_at=archived_at, updated_at=Now())
+    bump_model_version(AppCycle)
+    cycle.refresh_from_db(fields=['archived_at', 'updated_at'])
+
+
+# The cycle is marked first, which keeps new companies out of it while
+# its rows move.
+def archive_cycle(cycle, batch_size=500):
+    if cycle.archived_at is None:
+        set_archived_at(cycle, Now())
+    return move_cycle(cycle, HOT_MODELS, ARCHIVE_MODELS, batch_size)
+
+
+# Raises RestoreConflict, before any row has moved, when a live company
+# would collide with an archived one. Each batch is checked again in its
+# own transaction, which a company added halfway through cannot slip
+# past.
+def restore_cycle(cycle, batch_size=500):
+    check_restore(cycle)
+    result = move_cycle(cycle, ARCHIVE_MODELS, HOT_MODELS, batch_size,
+                        check=lambda pks: check_restore(cycle, pks))
+    if cycle.archived_at is not None:
+        set_archived_at(cycle, None)
+    return result
@@ -0,0 +1,136 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.views import View
+
+from jobinfo.changes import atable_changes
+from jobinfo.utils import InvalidCursor
+
+
+# Async versions of the read-only views, for ASGI. Each mixin goes in
+# front of the sync view it replaces and reuses its querysets, templates
+# and context; the handler renders the TemplateResponse in a thread.
+# Django 4.1 has no async auth API, so reading request.user and checking
+# permissions take one thread hop, which also loads the permission set
+# that the navigation and the ETag read later.
+class AsyncAccessMixin:
+    def has_access(self):
+        user = self.request.user
+        if not user.is_authenticated:
+            return False
+        user.get_all_permissions()
+        return self.has_permission()
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not await sync_to_async(self.has_access)():
+            return self.handle_no_permission()
+        # In place of the sync LoginRequiredMixin and PermissionRequiredMixin.
+        return await View.dispatch(self, request, *args, **kwargs)
+
+
+class AsyncConditionalGetMixin:
+    async def aget_changes(self):
+        generations, last_modified = await atable_changes(self.get_change_models(), request=self.request)
+        updated_at = await self.get_updated_at().afirst() if self.is_detail() else None
+        return generations, last_modified, updated_at
+
+    async def get(self, request, *args, **kwargs):
+        validators = self.get_validators(*await self.aget_changes())
+        response = self.get_not_modified(*validators)
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+        return self.add_validators(response, *validators)
+
+
+# Goes before AsyncConditionalGetMixin.
+class AsyncArchiveDetailMixin:
+    async def aget_object(self):
+        if not self.in_archive:
+            try:
+                return await super().aget_object()
+            except Http404:
+                pass
+        queryset = self.get_archive_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404('No %s found matching the query' % queryset.model._meta.verbose_name)
+
+    async def aget_changes(self):
+        generations, last_modified, updated_at = await super().aget_changes()
+        if updated_at is None:
+            updated_at = await self.get_archive_updated_at().afirst()
+            self.in_archive = updated_at is not None
+        return generations, last_modified, updated_at
+
+
+class AsyncPaginatedListMixin:
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty())
+        number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page = await paginator.apage(number)
+        except InvalidPage as e:
+            raise Http404('Invalid page (%s): %s' % (number, e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.paginated
+
+    async def get(self, request, *args, **kwargs):
+        if request.GET.get(self.stream_kwarg):
+            return await sync_to_async(self.stream)(request)
+        self.object_list = self.get_queryset()
+        self.paginated = await self.apaginate_queryset(
+            self.object_list, self.get_paginate_by(self.object_list))
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncKeysetListMixin:
+    async def get(self, request, *args, **kwargs):
+        paginator = self.get_paginator()
+        try:
+            page = await paginator.apage(
+                request.GET.get(self.page_kwarg))
+        except InvalidCursor:
+            page = await paginator.apage(None)
+        return TemplateResponse(
+            request, self.template_name, self.get_context_data(page))
+
+
+class AsyncDetailMixin:
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404('No %s found matching the query' % queryset.model._meta.verbose_name)
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(
+            self.get_context_data(object=self.object))
+
+
+class AsyncChildListMixin(AsyncDetailMixin):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        try:
+            self.child_page = await self.get_child_paginator().apage(
+                request.GET.get(self.page_kwarg) or 1)
+        except InvalidPage:
+            raise Http404('Invalid page.')
+        queryset = self.get_archived_child_queryset()
+        self.archived_children = [] if queryset is None else [
+            obj async for obj in queryset[:self.archived_preview_size + 1]]
+        return self.render_to_response(
+            self.get_context_data(object=self.object))
+
+    def get_child_page(self):
+        return self.child_page
+
+    def get_archived_children(self):
+        return self.archived_children
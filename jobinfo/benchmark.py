@@ -0,0 +1,173 @@
+import math
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.apps import apps
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from jobinfo.middleware import QueryRecorder
+from jobinfo.urls import urlpatterns
+from jobinfo.utils import AutocompleteMixin
+
+USERNAME = 'jobinfo-benchmark-%s'
+
+
+def percentile(ordered, fraction):
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+class Target:
+    def __init__(self, pattern, pks, term):
+        self.name = pattern.name
+        self.view_class = pattern.callback.view_class
+        self.view_initkwargs = pattern.callback.view_initkwargs
+        entity = str(pattern.pattern).removeprefix('api/').split('/', 1)[0]
+        kwargs = {}
+        if 'pk' in pattern.pattern.converters:
+            kwargs['pk'] = pks.get(entity)
+        self.path = reverse(self.name, kwargs=kwargs) if None not in kwargs.values() else None
+        self.query = {}
+        if issubclass(self.view_class, AutocompleteMixin):
+            self.query[self.view_class.search_kwarg] = term
+        elif 'search' in self.name:
+            self.query['q'] = term
+
+    @property
+    def permissions(self):
+        required = self.view_initkwargs.get(
+            'permission_required', getattr(self.view_class, 'permission_required', None)) or ()
+        return {required} if isinstance(required, str) else set(required)
+
+
+class Benchmark:
+    def __init__(self, iterations=20, warmup=2, term='Smi', pks=None, select=lambda name: True):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.term = term
+        self.pks = self.default_pks()
+        self.pks.update(pks or {})
+        self.targets = [Target(pattern, self.pks, term) for pattern in urlpatterns if select(pattern.name)]
+        self.clients = {}
+
+    def default_pks(self):
+        pks = {}
+        for model in apps.get_app_config('jobinfo').get_models():
+            entity = model._meta.object_name[0].lower() + model._meta.object_name[1:]
+            pks[entity] = model._default_manager.order_by('pk').values_list('pk', flat=True).first()
+        return pks
+
+    # The group with the fewest permissions that still grants the view's,
+    # so each view is measured the way its least privileged user sees it.
+    def group_for(self, permissions):
+        for group in Group.objects.order_by('name'):
+            granted = {'%s.%s' % (app_label, codename) for app_label, codename in
+                       group.permissions.values_list('content_type__app_label', 'codename')}
+            if permissions <= granted:
+                yield len(granted), group.name, group
+
+    def client_for(self, target):
+        candidates = sorted(self.group_for(target.permissions), key=lambda candidate: candidate[:2])
+        if not candidates:
+            return None, None
+        group = candidates[0][2]
+        if group.name not in self.clients:
+            user, created = User.objects.get_or_create(username=USERNAME % group.name)
+            if created:
+                user.set_unusable_password()
+                user.save()
+            user.groups.set([group])
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            self.clients[group.name] = client
+        return group.name, self.clients[group.name]
+
+    def request(self, client, target):
+        recorder = QueryRecorder(0)
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = client.get(target.path, target.query)
+            size = len(b''.join(response.streaming_content) if response.streaming else response.content)
+        return time.perf_counter() - start, recorder.count, response.status_code, size
+
+    def measure(self, target):
+        group, client = self.client_for(target)
+        if target.path is None or client is None:
+            return {'path': target.path, 'group': group, 'skipped': True}
+        for _ in range(self.warmup):
+            self.request(client, target)
+        timings, queries = [], []
+        for _ in range(self.iterations):
+            elapsed, count, status, size = self.request(client, target)
+            timings.append(elapsed * 1000)
+            queries.append(count)
+        tracemalloc.start()
+        try:
+            self.request(client, target)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        timings.sort()
+        return {
+            'path': target.path,
+            'query': target.query,
+            'group': group,
+            'status': status,
+            'bytes': size,
+            'p50_ms': round(percentile(timings, 0.50), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'p99_ms': round(percentile(timings, 0.99), 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'queries': max(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def run(self, progress=None):
+        results = {}
+        for target in self.targets:
+            results[target.name] = self.measure(target)
+            if progress:
+                progress(target.name, results[target.name])
+        return {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'iterations': self.iterations,
+                'term': self.term,
+                'pks': self.pks,
+                'rows': {model.__name__: model._default_manager.count()
+                         for model in apps.get_app_config('jobinfo').get_models()},
+            },
+            'results': results,
+        }
+
+
+# Returns (url name, metric, baseline, current, percent change) for every
+# new error status and every metric that grew by more than threshold
+# percent, or for queries, at all. Timings also have to grow by
+# min_delta_ms so scheduler jitter on fast views is not reported.
+def regressions(current, baseline, threshold, min_delta_ms=2.0):
+    found = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or result.get('skipped') or before.get('skipped'):
+            continue
+        if result['status'] != before['status']:
+            if result['status'] >= 400:
+                found.append((name, 'status', before['status'], result['status'], None))
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'peak_kb', 'queries'):
+            old, new = before[metric], result[metric]
+            limit = old if metric == 'queries' else old * (1 + threshold / 100)
+            if metric.endswith('_ms'):
+                limit = max(limit, old + min_delta_ms)
+            if new > limit:
+                change = (new - old) / old * 100 if old else math.inf
+                found.append((name, metric, old, new, change))
+    return found
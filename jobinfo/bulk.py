@@ -0,0 +1,113 @@
+import uuid
+from collections import namedtuple
+
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from jobinfo.models import Application, Company
+from jobinfo.utils import bump_model_version
+
+BulkApplyResult = namedtuple('BulkApplyResult', ['created', 'existing'])
+RolloverResult = namedtuple('RolloverResult', ['created', 'existing'])
+ReassignResult = namedtuple('ReassignResult', ['moved', 'deleted'])
+
+
+# Applies job_seeker to every company in companies with one
+# bulk_create(ignore_conflicts=True), so companies unique_application
+# already pairs with the seeker, including any written concurrently,
+# are skipped rather than failing the batch. The new rows carry a label
+# unique to this call until the labels are refreshed, so re-querying by
+# it finds exactly the ones this call created. Returns company primary
+# keys in the order of companies.
+def bulk_apply(job_seeker, companies, batch_size=500):
+    marker = '\x00bulk_apply:%s' % uuid.uuid4().hex
+    with transaction.atomic():
+        company_ids = list(companies.values_list('pk', flat=True))
+        Application.objects.bulk_create(
+            [Application(jobSeeker=job_seeker, company_id=pk, display_label=marker) for pk in company_ids],
+            batch_size=batch_size, ignore_conflicts=True)
+        inserted = Application.objects.filter(jobSeeker=job_seeker, display_label=marker)
+        created = set(inserted.values_list('company_id', flat=True))
+        if created:
+            inserted.refresh_display_labels()
+    if created:
+        bump_model_version(Application)
+    return BulkApplyResult(
+        [pk for pk in company_ids if pk in created],
+        [pk for pk in company_ids if pk not in created],
+    )
+
+
+# The source cycle's companies split into those a rollover would copy
+# and those unique_company already has in the target cycle.
+def rollover_plan(source, target):
+    companies = Company.objects.filter(appCycle=source).annotate(in_target=Exists(Company.objects.filter(
+        appCycle=target, position=OuterRef('position'), company_name=OuterRef('company_name'))))
+    return companies.filter(in_target=False), companies.filter(in_target=True)
+
+
+def rollover_sql(connection):
+    quote = connection.ops.quote_name
+    columns = [quote(Company._meta.get_field(name).column) for name in (
+        'company_name', 'appCycle', 'position', 'jobRecruiter', 'display_label', 'sort_key', 'updated_at')]
+    return (
+        'INSERT INTO %(table)s (%(columns)s) '
+        'SELECT %(name)s, %%s, %(position)s, %(recruiter)s, \'\', \'\', %%s FROM %(table)s WHERE %(cycle)s = %%s '
+        'ON CONFLICT DO NOTHING' % {
+            'table': quote(Company._meta.db_table),
+            'columns': ', '.join(columns),
+            'name': columns[0],
+            'cycle': columns[1],
+            'position': columns[2],
+            'recruiter': columns[3],
+        })
+
+
+# Copies the source cycle's companies, with the same name, position and
+# recruiter, into the target cycle with one INSERT ... SELECT that skips
+# those unique_company already has there. The copies arrive without a
+# label, like the rows importers write, and get theirs from one UPDATE.
+# No signals are sent, so the cache version is bumped here; the change
+# triggers see the insert on their own.
+def rollover(source, target):
+    if source.pk == target.pk:
+        raise ValueError('Cannot roll an application cycle over into itself.')
+    if source.archived_at is not None:
+        raise ValueError('Cannot roll companies over from an archived application cycle.')
+    if target.archived_at is not None:
+        raise ValueError('Cannot roll companies over into an archived application cycle.')
+    connection = connections[router.db_for_write(Company)]
+    with transaction.atomic(using=connection.alias):
+        total = Company.objects.using(connection.alias).filter(appCycle=source).count()
+        with connection.cursor() as cursor:
+            cursor.execute(rollover_sql(connection), [
+                target.pk, connection.ops.adapt_datetimefield_value(timezone.now()), source.pk])
+            created = cursor.rowcount
+        if created:
+            Company.objects.using(connection.alias).filter(
+                appCycle=target, display_label='').refresh_display_labels()
+    if created:
+        bump_model_version(Company)
+    return RolloverResult(created, total - created)
+
+
+# Moves source's companies, or those of them in companies, to target
+# with one UPDATE. Labels and sort keys do not name the recruiter, so
+# they stay as they are. With delete_source, source is deleted in the
+# same transaction once it has no companies left, archived ones
+# included; otherwise it is kept.
+def reassign(source, target, companies=None, delete_source=False):
+    if source.pk == target.pk:
+        raise ValueError('Cannot reassign companies to the job recruiter they belong to.')
+    if companies is None:
+        companies = Company.objects.all()
+    with transaction.atomic():
+        moved = companies.filter(jobRecruiter=source).update(jobRecruiter=target, updated_at=Now())
+        deleted = delete_source and not source.companies.exists() and not source.archived_companies.exists()
+        if deleted:
+            source.delete()
+    if moved:
+        bump_model_version(Company)
+    return ReassignResult(moved, deleted)
@@ -0,0 +1,135 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from jobinfo.models import TableChange
+
+NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def tracked_models():
+    return [model for model in apps.get_app_config('jobinfo').get_models() if model is not TableChange]
+
+
+# (table, columns) for the auth tables a user's permission set is read
+# from; see jobinfo.permissions. Logging in updates auth_user, so only
+# the columns ModelBackend looks at are watched there. Deleting a group
+# or permission cascades to the through tables.
+def permission_tables():
+    user_model = get_user_model()
+    return [
+        (user_model.groups.through._meta.db_table, None),
+        (user_model.user_permissions.through._meta.db_table, None),
+        (Group.permissions.through._meta.db_table, None),
+        (user_model._meta.db_table, ('is_active', 'is_superuser')),
+    ]
+
+
+def trigger_names(table):
+    return [table + suffix for suffix in ('_change_ai', '_change_ad', '_change_au')]
+
+
+def install_sql(table, columns=None):
+    bump = 'UPDATE "%s" SET generation = generation + 1, changed_at = %s WHERE table_name = \'%s\';' % (
+        TableChange._meta.db_table, NOW, table)
+    update = 'UPDATE OF %s' % ', '.join('"%s"' % column for column in columns) if columns else 'UPDATE'
+    return [
+        'INSERT OR IGNORE INTO "%s" (table_name, generation, changed_at) VALUES (\'%s\', 0, %s)' % (
+            TableChange._meta.db_table, table, NOW),
+    ] + [
+        'CREATE TRIGGER IF NOT EXISTS "%s" AFTER %s ON "%s" BEGIN %s END' % (name, event, table, bump)
+        for name, event in zip(trigger_names(table), ('INSERT', 'DELETE', update))
+    ]
+
+
+def install(using=DEFAULT_DB_ALIAS):
+    # Idempotent, and run after every migrate because migrations that
+    # remake a table on SQLite drop its triggers.
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing = {name for (name,) in cursor.fetchall()}
+        if TableChange._meta.db_table not in existing:
+            return
+        tables = [(model._meta.db_table, None) for model in tracked_models()] + permission_tables()
+        for table, columns in tables:
+            if table in existing:
+                for statement in install_sql(table, columns):
+                    cursor.execute(statement)
+
+
+def _table_changes(models, using):
+    return TableChange.objects.using(using).filter(
+        table_name__in=[model._meta.db_table for model in models]
+    ).order_by('table_name').values_list('table_name', 'generation', 'changed_at')
+
+
+# [(table, generation), ...] of the permission tables, always from the
+# primary, or [] where the triggers are not installed.
+def permission_generations():
+    return list(TableChange.objects.using(DEFAULT_DB_ALIAS).filter(
+        table_name__in=[table for table, columns in permission_tables()]
+    ).order_by('table_name').values_list('table_name', 'generation'))
+
+
+def _summarize(rows):
+    return [row[:2] for row in rows], max((row[2] for row in rows), default=None)
+
+
+# What a request has read already, so the fragments of a page are keyed
+# on the same generations as its ETag without reading them again.
+def _memo(request, models):
+    memo = request.__dict__.setdefault('jobinfo_table_changes', {}) if request is not None else {}
+    return memo, tuple(sorted(model._meta.db_table for model in models))
+
+
+# (generations, last changed) for the tables behind a page; either
+# changes whenever any row in one of them does. They are read from the
+# same database as the page itself, once per request when it is given.
+def table_changes(models, using=None, request=None):
+    memo, key = _memo(request, models)
+    if key not in memo:
+        memo[key] = _summarize(list(_table_changes(models, using)))
+    generations, last_modified = memo[key]
+    return list(generations), last_modified
+
+
+async def atable_changes(models, using=None, request=None):
+    memo, key = _memo(request, models)
+    if key not in memo:
+        memo[key] = _summarize([row async for row in _table_changes(models, using)])
+    generations, last_modified = memo[key]
+    return list(generations), last_modified
+
+
+def _covered(request, tables):
+    memo = request.__dict__.get('jobinfo_table_changes', {}) if request is not None else {}
+    for key, (generations, last_modified) in memo.items():
+        if tables <= set(key):
+            return [row for row in generations if row[0] in tables]
+    return None
+
+
+def _table_generations(tables, using):
+    return TableChange.objects.using(using).filter(
+        table_name__in=tables
+    ).order_by('table_name').values_list('table_name', 'generation')
+
+
+# [(table, generation), ...] for a set of table names, taken from what
+# the request has read for its ETag when that covers them.
+def table_generations(tables, using=None, request=None):
+    generations = _covered(request, set(tables))
+    if generations is None:
+        generations = list(_table_generations(tables, using))
+    return generations
+
+
+async def atable_generations(tables, using=None, request=None):
+    generations = _covered(request, set(tables))
+    if generations is None:
+        generations = [row async for row in _table_generations(tables, using)]
+    return generations
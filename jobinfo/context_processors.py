@@ -0,0 +1,7 @@
+from django.utils.functional import SimpleLazyObject
+
+from jobinfo.permissions import navigation_for
+
+
+def navigation(request):
+    return {'jobinfo_navigation': SimpleLazyObject(lambda: navigation_for(request.user))}
@@ -1,8 +1,38 @@
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.urls import reverse
 
 from jobinfo.models import JobRecruiter, Company, Position, AppCycle, JobSeeker, Application
 
 
+class AutocompleteSelect(forms.Select):
+    class Media:
+        js = ('jobinfo/autocomplete.js',)
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        # Only the selected rows are rendered; the rest are fetched on demand.
+        selected = [v for v in value if v not in ('', None)]
+        options = [self.create_option(name, '', '---------', not selected, 0)]
+        if selected:
+            try:
+                objects = list(self.choices.queryset.filter(pk__in=selected))
+            except (TypeError, ValueError, ValidationError):
+                objects = []
+            for index, obj in enumerate(objects, start=1):
+                options.append(self.create_option(name, obj.pk, str(obj), True, index))
+        return [(None, options, 0)]
+
+
 class JobRecruiterForm(forms.ModelForm):
     class Meta:
         model = JobRecruiter
@@ -26,6 +56,14 @@ class CompanyForm(forms.ModelForm):
     class Meta:
         model = Company
         fields = '__all__'
+        widgets = {
+            'position': AutocompleteSelect('jobinfo_position_autocomplete_urlpattern'),
+            'jobRecruiter': AutocompleteSelect('jobinfo_jobRecruiter_autocomplete_urlpattern'),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['appCycle'].queryset = AppCycle.objects.for_display().active()
 
     def clean_company_name(self):
         return self.cleaned_data['company_name'].strip()
@@ -72,3 +110,80 @@ class ApplicationForm(forms.ModelForm):
     class Meta:
         model = Application
         fields = '__all__'
+        widgets = {
+            'jobSeeker': AutocompleteSelect('jobinfo_jobSeeker_autocomplete_urlpattern'),
+            'company': AutocompleteSelect('jobinfo_company_autocomplete_urlpattern'),
+        }
+
+
+# One seeker and the companies to apply them to, chosen by any of the
+# filters. Capped so one request cannot insert an unbounded batch.
+class BulkApplyForm(forms.Form):
+    filter_fields = ('appCycle', 'position', 'jobRecruiter')
+
+    jobSeeker = forms.ModelChoiceField(
+        JobSeeker.objects.all(), widget=AutocompleteSelect('jobinfo_jobSeeker_autocomplete_urlpattern'))
+    appCycle = forms.ModelChoiceField(AppCycle.objects.for_display(), required=False)
+    position = forms.ModelChoiceField(
+        Position.objects.all(), required=False, widget=AutocompleteSelect('jobinfo_position_autocomplete_urlpattern'))
+    jobRecruiter = forms.ModelChoiceField(
+        JobRecruiter.objects.all(), required=False,
+        widget=AutocompleteSelect('jobinfo_jobRecruiter_autocomplete_urlpattern'))
+
+    def get_filters(self):
+        return {name: self.cleaned_data[name] for name in self.filter_fields if self.cleaned_data.get(name)}
+
+    def get_companies(self):
+        return Company.objects.filter(**self.get_filters())
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if any(name in self.errors for name in self.filter_fields):
+            return cleaned_data
+        if not self.get_filters():
+            raise ValidationError('Choose an application cycle, a position or a job recruiter.')
+        limit = getattr(settings, 'JOBINFO_BULK_APPLY_MAX_COMPANIES', 5000)
+        count = self.get_companies().count()
+        if not count:
+            raise ValidationError('No company matches these filters.')
+        if count > limit:
+            raise ValidationError('%d companies match these filters; narrow them to at most %d.' % (count, limit))
+        return cleaned_data
+
+
+# The cycle to copy a source cycle's companies into. Rollovers are
+# previewed unless dry_run is cleared.
+class RolloverForm(forms.Form):
+    target = forms.ModelChoiceField(AppCycle.objects.for_display().active(), label='Target application cycle')
+    dry_run = forms.BooleanField(required=False, initial=True, label='Only preview the companies to copy')
+
+    def __init__(self, source, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.source = source
+        self.fields['target'].queryset = self.fields['target'].queryset.exclude(pk=source.pk)
+
+
+# Where to move a job recruiter's companies, optionally only those of
+# one cycle or position.
+class ReassignForm(forms.Form):
+    filter_fields = ('appCycle', 'position')
+
+    target = forms.ModelChoiceField(
+        JobRecruiter.objects.all(), label='New job recruiter',
+        widget=AutocompleteSelect('jobinfo_jobRecruiter_autocomplete_urlpattern'))
+    appCycle = forms.ModelChoiceField(AppCycle.objects.for_display(), required=False)
+    position = forms.ModelChoiceField(
+        Position.objects.all(), required=False, widget=AutocompleteSelect('jobinfo_position_autocomplete_urlpattern'))
+    delete_source = forms.BooleanField(
+        required=False, label='Delete this job recruiter once no company is left')
+
+    def __init__(self, source, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.source = source
+        self.fields['target'].queryset = self.fields['target'].queryset.exclude(pk=source.pk)
+
+    def get_filters(self):
+        return {name: self.cleaned_data[name] for name in self.filter_fields if self.cleaned_data.get(name)}
+
+    def get_companies(self):
+        return Company.objects.filter(jobRecruiter=self.source, **self.get_filters())
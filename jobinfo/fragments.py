@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.shortcuts import render
+
+from jobinfo.changes import table_changes
+from jobinfo.utils import permissions_digest, upstream_models
+
+FRAGMENT_CACHE_ALIAS = 'fragments'
+
+
+def fragment_cache_enabled():
+    return getattr(settings, 'JOBINFO_FRAGMENT_CACHE', True)
+
+
+def fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+# Keyed on the change generations of the model's table and the tables
+# its labels come from. They are kept in the database, so a fragment
+# cached by one worker is never served after a write made by another,
+# and the request has usually read them for its ETag already.
+def fragment_key(name, model, vary_on=(), user=None, request=None):
+    generations, last_modified = table_changes(upstream_models(model), request=request)
+    vary_on = [generations, *vary_on]
+    if user is not None:
+        vary_on.append(permissions_digest(user))
+    return make_template_fragment_key('jobinfo:%s' % name, vary_on)
+
+
+# Hits and misses for the request being rendered, reported by the
+# query instrumentation middleware.
+def record_fragment(request, hit):
+    if request is None:
+        return
+    stats = request.__dict__.setdefault('jobinfo_fragments', {'hits': 0, 'misses': 0})
+    stats['hits' if hit else 'misses'] += 1
+
+
+# Answers a list page from the fragment cache before the view paginates,
+# so a hit costs neither the page query nor the count. The key is the
+# one the template's versioned_cache tag computes for fragment_name; on
+# a miss the view renders as usual and the tag caches the page. Streamed
+# pages are never cached.
+class CachedListMixin:
+    fragment_name = None
+
+    def get_cached_fragment(self):
+        if not fragment_cache_enabled() or getattr(self, 'stream_kwarg', None) in self.request.GET:
+            return None
+        return fragment_cache().get(fragment_key(
+            self.fragment_name, self.model, [self.request.get_full_path()], self.request.user, self.request))
+
+    def get(self, request, *args, **kwargs):
+        content = self.get_cached_fragment()
+        if content is None:
+            return super().get(request, *args, **kwargs)
+        record_fragment(request, True)
+        return render(request, self.template_name, {'view': self, 'cached_fragments': {self.fragment_name: content}})
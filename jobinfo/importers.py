@@ -0,0 +1,184 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from jobinfo.models import AppCycle, Application, Company, JobRecruiter, JobSeeker, Position
+from jobinfo.utils import bump_model_version
+
+
+class RowError(Exception):
+    pass
+
+
+def read_rows(path, file_format):
+    with open(path, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as error:
+                        yield RowError('invalid JSON: %s' % error)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def field(row, name, required=True):
+    value = row.get(name)
+    value = '' if value is None else str(value).strip()
+    if required and value == '':
+        raise RowError('missing %s' % name)
+    return value
+
+
+def integer(row, name):
+    value = field(row, name)
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError('%s is not an integer: %r' % (name, value))
+
+
+# bulk_create() skips save() and signals, so labels and cache
+# versions are brought up to date here.
+def bulk_insert(model, objects):
+    with transaction.atomic():
+        model.objects.bulk_create(objects, ignore_conflicts=True)
+        if hasattr(model, 'display_label'):
+            model.objects.filter(display_label='').refresh_display_labels()
+    bump_model_version(model)
+
+
+# Natural key -> primary key maps, each loaded once per run.
+class Lookups:
+    def __init__(self):
+        self._maps = {}
+
+    def _load(self, name, queryset):
+        if name not in self._maps:
+            self._maps[name] = {
+                tuple(values[:-1]): values[-1]
+                for values in queryset.order_by().iterator()
+            }
+        return self._maps[name]
+
+    def _resolve(self, name, queryset, key, label):
+        try:
+            return self._load(name, queryset)[key]
+        except KeyError:
+            raise RowError('unknown %s %s' % (label, ' / '.join(str(part) for part in key)))
+
+    # Archived cycles take no new companies; see jobinfo.archive.
+    def app_cycle(self, row):
+        key = (integer(row, 'year'), field(row, 'season'))
+        pk = self._resolve(
+            'appCycle',
+            AppCycle.objects.values_list('year__year', 'season__season_name', 'pk'),
+            key,
+            'app cycle')
+        archived = self._load('archivedAppCycle', AppCycle.objects.exclude(archived_at=None).values_list('pk', 'pk'))
+        if (pk,) in archived:
+            raise RowError('app cycle %s / %s is archived' % key)
+        return pk
+
+    def position(self, row):
+        return self._resolve(
+            'position',
+            Position.objects.values_list('position_number', 'position_name', 'pk'),
+            (field(row, 'position_number'), field(row, 'position_name')),
+            'position')
+
+    def _person(self, model, row, prefix):
+        return self._resolve(
+            model._meta.model_name,
+            model.objects.values_list('last_name', 'first_name', 'disambiguator', 'pk'),
+            (field(row, prefix + 'last_name'), field(row, prefix + 'first_name'),
+             field(row, prefix + 'disambiguator', required=False)),
+            model._meta.verbose_name)
+
+    def job_recruiter(self, row):
+        return self._person(JobRecruiter, row, 'recruiter_')
+
+    def job_seeker(self, row):
+        return self._person(JobSeeker, row, 'seeker_')
+
+    def company(self, row):
+        return self._resolve(
+            'company',
+            Company.objects.values_list(
+                'appCycle__year__year', 'appCycle__season__season_name',
+                'position__position_number', 'position__position_name',
+                'company_name', 'pk'),
+            (integer(row, 'year'), field(row, 'season'),
+             field(row, 'position_number'), field(row, 'position_name'),
+             field(row, 'company_name')),
+            'company')
+
+
+def build_person(model):
+    def build(row, lookups):
+        return model(
+            first_name=field(row, 'first_name'),
+            last_name=field(row, 'last_name'),
+            disambiguator=field(row, 'disambiguator', required=False),
+        )
+    return build
+
+
+def build_position(row, lookups):
+    return Position(
+        position_number=field(row, 'position_number'),
+        position_name=field(row, 'position_name'),
+    )
+
+
+def build_company(row, lookups):
+    return Company(
+        company_name=field(row, 'company_name'),
+        appCycle_id=lookups.app_cycle(row),
+        position_id=lookups.position(row),
+        jobRecruiter_id=lookups.job_recruiter(row),
+    )
+
+
+def build_application(row, lookups):
+    return Application(
+        company_id=lookups.company(row),
+        jobSeeker_id=lookups.job_seeker(row),
+    )
+
+
+IMPORTERS = {
+    'jobRecruiter': (JobRecruiter, build_person(JobRecruiter)),
+    'jobSeeker': (JobSeeker, build_person(JobSeeker)),
+    'position': (Position, build_position),
+    'company': (Company, build_company),
+    'application': (Application, build_application),
+}
+
+
+# Returns the number of rows handed to bulk_create and the
+# (row number, message) pairs of rows that could not be built.
+def import_batch(model, build, rows, first_row_number, lookups):
+    objects = []
+    errors = []
+    for row_number, row in enumerate(rows, start=first_row_number):
+        try:
+            if isinstance(row, RowError):
+                raise row
+            objects.append(build(row, lookups))
+        except RowError as error:
+            errors.append((row_number, str(error)))
+    bulk_insert(model, objects)
+    return len(objects), errors
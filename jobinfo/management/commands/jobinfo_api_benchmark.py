@@ -0,0 +1,63 @@
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.api import API_RESOURCES
+from jobinfo.benchmark import Benchmark
+
+
+class Command(BaseCommand):
+    help = ('Time the JSON API list and detail urls next to the HTML views they stand in for, through the test '
+            'client, with latency, query counts and response sizes side by side.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--limit', type=int, default=25,
+                            help='Rows per API list page; the HTML lists show 25.')
+        parser.add_argument('--include', action='store_true',
+                            help='Embed every foreign key with include=, as the HTML labels do.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['limit'] < 1:
+            raise CommandError('--iterations and --limit must be positive.')
+        pairs = []
+        for resource in API_RESOURCES.values():
+            for kind in ('list', 'detail'):
+                pairs.append((resource, kind, 'jobinfo_%s_%s_urlpattern' % (resource.name, kind),
+                              getattr(resource, '%s_url_name' % kind)))
+        names = {name for pair in pairs for name in pair[2:]}
+
+        if 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        sql_logger = logging.getLogger('jobinfo.sql')
+        level = sql_logger.level
+        sql_logger.setLevel(logging.WARNING)
+        try:
+            benchmark = Benchmark(options['iterations'], options['warmup'], select=names.__contains__)
+            results = {}
+            for target in benchmark.targets:
+                resource = next((resource for resource, kind, html, api in pairs if api == target.name), None)
+                if resource is not None:
+                    if target.name == resource.list_url_name:
+                        target.query['limit'] = options['limit']
+                    if options['include']:
+                        target.query['include'] = ','.join(
+                            name for name in resource.fields if resource.related(name) is not None)
+                results[target.name] = benchmark.measure(target)
+        finally:
+            sql_logger.setLevel(level)
+
+        self.stdout.write('%-14s %-6s | %9s %7s %9s | %9s %7s %9s' % (
+            'resource', 'kind', 'html p50', 'queries', 'bytes', 'api p50', 'queries', 'bytes'))
+        for resource, kind, html, api in pairs:
+            self.stdout.write('%-14s %-6s | %s | %s' % (
+                resource.name, kind, self.format(results.get(html)), self.format(results.get(api))))
+
+    def format(self, result):
+        if not result or result.get('skipped'):
+            return '%9s %7s %9s' % ('-', '-', '-')
+        if result['status'] != 200:
+            return '%27s' % ('status %d' % result['status'])
+        return '%7.2fms %7d %9d' % (result['p50_ms'], result['queries'], result['bytes'])
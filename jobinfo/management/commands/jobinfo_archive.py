@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.archive import RestoreConflict, archive_cycle, restore_cycle
+from jobinfo.models import AppCycle
+
+
+class Command(BaseCommand):
+    help = ('Move the companies and applications of closed application cycles into the archive tables, or with '
+            '--restore back out of them, in batches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('appCycle', nargs='*', type=int, help='Primary keys of the cycles to move.')
+        parser.add_argument('--before', type=int, metavar='YEAR',
+                            help='Also move every cycle of an earlier year.')
+        parser.add_argument('--restore', action='store_true', help='Move the cycles back out of the archive.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Companies moved per transaction.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        if not options['appCycle'] and options['before'] is None:
+            raise CommandError('Name the cycles to move or pass --before.')
+        cycles = AppCycle.objects.for_display().filter(pk__in=options['appCycle'])
+        if options['before'] is not None:
+            cycles |= AppCycle.objects.for_display().filter(year__year__lt=options['before'])
+        cycles = list(cycles)
+        missing = set(options['appCycle']) - {cycle.pk for cycle in cycles}
+        if missing:
+            raise CommandError('No application cycle with primary key %s.' % ', '.join(map(str, sorted(missing))))
+        move = restore_cycle if options['restore'] else archive_cycle
+        for cycle in cycles:
+            try:
+                result = move(cycle, options['batch_size'])
+            except RestoreConflict as error:
+                raise CommandError(str(error))
+            self.stdout.write('%s %s: %d companies, %d applications.' % (
+                'Restored' if options['restore'] else 'Archived', cycle, result.companies, result.applications))
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from itertools import cycle
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.benchmark import Benchmark, percentile
+
+MODES = ('sync', 'async')
+
+
+class Command(BaseCommand):
+    help = ('Load test the list and detail views through the ASGI handler with concurrent requests, once with '
+            'the sync views and once with the async ones (JOBINFO_ASYNC_VIEWS), each in its own process.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', action='append', choices=MODES,
+                            help='View implementation to measure; may be repeated. Defaults to both.')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per implementation.')
+        parser.add_argument('--only', default=r'_(list|detail)_', help='Regular expression the url names must match.')
+        parser.add_argument('--worker', action='store_true', help='Measure this process and print JSON.')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive.')
+        if options['worker']:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+        self.stdout.write('%-6s %8s %8s %10s %10s %10s %8s' % (
+            'views', 'requests', 'clients', 'req/s', 'p50', 'p95', 'errors'))
+        for mode in options['views'] or MODES:
+            result = self.run_worker(mode, options)
+            self.stdout.write('%-6s %8d %8d %10.0f %8.2fms %8.2fms %8d' % (
+                mode, result['requests'], result['concurrency'], result['throughput'],
+                result['p50_ms'], result['p95_ms'], result['errors']))
+
+    # The URLconf picks the view classes when it is imported, so each
+    # implementation gets a fresh process.
+    def run_worker(self, mode, options):
+        command = [sys.executable, sys.argv[0], 'jobinfo_asgi_benchmark', '--worker',
+                   '--concurrency', str(options['concurrency']), '--requests', str(options['requests']),
+                   '--only', options['only']]
+        environment = dict(os.environ, JOBINFO_ASYNC_VIEWS='1' if mode == 'async' else '0')
+        completed = subprocess.run(command, env=environment, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError('The %s worker failed:\n%s' % (mode, completed.stderr))
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def measure(self, options):
+        if 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        only = re.compile(options['only'])
+        benchmark = Benchmark(select=lambda name: only.search(name) and 'export' not in name)
+        requests = []
+        for target in benchmark.targets:
+            group, client = benchmark.client_for(target)
+            if target.path is not None and client is not None:
+                cookie = '%s=%s' % (settings.SESSION_COOKIE_NAME, client.cookies[settings.SESSION_COOKIE_NAME].value)
+                requests.append((target.path, cookie))
+        if not requests:
+            raise CommandError('No url pattern to request; check --only and the group permissions.')
+        timings, errors, elapsed = asyncio.run(
+            self.load(ASGIHandler(), requests, options['concurrency'], options['requests']))
+        timings.sort()
+        return {
+            'views': 'async' if settings.JOBINFO_ASYNC_VIEWS else 'sync',
+            'requests': len(timings),
+            'concurrency': options['concurrency'],
+            'throughput': len(timings) / elapsed,
+            'p50_ms': percentile(timings, 0.50),
+            'p95_ms': percentile(timings, 0.95),
+            'mean_ms': statistics.mean(timings),
+            'errors': errors,
+        }
+
+    async def load(self, application, requests, concurrency, total):
+        pending = iter(request for request, _ in zip(cycle(requests), range(total)))
+        timings = []
+        errors = 0
+
+        async def client():
+            nonlocal errors
+            for path, cookie in pending:
+                start = time.perf_counter()
+                status = await self.request(application, path, cookie)
+                timings.append((time.perf_counter() - start) * 1000)
+                errors += status != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return timings, errors, time.perf_counter() - start
+
+    async def request(self, application, path, cookie):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await application(scope, receive, send)
+        return next(message['status'] for message in messages if message['type'] == 'http.response.start')
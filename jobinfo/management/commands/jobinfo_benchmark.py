@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.benchmark import Benchmark, regressions
+
+
+class Command(BaseCommand):
+    help = ('Time every jobinfo url pattern through the test client and report latency percentiles, '
+            'query counts and peak memory. Creates one benchmark user per group.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--only', help='Regular expression the url names must match.')
+        parser.add_argument('--exclude', help='Regular expression for url names to skip.')
+        parser.add_argument('--term', default='Smi', help='Search and autocomplete term.')
+        parser.add_argument('--pk', action='append', default=[], metavar='ENTITY=PK',
+                            help='Object used by detail, update and delete urls; may be repeated.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='Compare against the results in this JSON file.')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='Percent slowdown or memory growth reported as a regression.')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Smallest slowdown reported as a regression.')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        pks = {}
+        for value in options['pk']:
+            entity, equals, pk = value.partition('=')
+            if not equals or not pk.isdigit():
+                raise CommandError('--pk expects ENTITY=PK, got %r.' % value)
+            pks[entity] = int(pk)
+        only = re.compile(options['only']) if options['only'] else None
+        exclude = re.compile(options['exclude']) if options['exclude'] else None
+
+        def select(name):
+            return (not only or only.search(name)) and not (exclude and exclude.search(name))
+
+        baseline = None
+        if options['baseline']:
+            if not os.path.exists(options['baseline']):
+                raise CommandError('%s does not exist.' % options['baseline'])
+            with open(options['baseline']) as source:
+                baseline = json.load(source)
+
+        if 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        sql_logger = logging.getLogger('jobinfo.sql')
+        level = sql_logger.level
+        sql_logger.setLevel(logging.WARNING)
+        try:
+            benchmark = Benchmark(options['iterations'], options['warmup'], options['term'], pks, select)
+            results = benchmark.run(self.report)
+        finally:
+            sql_logger.setLevel(level)
+
+        if options['output']:
+            with open(options['output'], 'w') as target:
+                json.dump(results, target, indent=2, sort_keys=True)
+        if baseline is not None:
+            found = regressions(results, baseline, options['threshold'], options['min_delta_ms'])
+            for name, metric, old, new, change in found:
+                self.stdout.write('REGRESSION %-45s %-8s %10s -> %-10s %s' % (
+                    name, metric, old, new, '' if change is None else '(%+.0f%%)' % change))
+            if not found:
+                self.stdout.write('No regressions against %s.' % options['baseline'])
+            if found and options['fail_on_regression']:
+                raise CommandError('%d regressions.' % len(found))
+
+    def report(self, name, result):
+        if result.get('skipped'):
+            self.stdout.write('%-45s skipped' % name)
+            return
+        self.stdout.write('%-45s %3d p50=%7.1fms p95=%7.1fms p99=%7.1fms queries=%-3d peak=%8.1fKB' % (
+            name, result['status'], result['p50_ms'], result['p95_ms'], result['p99_ms'],
+            result['queries'], result['peak_kb']))
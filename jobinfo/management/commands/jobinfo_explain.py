@@ -0,0 +1,107 @@
+import logging
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from jobinfo.benchmark import Benchmark
+
+SCAN = re.compile(r'^SCAN (\S+)(.*)$')
+
+
+# Full scans of a base table, not of an index, subquery or FTS table.
+# Unfiltered counts always scan and are cached by CachedCount instead.
+# An unfiltered LIMIT query that needs no temporary sort reads its rows
+# in the order it wants and stops after the first few.
+def plan_flags(sql, details):
+    flags = []
+    counts_table = sql.startswith('SELECT COUNT(*)') and ' WHERE ' not in sql
+    reads_prefix = (' WHERE ' not in sql and ' LIMIT ' in sql
+                    and not any('USE TEMP B-TREE' in detail for detail in details))
+    for detail in details:
+        match = SCAN.match(detail)
+        if (match and not counts_table and not reads_prefix and not match.group(1).startswith('(')
+                and match.group(1) != 'CONSTANT'
+                and 'USING' not in match.group(2) and 'VIRTUAL TABLE' not in match.group(2)):
+            flags.append('full scan of %s' % match.group(1))
+        if 'USE TEMP B-TREE' in detail:
+            flags.append('temp sort (%s)' % detail)
+    return flags
+
+
+class Command(BaseCommand):
+    help = ('Request every jobinfo url pattern, print EXPLAIN QUERY PLAN for the jobinfo queries it runs '
+            'and flag full table scans and temporary sorts. Exports scan their whole table by design.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', help='Regular expression the url names must match.')
+        parser.add_argument('--exclude', help='Regular expression for url names to skip.')
+        parser.add_argument('--term', default='Smi', help='Search and autocomplete term.')
+        parser.add_argument('--all', action='store_true', help='Also print plans that are not flagged.')
+        parser.add_argument('--fail-on-flag', action='store_true')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('jobinfo_explain reads SQLite query plans.')
+        only = re.compile(options['only']) if options['only'] else None
+        exclude = re.compile(options['exclude']) if options['exclude'] else None
+
+        def select(name):
+            return (not only or only.search(name)) and not (exclude and exclude.search(name))
+
+        if 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        sql_logger = logging.getLogger('jobinfo.sql')
+        level = sql_logger.level
+        sql_logger.setLevel(logging.ERROR)
+        try:
+            benchmark = Benchmark(term=options['term'], select=select)
+            flagged = sum(self.explain(benchmark, target, options['all']) for target in benchmark.targets)
+        finally:
+            sql_logger.setLevel(level)
+        self.stdout.write('%d flagged queries.' % flagged)
+        if flagged and options['fail_on_flag']:
+            raise CommandError('%d flagged queries.' % flagged)
+
+    def capture(self, benchmark, target):
+        group, client = benchmark.client_for(target)
+        if target.path is None or client is None:
+            return None
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT') and 'jobinfo_' in sql:
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = client.get(target.path, target.query)
+            # Stop a streamed response once its query has run.
+            if response.streaming:
+                for chunk in response.streaming_content:
+                    if queries:
+                        break
+                response.close()
+        return queries
+
+    def explain(self, benchmark, target, show_all):
+        queries = self.capture(benchmark, target)
+        if queries is None:
+            self.stdout.write('%s: skipped' % target.name)
+            return 0
+        flagged = 0
+        self.stdout.write('%s: %d queries' % (target.name, len(queries)))
+        with connection.cursor() as cursor:
+            for sql, params in queries:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                details = [row[-1] for row in cursor.fetchall()]
+                flags = plan_flags(sql, details)
+                flagged += bool(flags)
+                if flags or show_all:
+                    self.stdout.write('  %s' % (sql if len(sql) <= 300 else sql[:300] + '...'))
+                    for detail in details:
+                        self.stdout.write('    %s' % detail)
+                    for flag in flags:
+                        self.stdout.write(self.style.WARNING('    !! %s' % flag))
+        return flagged
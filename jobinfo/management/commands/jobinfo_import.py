@@ -0,0 +1,56 @@
+import json
+import os
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.importers import IMPORTERS, Lookups, batched, import_batch, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import job recruiters, job seekers, positions, companies or applications from CSV or JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('entity', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Input format; defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows inserted per transaction.')
+        parser.add_argument('--resume', action='store_true',
+                            help='Skip the rows recorded in the checkpoint file.')
+        parser.add_argument('--checkpoint',
+                            help='Checkpoint file; defaults to PATH.checkpoint.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError('%s does not exist.' % path)
+        file_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        checkpoint = options['checkpoint'] or path + '.checkpoint'
+        model, build = IMPORTERS[options['entity']]
+
+        done = 0
+        if options['resume'] and os.path.exists(checkpoint):
+            with open(checkpoint) as source:
+                done = json.load(source)['rows']
+            self.stdout.write('Resuming after row %d.' % done)
+
+        rows = islice(read_rows(path, file_format), done, None)
+        lookups = Lookups()
+        written = failed = 0
+        for batch in batched(rows, options['batch_size']):
+            count, errors = import_batch(model, build, batch, done + 1, lookups)
+            for row_number, message in errors:
+                self.stderr.write('row %d: %s' % (row_number, message))
+            done += len(batch)
+            written += count
+            failed += len(errors)
+            with open(checkpoint, 'w') as target:
+                json.dump({'rows': done}, target)
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(
+            'Imported %s: %d rows written (existing rows skipped), %d rows rejected.'
+            % (model._meta.verbose_name_plural, written, failed))
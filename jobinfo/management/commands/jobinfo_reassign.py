@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.bulk import reassign
+from jobinfo.models import Company, JobRecruiter
+
+
+class Command(BaseCommand):
+    help = "Move a job recruiter's companies, or those of one cycle or position, to another job recruiter."
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', type=int, help='Primary key of the job recruiter to move companies from.')
+        parser.add_argument('target', type=int, help='Primary key of the job recruiter to move them to.')
+        parser.add_argument('--appCycle', type=int, help='Only move the companies of this application cycle.')
+        parser.add_argument('--position', type=int, help='Only move the companies of this position.')
+        parser.add_argument('--delete-source', action='store_true',
+                            help='Delete the source job recruiter once no company is left.')
+
+    def handle(self, *args, **options):
+        recruiters = JobRecruiter.objects.in_bulk([options['source'], options['target']])
+        missing = [pk for pk in (options['source'], options['target']) if pk not in recruiters]
+        if missing:
+            raise CommandError('No job recruiter with primary key %s.' % ', '.join(map(str, missing)))
+        source, target = recruiters[options['source']], recruiters[options['target']]
+        if source.pk == target.pk:
+            raise CommandError('The source and target job recruiters must differ.')
+        filters = {name: options[name] for name in ('appCycle', 'position') if options[name] is not None}
+        result = reassign(source, target, Company.objects.filter(**filters), options['delete_source'])
+        self.stdout.write('Moved %d companies from %s to %s.' % (result.moved, source, target))
+        if result.deleted:
+            self.stdout.write('Deleted %s.' % source)
+        elif options['delete_source']:
+            self.stdout.write('Kept %s, who still has companies.' % source)
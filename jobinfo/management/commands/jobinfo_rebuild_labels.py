@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from jobinfo.models import Application, Company
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stored display labels and sort keys of companies and applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Number of primary keys updated per statement.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Company labels first: application labels are built from them.
+        for model in (Company, Application):
+            last_pk = model.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+            updated = 0
+            for start in range(0, last_pk, batch_size):
+                with transaction.atomic():
+                    updated += model.objects.filter(
+                        pk__gt=start, pk__lte=start + batch_size
+                    ).refresh_display_labels()
+            self.stdout.write('Rebuilt %d %s labels.' % (updated, model._meta.verbose_name))
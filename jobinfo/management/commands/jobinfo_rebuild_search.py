@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from jobinfo.search import SEARCH_INDEXES, install
+
+
+class Command(BaseCommand):
+    help = 'Create the full-text search tables and triggers and rebuild every index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        install(options['database'], rebuild=True)
+        self.stdout.write('Rebuilt search indexes: %s.' % ', '.join(SEARCH_INDEXES))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.replica import refresh_replica
+
+
+class Command(BaseCommand):
+    help = ("Copy the default database into the 'replica' alias with SQLite's online backup API, once or every "
+            "--interval seconds.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep refreshing, this many seconds apart.')
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        if interval is not None and interval <= 0:
+            raise CommandError('--interval must be positive.')
+        while True:
+            start = time.perf_counter()
+            try:
+                refresh_replica()
+            except ImproperlyConfigured as error:
+                raise CommandError(error)
+            self.stdout.write('Refreshed the replica in %.0fms.' % ((time.perf_counter() - start) * 1000))
+            if interval is None:
+                return
+            time.sleep(interval)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.bulk import rollover, rollover_plan
+from jobinfo.models import AppCycle
+
+
+class Command(BaseCommand):
+    help = ("Copy an application cycle's companies, with their positions and job recruiters, into another cycle, "
+            'skipping those already there.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', type=int, help='Primary key of the cycle to copy from.')
+        parser.add_argument('target', type=int, help='Primary key of the cycle to copy into.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='List the companies that would be copied and skipped without copying them.')
+
+    def handle(self, *args, **options):
+        cycles = AppCycle.objects.for_display().in_bulk([options['source'], options['target']])
+        missing = [pk for pk in (options['source'], options['target']) if pk not in cycles]
+        if missing:
+            raise CommandError('No application cycle with primary key %s.' % ', '.join(map(str, missing)))
+        source, target = cycles[options['source']], cycles[options['target']]
+        if source.pk == target.pk:
+            raise CommandError('The source and target cycles must differ.')
+        for cycle in (source, target):
+            if cycle.archived_at is not None:
+                raise CommandError('%s is archived; restore it first.' % cycle)
+        if options['dry_run']:
+            pending, existing = rollover_plan(source, target)
+            for label in pending.values_list('display_label', flat=True):
+                self.stdout.write('+ %s' % label)
+            for label in existing.values_list('display_label', flat=True):
+                self.stdout.write('= %s' % label)
+            self.stdout.write('Would copy %d companies from %s into %s; %d already there.' % (
+                pending.count(), source, target, existing.count()))
+            return
+        result = rollover(source, target)
+        self.stdout.write('Copied %d companies from %s into %s; %d already there.' % (
+            result.created, source, target, result.existing))
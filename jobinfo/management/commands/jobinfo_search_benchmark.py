@@ -0,0 +1,32 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobinfo.search import SEARCH_INDEXES, SearchResults
+
+
+class Command(BaseCommand):
+    help = 'Time full-text searches against the current database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='+')
+        parser.add_argument('--kind', choices=sorted(SEARCH_INDEXES), action='append',
+                            help='Restrict the search to one kind; may be repeated.')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=26,
+                            help='Rows fetched per search; a page of 25 fetches 26.')
+
+    def handle(self, *args, **options):
+        kinds = options['kind'] or list(SEARCH_INDEXES)
+        for query in options['queries']:
+            results = SearchResults(query, kinds)
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                hits = results[0:options['limit']]
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write('%-20s hits=%-3d p50=%.1fms p95=%.1fms max=%.1fms' % (
+                query, len(hits), statistics.median(timings),
+                timings[max(0, int(len(timings) * 0.95) - 1)], timings[-1]))
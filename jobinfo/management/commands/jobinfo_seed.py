@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobinfo.models import AppCycle, Application, Company, JobRecruiter, JobSeeker, Position
+from jobinfo.seed import seed
+
+
+class Command(BaseCommand):
+    help = 'Add deterministic synthetic job seekers, recruiters, positions, companies and applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seekers', type=int, default=0)
+        parser.add_argument('--recruiters', type=int,
+                            help='Defaults to one recruiter for every 20 companies.')
+        parser.add_argument('--positions', type=int, default=100)
+        parser.add_argument('--companies', type=int, default=0)
+        parser.add_argument('--applications', type=int, default=0)
+        parser.add_argument('--first-year', type=int, default=2015)
+        parser.add_argument('--years', type=int, default=5,
+                            help='App cycles are created for every season of each year.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed; the same seed produces the same rows.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows inserted per transaction.')
+
+    def handle(self, *args, **options):
+        recruiters = options['recruiters']
+        if recruiters is None:
+            recruiters = max(1, options['companies'] // 20) if options['companies'] else 0
+        try:
+            seed(
+                seekers=options['seekers'],
+                recruiters=recruiters,
+                positions=options['positions'],
+                companies=options['companies'],
+                applications=options['applications'],
+                first_year=options['first_year'],
+                years=options['years'],
+                random_seed=options['seed'],
+                batch_size=options['batch_size'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        for model in (AppCycle, Position, JobRecruiter, JobSeeker, Company, Application):
+            self.stdout.write('%s: %d' % (model.__name__, model.objects.count()))
@@ -0,0 +1,132 @@
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobinfo.models import JobSeeker
+from jobinfo.seed import LAST_NAMES
+from jobinfo.sqlite import apply_pragmas
+
+READ_SQL = (
+    'SELECT jobSeeker_id, last_name, first_name, disambiguator FROM %s '
+    'WHERE last_name >= ? AND last_name < ? ORDER BY last_name, first_name, disambiguator LIMIT 26'
+    % JobSeeker._meta.db_table)
+
+WRITE_SQL = 'INSERT INTO %s (last_name, first_name, disambiguator) VALUES (?, ?, ?)' % JobSeeker._meta.db_table
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, profile, deadline, write, number):
+        super().__init__()
+        self.path = path
+        self.pragmas = profile['PRAGMAS']
+        self.reuse = profile['CONN_MAX_AGE'] != 0
+        self.deadline = deadline
+        self.write = write
+        self.number = number
+        self.timings = []
+        self.errors = 0
+
+    # A new connection per operation is what CONN_MAX_AGE = 0 gives a
+    # request; Django opens connections in autocommit mode.
+    def connect(self):
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+    def operation(self, connection, rng, count):
+        if self.write:
+            connection.execute(WRITE_SQL, ('Benchmark', 'Writer %d' % self.number, str(count)))
+        else:
+            prefix = rng.choice(LAST_NAMES)[:2]
+            connection.execute(READ_SQL, (prefix, prefix + '\U0010ffff')).fetchall()
+
+    def run(self):
+        rng = random.Random(self.number)
+        connection = self.connect() if self.reuse else None
+        count = 0
+        while time.perf_counter() < self.deadline:
+            start = time.perf_counter()
+            try:
+                if self.reuse:
+                    self.operation(connection, rng, count)
+                else:
+                    fresh = self.connect()
+                    try:
+                        self.operation(fresh, rng, count)
+                    finally:
+                        fresh.close()
+            except sqlite3.OperationalError:
+                self.errors += 1
+            else:
+                self.timings.append(time.perf_counter() - start)
+            count += 1
+        if connection is not None:
+            connection.close()
+
+
+class Command(BaseCommand):
+    help = ('Compare read and write throughput of the JOBINFO_SQLITE_PROFILES on a copy of the database, '
+            'with concurrent reader and writer threads.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', choices=sorted(settings.JOBINFO_SQLITE_PROFILES),
+                            help='Profile to measure; may be repeated. Defaults to all of them.')
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=1)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+            raise CommandError('%s is not an SQLite database file.' % options['database'])
+        self.stdout.write('%-12s %10s %10s %12s %12s %8s' % (
+            'profile', 'reads/s', 'writes/s', 'read p95', 'write p95', 'errors'))
+        for name in options['profile'] or sorted(settings.JOBINFO_SQLITE_PROFILES):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self.copy(connection.settings_dict['NAME'], path, settings.JOBINFO_SQLITE_PROFILES[name])
+                self.report(name, self.measure(path, settings.JOBINFO_SQLITE_PROFILES[name], options))
+
+    # The copy starts in rollback-journal mode, since journal_mode is
+    # stored in the file and the source may already use WAL.
+    def copy(self, source_path, path, profile):
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(path, isolation_level=None)
+        try:
+            source.backup(target)
+            target.execute('PRAGMA journal_mode = delete')
+            apply_pragmas(target, profile['PRAGMAS'])
+        finally:
+            source.close()
+            target.close()
+
+    def measure(self, path, profile, options):
+        deadline = time.perf_counter() + options['duration']
+        workers = [Worker(path, profile, deadline, False, number) for number in range(options['readers'])]
+        workers += [Worker(path, profile, deadline, True, number) for number in range(options['writers'])]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return workers, options['duration']
+
+    def report(self, name, result):
+        workers, duration = result
+        reads = sorted(timing for worker in workers if not worker.write for timing in worker.timings)
+        writes = sorted(timing for worker in workers if worker.write for timing in worker.timings)
+
+        def p95(timings):
+            return '%.2fms' % (statistics.quantiles(timings, n=20)[-1] * 1000) if len(timings) > 1 else '-'
+
+        self.stdout.write('%-12s %10.0f %10.0f %12s %12s %8d' % (
+            name, len(reads) / duration, len(writes) / duration, p95(reads), p95(writes),
+            sum(worker.errors for worker in workers)))
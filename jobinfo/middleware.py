@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from jobinfo.replica import SAFE_METHODS, read_intent, replica_enabled
+
+logger = logging.getLogger('jobinfo.sql')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            item = (elapsed, self.count, sql)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, item)
+            else:
+                heapq.heappushpop(self.slowest, item)
+
+    def record(self):
+        return {
+            'queries': self.count,
+            'db_ms': round(self.duration * 1000, 2),
+            'slowest': [
+                {'ms': round(elapsed * 1000, 2), 'sql': sql[:500]}
+                for elapsed, index, sql in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        else:
+            self._is_coroutine = None
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        recorder = QueryRecorder(getattr(settings, 'JOBINFO_SLOW_QUERY_COUNT', 5))
+        start = time.perf_counter()
+        with self.recording(recorder):
+            response = self.get_response(request)
+        response['Server-Timing'] = self.server_timing(request, recorder, start)
+        if response.streaming:
+            response.streaming_content = self.stream(response.streaming_content, request, response, recorder, start)
+        else:
+            self.finish(request, response, recorder, start)
+        return response
+
+    # Under ASGI the ORM runs on the request's sync thread, so the recorder
+    # is installed on that thread's connections. Streamed bodies are read
+    # outside the request there, so they are logged without their queries.
+    async def __acall__(self, request):
+        recorder = QueryRecorder(getattr(settings, 'JOBINFO_SLOW_QUERY_COUNT', 5))
+        start = time.perf_counter()
+        recording = await sync_to_async(self.recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.close)()
+        response['Server-Timing'] = self.server_timing(request, recorder, start)
+        self.finish(request, response, recorder, start)
+        return response
+
+    def recording(self, recorder):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def stream(self, content, request, response, recorder, start):
+        with self.recording(recorder):
+            yield from content
+        self.finish(request, response, recorder, start)
+
+    def server_timing(self, request, recorder, start):
+        timing = 'db;dur=%.2f;desc="%d queries", total;dur=%.2f' % (
+            recorder.duration * 1000, recorder.count, (time.perf_counter() - start) * 1000)
+        fragments = getattr(request, 'jobinfo_fragments', None)
+        if fragments:
+            timing += ', fragments;desc="%(hits)d hits %(misses)d misses"' % fragments
+        return timing
+
+    def get_url_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None
+        return match.view_name
+
+    def finish(self, request, response, recorder, start):
+        url_name = self.get_url_name(request)
+        record = {
+            'url_name': url_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round((time.perf_counter() - start) * 1000, 2),
+        }
+        record.update(recorder.record())
+        fragments = getattr(request, 'jobinfo_fragments', None)
+        if fragments:
+            record['fragment_hits'] = fragments['hits']
+            record['fragment_misses'] = fragments['misses']
+        logger.info(json.dumps(record), extra={'sql': record})
+        self.check_budget(url_name, recorder.count, record)
+
+    def check_budget(self, url_name, count, record):
+        budget = getattr(settings, 'JOBINFO_QUERY_BUDGETS', {}).get(
+            url_name, getattr(settings, 'JOBINFO_QUERY_BUDGET_DEFAULT', None))
+        if budget is None or count <= budget:
+            return
+        message = '%s ran %d queries, over its budget of %d.' % (url_name, count, budget)
+        if getattr(settings, 'JOBINFO_QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message, extra={'sql': record})
+
+
+# Safe requests read jobinfo rows from the replica. A write pins the
+# client to the primary for JOBINFO_REPLICA_STICKY_SECONDS, long enough
+# for the replica to catch up, so people see their own changes.
+class ReadReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        else:
+            self._is_coroutine = None
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        replica = self.use_replica(request)
+        with read_intent(replica):
+            response = self.get_response(request)
+        return self.finish(request, response, replica)
+
+    async def __acall__(self, request):
+        replica = self.use_replica(request)
+        with read_intent(replica):
+            response = await self.get_response(request)
+        return self.finish(request, response, replica)
+
+    def use_replica(self, request):
+        return (replica_enabled() and request.method in SAFE_METHODS
+                and self.cookie_name not in request.COOKIES)
+
+    @property
+    def cookie_name(self):
+        return getattr(settings, 'JOBINFO_REPLICA_STICKY_COOKIE', 'jobinfo_primary')
+
+    def finish(self, request, response, replica):
+        if replica and response.streaming:
+            response.streaming_content = self.stream(response.streaming_content)
+        if replica_enabled() and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=getattr(settings, 'JOBINFO_REPLICA_STICKY_SECONDS', 15),
+                httponly=True, samesite='Lax')
+        return response
+
+    def stream(self, content):
+        with read_intent():
+            yield from content
@@ -0,0 +1,75 @@
+# Generated by Django 4.1 on 2026-10-18 19:04
+
+from django.db import migrations, models
+from django.db.models import Case, CharField, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Concat
+
+
+# The labels as this migration defines them, copied here so later changes
+# to jobinfo.models cannot change what it writes.
+def person_label_expression(prefix=''):
+    name = Concat(F(prefix + 'last_name'), Value(', '), F(prefix + 'first_name'))
+    return Case(
+        When(**{prefix + 'disambiguator': ''}, then=name),
+        default=Concat(name, Value(' ('), F(prefix + 'disambiguator'), Value(')')),
+        output_field=CharField(),
+    )
+
+
+def company_label_expression():
+    return Concat(
+        F('position__position_number'), Value(' - '),
+        F('company_name'), Value(' ('),
+        Cast(F('appCycle__year__year'), output_field=CharField()), Value(' - '),
+        F('appCycle__season__season_name'), Value(')'),
+        output_field=CharField(),
+    )
+
+
+def application_label_expression():
+    return Concat(
+        F('company__display_label'), Value(' / '),
+        person_label_expression('jobSeeker__'),
+        output_field=CharField(),
+    )
+
+
+def label_subquery(model, expression):
+    return Subquery(
+        model.objects.filter(pk=OuterRef('pk')).order_by().annotate(
+            label=expression()
+        ).values('label')[:1]
+    )
+
+
+def populate_display_labels(apps, schema_editor):
+    company_class = apps.get_model('jobinfo', 'Company')
+    application_class = apps.get_model('jobinfo', 'Application')
+    company_class.objects.update(
+        display_label=label_subquery(company_class, company_label_expression))
+    application_class.objects.update(
+        display_label=label_subquery(application_class, application_label_expression))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobinfo', '0007_create_group_permissions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='display_label',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=512),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='display_label',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=512),
+        ),
+        migrations.RunPython(
+            populate_display_labels,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 4.1 on 2026-10-18 19:23
+
+from django.db import migrations, models
+from django.db.models import CharField, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat, LPad
+
+SORT_KEY_SEPARATOR = '\x01'
+SORT_KEY_INTEGER_WIDTH = 6
+
+
+# The sort keys as this migration defines them, copied here so later
+# changes to jobinfo.models cannot change what it writes.
+def sort_key_integer(expression):
+    return LPad(Cast(expression, output_field=CharField()), SORT_KEY_INTEGER_WIDTH, Value('0'))
+
+
+def sort_key_expression(*parts):
+    joined = []
+    for part in parts:
+        if joined:
+            joined.append(Value(SORT_KEY_SEPARATOR))
+        joined.append(part)
+    return Concat(*joined, output_field=CharField())
+
+
+def company_sort_key_expression():
+    return sort_key_expression(
+        F('position__position_number'), F('position__position_name'),
+        F('company_name'),
+        sort_key_integer(F('appCycle__year__year')),
+        sort_key_integer(F('appCycle__season__season_sequence')),
+    )
+
+
+def application_sort_key_expression():
+    return sort_key_expression(
+        F('company__sort_key'),
+        F('jobSeeker__last_name'), F('jobSeeker__first_name'),
+        F('jobSeeker__disambiguator'),
+    )
+
+
+def sort_key_subquery(model, expression):
+    return Subquery(
+        model.objects.filter(pk=OuterRef('pk')).order_by().annotate(
+            key=expression()
+        ).values('key')[:1]
+    )
+
+
+def populate_sort_keys(apps, schema_editor):
+    company_class = apps.get_model('jobinfo', 'Company')
+    application_class = apps.get_model('jobinfo', 'Application')
+    company_class.objects.update(
+        sort_key=sort_key_subquery(company_class, company_sort_key_expression))
+    application_class.objects.update(
+        sort_key=sort_key_subquery(application_class, application_sort_key_expression))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobinfo', '0008_company_application_display_label'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='application',
+            options={'ordering': ['sort_key']},
+        ),
+        migrations.AlterModelOptions(
+            name='company',
+            options={'ordering': ['sort_key']},
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['company', 'sort_key'], name='application_company_sort'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['jobSeeker', 'sort_key'], name='application_seeker_sort'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['appCycle', 'sort_key'], name='company_appcycle_sort'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['position', 'sort_key'], name='company_position_sort'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['jobRecruiter', 'sort_key'], name='company_recruiter_sort'),
+        ),
+        migrations.RunPython(
+            populate_sort_keys,
+            migrations.RunPython.noop
+        ),
+    ]
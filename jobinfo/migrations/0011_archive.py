@@ -0,0 +1,57 @@
+# Generated by Django 4.1 on 2026-10-18 20:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobinfo', '0010_updated_at_and_table_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appcycle',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedCompany',
+            fields=[
+                ('company_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('company_name', models.CharField(max_length=255)),
+                ('display_label', models.CharField(blank=True, default='', editable=False, max_length=512)),
+                ('sort_key', models.CharField(blank=True, default='', editable=False, max_length=1024)),
+                ('updated_at', models.DateTimeField()),
+                ('appCycle', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_companies', to='jobinfo.appcycle')),
+                ('jobRecruiter', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_companies', to='jobinfo.jobrecruiter')),
+                ('position', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_companies', to='jobinfo.position')),
+            ],
+            options={
+                'ordering': ['sort_key'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('application_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('display_label', models.CharField(blank=True, default='', editable=False, max_length=512)),
+                ('sort_key', models.CharField(blank=True, default='', editable=False, max_length=1024)),
+                ('updated_at', models.DateTimeField()),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='applications', to='jobinfo.archivedcompany')),
+                ('jobSeeker', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_applications', to='jobinfo.jobseeker')),
+            ],
+            options={
+                'ordering': ['sort_key'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedcompany',
+            index=models.Index(fields=['appCycle', 'sort_key'], name='archived_company_appcycle'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['company', 'sort_key'], name='archived_application_company'),
+        ),
+    ]
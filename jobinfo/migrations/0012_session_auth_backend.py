@@ -0,0 +1,34 @@
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+CACHED_MODEL_BACKEND = 'jobinfo.permissions.CachedModelBackend'
+
+
+# Sessions name the backend that logged the user in, and Django drops
+# the login when that path is no longer in AUTHENTICATION_BACKENDS, so
+# the sessions made before the switch are pointed at the new backend.
+def rename_backend(old, new):
+    def rename(apps, schema_editor):
+        session_class = apps.get_model('sessions', 'Session')
+        store = SessionStore()
+        for session in session_class.objects.using(schema_editor.connection.alias).iterator():
+            data = store.decode(session.session_data)
+            if data.get('_auth_user_backend') == old:
+                data['_auth_user_backend'] = new
+                session.session_data = store.encode(data)
+                session.save(update_fields=['session_data'])
+    return rename
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobinfo', '0011_archive'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_backend(MODEL_BACKEND, CACHED_MODEL_BACKEND),
+                             rename_backend(CACHED_MODEL_BACKEND, MODEL_BACKEND)),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobinfo', '0012_session_auth_backend'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['company_name', 'display_label'], name='company_name_label'),
+        ),
+    ]
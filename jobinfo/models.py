@@ -1,12 +1,148 @@
 from django.db import models
-from django.db.models import UniqueConstraint
+from django.db.models import Case, CharField, F, OuterRef, Subquery, UniqueConstraint, Value, When
+from django.db.models.functions import Cast, Concat, LPad, Now
 from django.urls import reverse
 
+DISPLAY_LABEL_LENGTH = 512
+SORT_KEY_LENGTH = 1024
+
+# Sort keys join the values of a cross-table ordering with a separator
+# that sorts below any printable character, so comparing two keys gives
+# the same order as comparing the value tuples. Integers are zero-padded.
+SORT_KEY_SEPARATOR = '\x01'
+SORT_KEY_INTEGER_WIDTH = 6
+
+
+def person_label_expression(prefix=''):
+    name = Concat(F(prefix + 'last_name'), Value(', '), F(prefix + 'first_name'))
+    return Case(
+        When(**{prefix + 'disambiguator': ''}, then=name),
+        default=Concat(name, Value(' ('), F(prefix + 'disambiguator'), Value(')')),
+        output_field=CharField(),
+    )
+
+
+def company_label_expression(prefix=''):
+    return Concat(
+        F(prefix + 'position__position_number'), Value(' - '),
+        F(prefix + 'company_name'), Value(' ('),
+        Cast(F(prefix + 'appCycle__year__year'), output_field=CharField()), Value(' - '),
+        F(prefix + 'appCycle__season__season_name'), Value(')'),
+        output_field=CharField(),
+    )
+
+
+def application_label_expression(prefix=''):
+    return Concat(
+        F(prefix + 'company__display_label'), Value(' / '),
+        person_label_expression(prefix + 'jobSeeker__'),
+        output_field=CharField(),
+    )
+
+
+def sort_key_integer(expression):
+    return LPad(Cast(expression, output_field=CharField()), SORT_KEY_INTEGER_WIDTH, Value('0'))
+
+
+def sort_key_expression(*parts):
+    joined = []
+    for part in parts:
+        if joined:
+            joined.append(Value(SORT_KEY_SEPARATOR))
+        joined.append(part)
+    return Concat(*joined, output_field=CharField())
+
+
+def build_sort_key(*parts):
+    return SORT_KEY_SEPARATOR.join(
+        str(part).zfill(SORT_KEY_INTEGER_WIDTH) if isinstance(part, int) else part for part in parts)
+
+
+def company_sort_key_expression(prefix=''):
+    return sort_key_expression(
+        F(prefix + 'position__position_number'), F(prefix + 'position__position_name'),
+        F(prefix + 'company_name'),
+        sort_key_integer(F(prefix + 'appCycle__year__year')),
+        sort_key_integer(F(prefix + 'appCycle__season__season_sequence')),
+    )
+
+
+def application_sort_key_expression(prefix=''):
+    return sort_key_expression(
+        F(prefix + 'company__sort_key'),
+        F(prefix + 'jobSeeker__last_name'), F(prefix + 'jobSeeker__first_name'),
+        F(prefix + 'jobSeeker__disambiguator'),
+    )
+
+
+def prefix_range(field, prefix):
+    return {field + '__gte': prefix, field + '__lt': prefix + '\U0010ffff'}
+
+
+class PersonQuerySet(models.QuerySet):
+    def name_startswith(self, term):
+        last_name, comma, first_name = term.partition(',')
+        if comma:
+            return self.filter(last_name=last_name.strip(), **prefix_range('first_name', first_name.strip()))
+        return self.filter(**prefix_range('last_name', last_name.strip()))
+
+
+class PositionQuerySet(models.QuerySet):
+    def number_startswith(self, term):
+        return self.filter(**prefix_range('position_number', term))
+
+
+class AppCycleQuerySet(models.QuerySet):
+    def for_display(self):
+        return self.select_related('year', 'season')
+
+    def active(self):
+        return self.filter(archived_at__isnull=True)
+
+
+class DisplayLabelQuerySet(models.QuerySet):
+    label_expression = None
+    sort_key_expression = None
+
+    def for_display(self):
+        return self
+
+    def label_startswith(self, prefix):
+        return self.filter(**prefix_range('display_label', prefix))
+
+    # Also refreshes the sort key, which depends on the same rows.
+    def refresh_display_labels(self):
+        values = self.model._base_manager.filter(
+            pk=OuterRef('pk')
+        ).order_by().annotate(
+            label=self.label_expression(),
+            key=self.sort_key_expression(),
+        )
+        return self.update(
+            display_label=Subquery(values.values('label')[:1]),
+            sort_key=Subquery(values.values('key')[:1]),
+            updated_at=Now(),
+        )
+
+
+class CompanyQuerySet(DisplayLabelQuerySet):
+    label_expression = staticmethod(company_label_expression)
+    sort_key_expression = staticmethod(company_sort_key_expression)
+
+    def name_startswith(self, prefix):
+        return self.filter(**prefix_range('company_name', prefix)).order_by('company_name', 'display_label')
+
+
+class ApplicationQuerySet(DisplayLabelQuerySet):
+    label_expression = staticmethod(application_label_expression)
+    sort_key_expression = staticmethod(application_sort_key_expression)
+
 
 class Season(models.Model):
     season_id = models.AutoField(primary_key=True)
     season_sequence = models.IntegerField(unique=True)
     season_name = models.CharField(max_length=45, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return '%s' % self.season_name
@@ -18,6 +154,7 @@ class Season(models.Model):
 class Year(models.Model):
     year_id = models.AutoField(primary_key=True)
     year = models.IntegerField(unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return '%s' % self.year
@@ -30,6 +167,10 @@ class AppCycle(models.Model):
     appCycle_id = models.AutoField(primary_key=True)
     year = models.ForeignKey(Year, related_name='appCycles', on_delete=models.PROTECT)
     season = models.ForeignKey(Season, related_name='appCycles', on_delete=models.PROTECT)
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AppCycleQuerySet.as_manager()
 
     def __str__(self):
         return '%s - %s' % (self.year.year, self.season.season_name)
@@ -49,6 +190,11 @@ class AppCycle(models.Model):
                        kwargs={'pk': self.pk}
                        )
 
+    def get_rollover_url(self):
+        return reverse('jobinfo_appCycle_rollover_urlpattern',
+                       kwargs={'pk': self.pk}
+                       )
+
     class Meta:
         ordering = ['year__year', 'season__season_sequence']
         constraints = [
@@ -60,6 +206,9 @@ class Position(models.Model):
     position_id = models.AutoField(primary_key=True)
     position_number = models.CharField(max_length=20)
     position_name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PositionQuerySet.as_manager()
 
     def __str__(self):
         return '%s - %s' % (self.position_number, self.position_name)
@@ -91,6 +240,9 @@ class JobRecruiter(models.Model):
     first_name = models.CharField(max_length=45)
     last_name = models.CharField(max_length=45)
     disambiguator = models.CharField(max_length=45, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PersonQuerySet.as_manager()
 
     def __str__(self):
         result = ''
@@ -114,6 +266,11 @@ class JobRecruiter(models.Model):
                        kwargs={'pk': self.pk}
                        )
 
+    def get_reassign_url(self):
+        return reverse('jobinfo_jobRecruiter_reassign_urlpattern',
+                       kwargs={'pk': self.pk}
+                       )
+
     class Meta:
         ordering = ['last_name', 'first_name', 'disambiguator']
         constraints = [
@@ -126,6 +283,9 @@ class JobSeeker(models.Model):
     first_name = models.CharField(max_length=45)
     last_name = models.CharField(max_length=45)
     disambiguator = models.CharField(max_length=45, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PersonQuerySet.as_manager()
 
     def __str__(self):
         result = ''
@@ -163,10 +323,31 @@ class Company(models.Model):
     appCycle = models.ForeignKey(AppCycle, related_name='companies', on_delete=models.PROTECT)
     position = models.ForeignKey(Position, related_name='companies', on_delete=models.PROTECT)
     jobRecruiter = models.ForeignKey(JobRecruiter, related_name='companies', on_delete=models.PROTECT)
+    display_label = models.CharField(max_length=DISPLAY_LABEL_LENGTH, blank=True, default='', editable=False,
+                                     db_index=True)
+    sort_key = models.CharField(max_length=SORT_KEY_LENGTH, blank=True, default='', editable=False,
+                                db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CompanyQuerySet.as_manager()
 
     def __str__(self):
+        return self.display_label or self.build_display_label()
+
+    def build_display_label(self):
         return '%s - %s (%s)' % (self.position.position_number, self.company_name, self.appCycle.__str__())
 
+    def build_sort_key(self):
+        return build_sort_key(self.position.position_number, self.position.position_name, self.company_name,
+                              self.appCycle.year.year, self.appCycle.season.season_sequence)
+
+    def save(self, *args, **kwargs):
+        self.display_label = self.build_display_label()
+        self.sort_key = self.build_sort_key()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'display_label', 'sort_key'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('jobinfo_company_detail_urlpattern',
                        kwargs={'pk': self.pk}
@@ -183,20 +364,48 @@ class Company(models.Model):
                        )
 
     class Meta:
-        ordering = ['position', 'company_name', 'appCycle']
+        # Same order as ['position', 'company_name', 'appCycle'].
+        ordering = ['sort_key']
         constraints = [
             UniqueConstraint(fields=['appCycle', 'position', 'company_name'], name='unique_company')
         ]
+        indexes = [
+            models.Index(fields=['appCycle', 'sort_key'], name='company_appcycle_sort'),
+            models.Index(fields=['position', 'sort_key'], name='company_position_sort'),
+            models.Index(fields=['jobRecruiter', 'sort_key'], name='company_recruiter_sort'),
+            models.Index(fields=['company_name', 'display_label'], name='company_name_label'),
+        ]
 
 
 class Application(models.Model):
     application_id = models.AutoField(primary_key=True)
     jobSeeker = models.ForeignKey(JobSeeker, related_name='applications', on_delete=models.PROTECT)
     company = models.ForeignKey(Company, related_name='applications', on_delete=models.PROTECT)
+    display_label = models.CharField(max_length=DISPLAY_LABEL_LENGTH, blank=True, default='', editable=False,
+                                     db_index=True)
+    sort_key = models.CharField(max_length=SORT_KEY_LENGTH, blank=True, default='', editable=False,
+                                db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ApplicationQuerySet.as_manager()
 
     def __str__(self):
+        return self.display_label or self.build_display_label()
+
+    def build_display_label(self):
         return '%s / %s' % (self.company, self.jobSeeker)
 
+    def build_sort_key(self):
+        return build_sort_key(self.company.sort_key or self.company.build_sort_key(), self.jobSeeker.last_name,
+                              self.jobSeeker.first_name, self.jobSeeker.disambiguator)
+
+    def save(self, *args, **kwargs):
+        self.display_label = self.build_display_label()
+        self.sort_key = self.build_sort_key()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'display_label', 'sort_key'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('jobinfo_application_detail_urlpattern',
                        kwargs={'pk': self.pk}
@@ -213,7 +422,84 @@ class Application(models.Model):
                        )
 
     class Meta:
-        ordering = ['company', 'jobSeeker']
+        # Same order as ['company', 'jobSeeker'].
+        ordering = ['sort_key']
         constraints = [
             UniqueConstraint(fields=['company', 'jobSeeker'], name='unique_application')
         ]
+        indexes = [
+            models.Index(fields=['company', 'sort_key'], name='application_company_sort'),
+            models.Index(fields=['jobSeeker', 'sort_key'], name='application_seeker_sort'),
+        ]
+
+
+# Companies and applications of archived application cycles, moved out
+# of the tables above by jobinfo.archive with their primary keys and
+# updated_at unchanged, so they keep their urls. Their labels are kept
+# current and refreshed the same way.
+class ArchivedCompany(models.Model):
+    archived = True
+
+    company_id = models.IntegerField(primary_key=True)
+    company_name = models.CharField(max_length=255)
+    appCycle = models.ForeignKey(AppCycle, related_name='archived_companies', on_delete=models.PROTECT)
+    position = models.ForeignKey(Position, related_name='archived_companies', on_delete=models.PROTECT)
+    jobRecruiter = models.ForeignKey(JobRecruiter, related_name='archived_companies', on_delete=models.PROTECT)
+    display_label = models.CharField(max_length=DISPLAY_LABEL_LENGTH, blank=True, default='', editable=False)
+    sort_key = models.CharField(max_length=SORT_KEY_LENGTH, blank=True, default='', editable=False)
+    updated_at = models.DateTimeField()
+
+    objects = CompanyQuerySet.as_manager()
+
+    def __str__(self):
+        return self.display_label
+
+    def get_absolute_url(self):
+        return reverse('jobinfo_company_detail_urlpattern',
+                       kwargs={'pk': self.pk}
+                       )
+
+    class Meta:
+        ordering = ['sort_key']
+        indexes = [
+            models.Index(fields=['appCycle', 'sort_key'], name='archived_company_appcycle'),
+        ]
+
+
+class ArchivedApplication(models.Model):
+    archived = True
+
+    application_id = models.IntegerField(primary_key=True)
+    jobSeeker = models.ForeignKey(JobSeeker, related_name='archived_applications', on_delete=models.PROTECT)
+    company = models.ForeignKey(ArchivedCompany, related_name='applications', on_delete=models.PROTECT)
+    display_label = models.CharField(max_length=DISPLAY_LABEL_LENGTH, blank=True, default='', editable=False)
+    sort_key = models.CharField(max_length=SORT_KEY_LENGTH, blank=True, default='', editable=False)
+    updated_at = models.DateTimeField()
+
+    objects = ApplicationQuerySet.as_manager()
+
+    def __str__(self):
+        return self.display_label
+
+    def get_absolute_url(self):
+        return reverse('jobinfo_application_detail_urlpattern',
+                       kwargs={'pk': self.pk}
+                       )
+
+    class Meta:
+        ordering = ['sort_key']
+        indexes = [
+            models.Index(fields=['company', 'sort_key'], name='archived_application_company'),
+        ]
+
+
+# One row per jobinfo table, bumped by triggers on every insert, update
+# and delete, including bulk_create() and update(), which send no
+# signals. Installed by jobinfo.changes after each migrate.
+class TableChange(models.Model):
+    table_name = models.CharField(max_length=64, primary_key=True)
+    generation = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return '%s #%s' % (self.table_name, self.generation)
@@ -0,0 +1,56 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.urls import reverse
+
+from jobinfo.changes import permission_generations
+
+NAVIGATION = (
+    ('jobinfo.view_jobrecruiter', 'jobinfo_jobRecruiter_list_urlpattern', 'Job Recruiter'),
+    ('jobinfo.view_company', 'jobinfo_company_list_urlpattern', 'Company'),
+    ('jobinfo.view_position', 'jobinfo_position_list_urlpattern', 'Position'),
+    ('jobinfo.view_appcycle', 'jobinfo_appCycle_list_urlpattern', 'Application Cycle'),
+    ('jobinfo.view_jobseeker', 'jobinfo_jobSeeker_list_urlpattern', 'Job Seeker'),
+    ('jobinfo.view_application', 'jobinfo_application_list_urlpattern', 'Application'),
+)
+
+
+# Permission sets are cached per process, but under the generations of
+# the auth tables they are read from, which the change triggers keep in
+# the database. A grant or revocation in any worker gives every worker a
+# new key on its next request. Without the triggers nothing is cached.
+def permission_cache_key(user):
+    generations = permission_generations()
+    if not generations:
+        return None
+    return 'jobinfo:permissions:%s:%s' % (user.pk, ':'.join(str(generation) for table, generation in generations))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            key = permission_cache_key(user_obj)
+            permissions = None if key is None else cache.get(key)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                if key is not None:
+                    cache.set(key, permissions, getattr(settings, 'JOBINFO_PERMISSION_CACHE_TIMEOUT', 3600))
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
+
+
+@lru_cache(maxsize=None)
+def _navigation_links():
+    return tuple((permission, reverse(url_name), label) for permission, url_name, label in NAVIGATION)
+
+
+def navigation_for(user):
+    if not user.is_authenticated:
+        return []
+    permissions = user.get_all_permissions()
+    return [{'url': url, 'label': label}
+            for permission, url, label in _navigation_links() if permission in permissions]
@@ -0,0 +1,98 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_intent = ContextVar('jobinfo_read_intent', default=False)
+
+
+def replica_enabled():
+    return bool(getattr(settings, 'JOBINFO_READ_REPLICA', False)) and REPLICA_ALIAS in settings.DATABASES
+
+
+# Reads of jobinfo rows go to the replica only inside this block; the
+# middleware opens it for safe requests that are not pinned to the
+# primary after a write.
+@contextmanager
+def read_intent(enabled=True):
+    token = _read_intent.set(enabled)
+    try:
+        yield
+    finally:
+        _read_intent.reset(token)
+
+
+def reads_from_replica(model):
+    return _read_intent.get() and model._meta.app_label == 'jobinfo' and replica_enabled()
+
+
+# Changes whenever the replica is refreshed. Cache versions are bumped
+# on the primary when a row is saved, so anything cached from a replica
+# that had not caught up yet is keyed by this as well and dropped after
+# the next refresh.
+def replica_epoch(model):
+    if not reads_from_replica(model):
+        return None
+    path = str(connections[REPLICA_ALIAS].settings_dict['NAME'])
+    epoch = 0
+    for name in (path, path + '-wal'):
+        try:
+            epoch = max(epoch, os.stat(name).st_mtime_ns)
+        except FileNotFoundError:
+            pass
+    return epoch
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reads_from_replica(model):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    # Explicit, since Django would otherwise save an object back to the
+    # database it was read from.
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_ALIAS}:
+            return True
+        return None
+
+    # The replica's schema arrives with its data.
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+def database_path(alias):
+    connection = connections[alias]
+    if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+        raise ImproperlyConfigured('The %r database is not an SQLite file.' % alias)
+    return str(connection.settings_dict['NAME'])
+
+
+def refresh_replica(source=DEFAULT_DB_ALIAS, target=REPLICA_ALIAS):
+    backup(database_path(source), database_path(target))
+
+
+# SQLite's online backup API reads a consistent snapshot while the
+# primary keeps taking writes. The copy is made in place so connections
+# the web process already holds to the replica see the new pages.
+def backup(source_path, target_path):
+    source_connection = sqlite3.connect(source_path)
+    target_connection = sqlite3.connect(target_path, isolation_level=None)
+    try:
+        target_connection.execute('PRAGMA busy_timeout = 5000')
+        source_connection.backup(target_connection)
+    finally:
+        source_connection.close()
+        target_connection.close()
@@ -0,0 +1,132 @@
+import re
+from collections import namedtuple
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from jobinfo.models import Company, JobRecruiter, JobSeeker, Position
+
+SearchHit = namedtuple('SearchHit', ['kind', 'label', 'object'])
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+class SearchIndex:
+    # An FTS5 external-content table over a model table, kept in sync by
+    # triggers so that bulk_create() and update() are indexed as well.
+
+    def __init__(self, model, columns):
+        self.model = model
+        self.columns = columns
+
+    @property
+    def content_table(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return self.content_table + '_fts'
+
+    @property
+    def triggers(self):
+        return [self.table + suffix for suffix in ('_ai', '_ad', '_au')]
+
+    def _values(self, prefix):
+        return ', '.join(['%s."%s"' % (prefix, self.model._meta.pk.column)]
+                         + ['%s."%s"' % (prefix, column) for column in self.columns])
+
+    def install_sql(self):
+        columns = ', '.join('"%s"' % column for column in self.columns)
+        insert = 'INSERT INTO "%s"(rowid, %s) VALUES (%s);' % (
+            self.table, columns, self._values('new'))
+        delete = 'INSERT INTO "%s"("%s", rowid, %s) VALUES (\'delete\', %s);' % (
+            self.table, self.table, columns, self._values('old'))
+        return [
+            'CREATE VIRTUAL TABLE IF NOT EXISTS "%s" USING fts5(%s, content=\'%s\', content_rowid=\'%s\', '
+            'tokenize=\'unicode61 remove_diacritics 2\', prefix=\'2 3\')' % (
+                self.table, columns, self.content_table, self.model._meta.pk.column),
+            'CREATE TRIGGER IF NOT EXISTS "%s" AFTER INSERT ON "%s" BEGIN %s END' % (
+                self.triggers[0], self.content_table, insert),
+            'CREATE TRIGGER IF NOT EXISTS "%s" AFTER DELETE ON "%s" BEGIN %s END' % (
+                self.triggers[1], self.content_table, delete),
+            'CREATE TRIGGER IF NOT EXISTS "%s" AFTER UPDATE OF %s ON "%s" BEGIN %s %s END' % (
+                self.triggers[2], columns, self.content_table, delete, insert),
+        ]
+
+    def rebuild_sql(self):
+        return 'INSERT INTO "%s"("%s") VALUES (\'rebuild\')' % (self.table, self.table)
+
+    def select_sql(self, kind, position):
+        return ('SELECT %d AS position, \'%s\' AS kind, rowid AS id, rank AS score '
+                'FROM "%s" WHERE "%s" MATCH %%s' % (position, kind, self.table, self.table))
+
+
+SEARCH_INDEXES = {
+    'jobRecruiter': SearchIndex(JobRecruiter, ('first_name', 'last_name', 'disambiguator')),
+    'jobSeeker': SearchIndex(JobSeeker, ('first_name', 'last_name', 'disambiguator')),
+    'position': SearchIndex(Position, ('position_number', 'position_name')),
+    'company': SearchIndex(Company, ('display_label',)),
+}
+
+
+def install(using=DEFAULT_DB_ALIAS, rebuild=False):
+    # Idempotent. Migrations that remake a table on SQLite drop its
+    # triggers, so any index whose triggers went missing is rebuilt.
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {name for (name,) in cursor.fetchall()}
+        for index in SEARCH_INDEXES.values():
+            if index.content_table not in existing:
+                continue
+            stale = rebuild or not {index.table, *index.triggers} <= existing
+            for statement in index.install_sql():
+                cursor.execute(statement)
+            if stale:
+                cursor.execute(index.rebuild_sql())
+
+
+def build_match(term):
+    return ' '.join('"%s"*' % token for token in TOKEN_RE.findall(term))
+
+
+class SearchResults:
+    # Sliceable, so it can be paginated like a queryset.
+
+    def __init__(self, term, kinds, using=None):
+        self.match = build_match(term)
+        self.kinds = [kind for kind in SEARCH_INDEXES if kind in kinds]
+        self.using = using
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError('SearchResults only supports slicing.')
+        start = key.start or 0
+        if not self.match or not self.kinds or (key.stop is not None and key.stop <= start):
+            return []
+        limit = -1 if key.stop is None else key.stop - start
+        # bm25 scores depend on each table's own statistics, so they only
+        # order hits within a kind; kinds follow SEARCH_INDEXES.
+        sql = 'SELECT kind, id FROM (%s) ORDER BY position, score, id LIMIT %%s OFFSET %%s' % ' UNION ALL '.join(
+            SEARCH_INDEXES[kind].select_sql(kind, position) for position, kind in enumerate(self.kinds))
+        params = [self.match] * len(self.kinds) + [limit, start]
+        using = self.using or router.db_for_read(SEARCH_INDEXES[self.kinds[0]].model)
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        objects = {}
+        for kind in self.kinds:
+            ids = [pk for row_kind, pk in rows if row_kind == kind]
+            if ids:
+                objects[kind] = SEARCH_INDEXES[kind].model.objects.using(using).in_bulk(ids)
+        hits = []
+        for kind, pk in rows:
+            obj = objects.get(kind, {}).get(pk)
+            if obj is not None:
+                hits.append(SearchHit(kind, SEARCH_INDEXES[kind].model._meta.verbose_name, obj))
+        return hits
+
+
+def search(term, kinds=SEARCH_INDEXES, offset=0, limit=25):
+    return SearchResults(term, kinds)[offset:offset + limit]
@@ -0,0 +1,120 @@
+import random
+from collections import Counter
+
+from jobinfo.importers import batched, bulk_insert
+from jobinfo.models import AppCycle, Application, Company, JobRecruiter, JobSeeker, Position, Season, Year
+
+FIRST_NAMES = (
+    'Aaliyah', 'Adam', 'Aiden', 'Alexander', 'Alice', 'Amelia', 'Andrew', 'Anna', 'Aria', 'Ava',
+    'Benjamin', 'Brandon', 'Caleb', 'Camila', 'Charlotte', 'Chloe', 'Christopher', 'Daniel', 'David', 'Dylan',
+    'Eleanor', 'Elijah', 'Elizabeth', 'Ella', 'Emily', 'Emma', 'Ethan', 'Evelyn', 'Gabriel', 'Grace',
+    'Hannah', 'Harper', 'Henry', 'Isaac', 'Isabella', 'Jack', 'Jackson', 'Jacob', 'James', 'Jayden',
+    'John', 'Joseph', 'Joshua', 'Julia', 'Layla', 'Leah', 'Liam', 'Lily', 'Logan', 'Lucas',
+    'Luke', 'Madison', 'Mason', 'Matthew', 'Mia', 'Michael', 'Mila', 'Natalie', 'Nathan', 'Noah',
+    'Nora', 'Olivia', 'Owen', 'Penelope', 'Riley', 'Ryan', 'Samuel', 'Sarah', 'Scarlett', 'Sebastian',
+    'Sofia', 'Sophia', 'Stella', 'Thomas', 'Victoria', 'William', 'Wyatt', 'Zoe', 'Zoey', 'Priya',
+)
+
+LAST_NAMES = (
+    'Adams', 'Allen', 'Anderson', 'Baker', 'Brown', 'Campbell', 'Carter', 'Chen', 'Clark', 'Collins',
+    'Davis', 'Diaz', 'Edwards', 'Evans', 'Flores', 'Garcia', 'Gomez', 'Gonzalez', 'Green', 'Hall',
+    'Harris', 'Hernandez', 'Hill', 'Jackson', 'Johnson', 'Jones', 'Kim', 'King', 'Lee', 'Lewis',
+    'Lopez', 'Martin', 'Martinez', 'Miller', 'Mitchell', 'Moore', 'Morris', 'Murphy', 'Nelson', 'Nguyen',
+    'Parker', 'Patel', 'Perez', 'Phillips', 'Ramirez', 'Rivera', 'Roberts', 'Robinson', 'Rodriguez', 'Sanchez',
+    'Scott', 'Smith', 'Stewart', 'Taylor', 'Thomas', 'Thompson', 'Torres', 'Turner', 'Walker', 'White',
+    'Williams', 'Wilson', 'Wright', 'Young', 'Zhang', 'Singh', 'Cohen', 'Murray', 'Reyes', 'Ward',
+)
+
+COMPANY_WORDS = (
+    'Acme', 'Apex', 'Atlas', 'Beacon', 'Bright', 'Cascade', 'Cedar', 'Summit', 'Delta', 'Evergreen',
+    'Falcon', 'Frontier', 'Granite', 'Harbor', 'Horizon', 'Keystone', 'Lakeside', 'Liberty', 'Meridian', 'Nova',
+    'Orion', 'Pacific', 'Pinnacle', 'Quantum', 'Redwood', 'Sierra', 'Silver', 'Sterling', 'Vertex', 'Zenith',
+)
+
+COMPANY_SUFFIXES = ('Systems', 'Labs', 'Group', 'Partners', 'Industries', 'Health', 'Logistics', 'Analytics',
+                    'Energy', 'Foods')
+
+POSITION_NAMES = (
+    'Software Engineer', 'Data Analyst', 'Product Manager', 'Accountant', 'Nurse', 'Sales Associate',
+    'Mechanical Engineer', 'Designer', 'Marketing Coordinator', 'Research Assistant', 'Teacher',
+    'Project Manager', 'Technician', 'Consultant', 'Administrator',
+)
+
+SEASONS = ('Summer', 'Fall', 'Winter', 'Spring')
+
+
+def build_people(model, count, rng):
+    seen = Counter()
+    for _ in range(count):
+        name = (rng.choice(LAST_NAMES), rng.choice(FIRST_NAMES))
+        seen[name] += 1
+        yield model(
+            last_name=name[0],
+            first_name=name[1],
+            disambiguator='' if seen[name] == 1 else 'seed %d' % seen[name],
+        )
+
+
+def build_positions(count, rng):
+    for number in range(1, count + 1):
+        yield Position(position_number='S%05d' % number, position_name=rng.choice(POSITION_NAMES))
+
+
+def build_companies(count, rng, app_cycles, position_ids, recruiter_ids):
+    seen = set()
+    for number in range(count):
+        app_cycle = rng.choice(app_cycles)
+        position = rng.choice(position_ids)
+        name = '%s %s' % (rng.choice(COMPANY_WORDS), rng.choice(COMPANY_SUFFIXES))
+        if (app_cycle, position, name) in seen:
+            name = '%s %d' % (name, number)
+        seen.add((app_cycle, position, name))
+        yield Company(company_name=name, appCycle_id=app_cycle, position_id=position,
+                      jobRecruiter_id=rng.choice(recruiter_ids))
+
+
+# Caller must keep count well below len(company_ids) * len(seeker_ids).
+def build_applications(count, rng, company_ids, seeker_ids):
+    seen = set()
+    while len(seen) < count:
+        pair = (rng.choice(company_ids), rng.choice(seeker_ids))
+        if pair not in seen:
+            seen.add(pair)
+            yield Application(company_id=pair[0], jobSeeker_id=pair[1])
+
+
+def pks(model):
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def insert(model, objects, batch_size):
+    for batch in batched(objects, batch_size):
+        bulk_insert(model, batch)
+
+
+# Generated rows depend only on the seed and the rows already in the
+# database, so the same arguments against the same starting database
+# always produce the same data.
+def seed(seekers=0, recruiters=0, positions=0, companies=0, applications=0,
+         first_year=2015, years=5, random_seed=0, batch_size=5000):
+    rng = random.Random(random_seed)
+    insert(Season, (Season(season_name=name, season_sequence=sequence)
+                    for sequence, name in enumerate(SEASONS, start=1)), batch_size)
+    insert(Year, (Year(year=year) for year in range(first_year, first_year + years)), batch_size)
+    insert(AppCycle, (AppCycle(year_id=year, season_id=season)
+                      for year in Year.objects.filter(year__gte=first_year, year__lt=first_year + years)
+                      .order_by('year').values_list('pk', flat=True)
+                      for season in pks(Season)), batch_size)
+    insert(Position, build_positions(positions, rng), batch_size)
+    insert(JobRecruiter, build_people(JobRecruiter, recruiters, rng), batch_size)
+    insert(JobSeeker, build_people(JobSeeker, seekers, rng), batch_size)
+    if companies:
+        position_ids, recruiter_ids = pks(Position), pks(JobRecruiter)
+        if not position_ids or not recruiter_ids:
+            raise ValueError('Companies need at least one position and one job recruiter.')
+        insert(Company, build_companies(companies, rng, pks(AppCycle), position_ids, recruiter_ids), batch_size)
+    if applications:
+        company_ids, seeker_ids = pks(Company), pks(JobSeeker)
+        if applications * 2 > len(company_ids) * len(seeker_ids):
+            raise ValueError('%d applications need more companies or job seekers.' % applications)
+        insert(Application, build_applications(applications, rng, company_ids, seeker_ids), batch_size)
@@ -0,0 +1,33 @@
+from jobinfo.models import (
+    AppCycle, Application, ArchivedApplication, ArchivedCompany, Company, JobSeeker, Position, Season, Year,
+)
+from jobinfo.utils import bump_model_version
+
+# For each model a label depends on: the lookup from Company and the
+# lookup from Application that reach it.
+LABEL_DEPENDENCIES = {
+    Year: ('appCycle__year', 'company__appCycle__year'),
+    Season: ('appCycle__season', 'company__appCycle__season'),
+    AppCycle: ('appCycle', 'company__appCycle'),
+    Position: ('position', 'company__position'),
+    Company: (None, 'company'),
+    JobSeeker: (None, 'jobSeeker'),
+}
+
+
+def bump_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def refresh_display_labels(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    company_lookup, application_lookup = LABEL_DEPENDENCIES[sender]
+    if company_lookup is not None:
+        Company.objects.filter(**{company_lookup: instance}).refresh_display_labels()
+    Application.objects.filter(**{application_lookup: instance}).refresh_display_labels()
+    # A live company has no archived applications.
+    if sender is not Company:
+        if company_lookup is not None:
+            ArchivedCompany.objects.filter(**{company_lookup: instance}).refresh_display_labels()
+        ArchivedApplication.objects.filter(**{application_lookup: instance}).refresh_display_labels()
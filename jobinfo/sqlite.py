@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def get_profile(name=None):
+    name = name or settings.JOBINFO_SQLITE_PROFILE
+    try:
+        return settings.JOBINFO_SQLITE_PROFILES[name]
+    except KeyError:
+        raise ImproperlyConfigured('Unknown JOBINFO_SQLITE_PROFILE %r.' % name)
+
+
+# Takes the DB-API connection rather than Django's wrapper so the pragmas
+# are not counted against the query budget of whichever request happened
+# to open the connection.
+def apply_pragmas(dbapi_connection, pragmas):
+    for name, value in pragmas.items():
+        dbapi_connection.execute('PRAGMA %s = %s' % (name, value))
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection, get_profile()['PRAGMAS'])
@@ -0,0 +1,53 @@
+(function () {
+    'use strict';
+
+    function attach(select) {
+        var search = document.createElement('input');
+        var timer = null;
+        search.type = 'search';
+        search.placeholder = 'Search...';
+        search.setAttribute('autocomplete', 'off');
+        select.parentNode.insertBefore(search, select);
+
+        function load(term) {
+            var url = select.getAttribute('data-autocomplete-url') +
+                '?q=' + encodeURIComponent(term);
+            fetch(url, {credentials: 'same-origin'})
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    var empty = select.querySelector('option[value=""]');
+                    var selected = select.options[select.selectedIndex];
+                    select.innerHTML = '';
+                    if (empty) {
+                        select.appendChild(empty);
+                    }
+                    if (selected && selected.value) {
+                        select.appendChild(selected);
+                    }
+                    data.results.forEach(function (result) {
+                        if (selected && String(result.id) === selected.value) {
+                            return;
+                        }
+                        var option = document.createElement('option');
+                        option.value = result.id;
+                        option.textContent = result.text;
+                        select.appendChild(option);
+                    });
+                });
+        }
+
+        search.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () { load(search.value.trim()); }, 250);
+        });
+        select.addEventListener('focus', function () {
+            if (select.options.length <= 2 && !search.value) {
+                load('');
+            }
+        }, {once: true});
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(attach);
+    });
+})();
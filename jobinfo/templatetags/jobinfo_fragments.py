@@ -0,0 +1,57 @@
+from django import template
+from django.apps import apps
+from django.conf import settings
+
+from jobinfo.fragments import fragment_cache, fragment_cache_enabled, fragment_key, record_fragment
+
+register = template.Library()
+
+
+class VersionedCacheNode(template.Node):
+    def __init__(self, nodelist, name, model, vary_on, vary_on_perms):
+        self.nodelist = nodelist
+        self.name = name
+        self.model = model
+        self.vary_on = vary_on
+        self.vary_on_perms = vary_on_perms
+
+    def render(self, context):
+        if not fragment_cache_enabled():
+            return self.nodelist.render(context)
+        # Looked up already by CachedListMixin, which skipped the queries
+        # the contents would need.
+        cached = context.get('cached_fragments', {}).get(self.name)
+        if cached is not None:
+            return cached
+        request = context.get('request')
+        user = context.get('user') if self.vary_on_perms else None
+        key = fragment_key(
+            self.name, self.model, [variable.resolve(context) for variable in self.vary_on], user, request)
+        cache = fragment_cache()
+        content = cache.get(key)
+        record_fragment(request, content is not None)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, getattr(settings, 'JOBINFO_FRAGMENT_CACHE_TIMEOUT', 600))
+        return content
+
+
+# {% versioned_cache 'name' 'app_label.Model' [vary_on ...] [vary_on_perms] %}
+# caches its contents until a row of the model or of a model its foreign
+# keys reach is written.
+@register.tag
+def versioned_cache(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError('%r takes a fragment name and a model label.' % bits[0])
+    vary_on_perms = bits[-1] == 'vary_on_perms'
+    if vary_on_perms:
+        bits = bits[:-1]
+    name, label = (bit.strip('\'"') for bit in bits[1:3])
+    try:
+        model = apps.get_model(label)
+    except (LookupError, ValueError):
+        raise template.TemplateSyntaxError('%r got an unknown model %r.' % (bits[0], label))
+    nodelist = parser.parse(('endversioned_cache',))
+    parser.delete_first_token()
+    return VersionedCacheNode(nodelist, name, model, [parser.compile_filter(bit) for bit in bits[3:]], vary_on_perms)
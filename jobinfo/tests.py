@@ -1,7 +1,40 @@
-from django.test import TestCase, Client
-from jobinfo.models import Season, Year, AppCycle, Position, JobRecruiter, JobSeeker, Company, Application
-from django.contrib.auth.models import User, Permission
+import json
+import os
+import random
+import sqlite3
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.http import Http404, HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from jobinfo.changes import table_changes
+from jobinfo.models import Season, Year, AppCycle, Position, JobRecruiter, JobSeeker, Company, Application, TableChange
+from jobinfo.models import ArchivedApplication, ArchivedCompany
+from django.contrib.auth.models import Group, User, Permission
 from django.urls import reverse, resolve
+from jobinfo.archive import RestoreConflict, archive_cycle, restore_cycle
+from jobinfo.benchmark import regressions
+from jobinfo.importers import Lookups, RowError
+from jobinfo.bulk import bulk_apply, reassign, rollover, rollover_plan
+from jobinfo.management.commands.jobinfo_explain import plan_flags
+from jobinfo.middleware import QueryBudgetExceeded, QueryInstrumentationMiddleware
+from jobinfo.permissions import permission_cache_key
+from jobinfo.replica import PrimaryReplicaRouter, backup, read_intent
+from jobinfo.search import SEARCH_INDEXES, SearchResults
+from jobinfo.seed import build_people
+from jobinfo.sqlite import get_profile
+from jobinfo.utils import (
+    AutocompleteMixin, CachedCount, CountedPaginator, InvalidCursor, KeysetPaginator, NoCount, get_model_version,
+    get_model_versions,
+)
 from jobinfo.forms import (JobRecruiterForm, CompanyForm, PositionForm, AppCycleForm, JobSeekerForm, ApplicationForm)
 from jobinfo.views import (
     JobRecruiterList, JobRecruiterDetail, JobRecruiterCreate, JobRecruiterUpdate, JobRecruiterDelete,
@@ -9,10 +42,63 @@ from jobinfo.views import (
     PositionList, PositionDetail, PositionCreate, PositionUpdate, PositionDelete,
     AppCycleList, AppCycleDetail, AppCycleCreate, AppCycleUpdate, AppCycleDelete,
     JobSeekerList, JobSeekerDetail, JobSeekerCreate, JobSeekerUpdate, JobSeekerDelete,
-    ApplicationList, ApplicationDetail, ApplicationCreate, ApplicationUpdate, ApplicationDelete
+    ApplicationList, ApplicationDetail, ApplicationCreate, ApplicationUpdate, ApplicationDelete,
+    AsyncCompanyList, AsyncCompanyDetail, AsyncJobSeekerList, AsyncJobSeekerDetail, AsyncApplicationDetail,
 )
 
 
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def jobinfo_codenames(prefix):
+    return Permission.objects.filter(
+        content_type__app_label='jobinfo', codename__startswith=prefix).values_list('codename', flat=True)
+
+
+# Empty caches, strict query budgets, a client logged in with only the
+# given jobinfo permissions, and the cycles, position and recruiter
+# companies hang off.
+class JobinfoTestMixin:
+    def setUp(self):
+        clear_caches()
+        strict = override_settings(JOBINFO_QUERY_BUDGET_STRICT=True)
+        strict.enable()
+        self.addCleanup(strict.disable)
+
+    def create_tester(self, codenames=()):
+        self.user = User.objects.create_user(username='tester', password='{iSchoolUI}')
+        self.grant(*codenames)
+
+    def login_with(self, codenames):
+        self.create_tester(codenames)
+        self.client = Client()
+        self.client.login(username='tester', password='{iSchoolUI}')
+
+    def grant(self, *codenames):
+        self.user.user_permissions.add(*Permission.objects.filter(
+            content_type__app_label='jobinfo', codename__in=codenames))
+
+    def create_fixtures(self, year=2023, seasons=('Winter',)):
+        year = Year.objects.create(year=year)
+        self.app_cycles = [
+            AppCycle.objects.create(year=year, season=Season.objects.create(season_sequence=number, season_name=name))
+            for number, name in enumerate(seasons, 1)
+        ]
+        self.app_cycle = self.app_cycles[0]
+        self.position = Position.objects.create(position_number='P1', position_name='Engineer')
+        self.job_recruiter = JobRecruiter.objects.create(first_name='John', last_name='Doe')
+
+    def create_company(self, name, app_cycle=None, job_recruiter=None):
+        return Company.objects.create(company_name=name, appCycle=app_cycle or self.app_cycle, position=self.position,
+                                      jobRecruiter=job_recruiter or self.job_recruiter)
+
+
+class JobinfoTestCase(JobinfoTestMixin, TestCase):
+    pass
+
+
 class SeasonModelTest(TestCase):
     def test_create_season(self):
         season = Season.objects.create(season_sequence=1, season_name="Winter")
@@ -203,3 +289,1629 @@ class URLPatternsTestCase(TestCase):
             url = reverse(urlpattern_name, args=[1]) if '<int:pk>' in urlpattern else reverse(urlpattern_name)
             self.assertEqual(resolve(url).func.view_class, view)
 
+
+class ListViewQueryCountTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        self.year = Year.objects.create(year=2023)
+        self.season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.job_recruiter = JobRecruiter.objects.create(first_name="John", last_name="Doe")
+        self.created = 0
+
+    def add_rows(self, count):
+        for i in range(self.created, self.created + count):
+            year = Year.objects.create(year=3000 + i)
+            app_cycle = AppCycle.objects.create(year=year, season=self.season)
+            position = Position.objects.create(position_number="P%03d" % i, position_name="Engineer")
+            company = Company.objects.create(
+                company_name="Corp %d" % i,
+                appCycle=app_cycle,
+                position=position,
+                jobRecruiter=self.job_recruiter
+            )
+            job_seeker = JobSeeker.objects.create(first_name="Jane", last_name="Doe", disambiguator=str(i))
+            Application.objects.create(jobSeeker=job_seeker, company=company)
+        self.created += count
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_flat_as_rows_grow(self):
+        for urlpattern_name in ['jobinfo_company_list_urlpattern',
+                                'jobinfo_application_list_urlpattern',
+                                'jobinfo_appCycle_list_urlpattern']:
+            with self.subTest(urlpattern_name=urlpattern_name):
+                url = reverse(urlpattern_name)
+                self.count_queries(url)
+                self.add_rows(1)
+                small = self.count_queries(url)
+                self.add_rows(10)
+                large = self.count_queries(url)
+                self.assertEqual(small, large)
+
+
+class DetailViewTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        year = Year.objects.create(year=2023)
+        season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.app_cycle = AppCycle.objects.create(year=year, season=season)
+        self.position = Position.objects.create(position_number="P001", position_name="Engineer")
+        self.job_recruiter = JobRecruiter.objects.create(first_name="John", last_name="Doe")
+        self.company = Company.objects.create(company_name="Corp", appCycle=self.app_cycle, position=self.position,
+                                              jobRecruiter=self.job_recruiter)
+        self.job_seekers = [
+            JobSeeker.objects.create(first_name="Jane", last_name="Quokka", disambiguator='%02d' % i)
+            for i in range(30)
+        ]
+        for job_seeker in self.job_seekers:
+            Application.objects.create(jobSeeker=job_seeker, company=self.company)
+
+    def count_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_is_flat_as_children_grow(self):
+        names = ("Corp %d" % i for i in range(100))
+        for obj in (self.company, self.app_cycle, self.position, self.job_recruiter, self.job_seekers[0],
+                    Application.objects.first()):
+            with self.subTest(obj=obj):
+                clear_caches()
+                small, response = self.count_queries(obj.get_absolute_url())
+                for i in range(3):
+                    company = Company.objects.create(company_name=next(names), appCycle=self.app_cycle,
+                                                     position=self.position, jobRecruiter=self.job_recruiter)
+                    Application.objects.create(jobSeeker=self.job_seekers[0], company=company)
+                clear_caches()
+                large, response = self.count_queries(obj.get_absolute_url())
+                self.assertEqual(small, large)
+
+    def test_children_are_paginated_in_place(self):
+        url = self.company.get_absolute_url()
+        count, response = self.count_queries(url)
+        self.assertEqual(len(response.context['application_list']), 25)
+        self.assertEqual(response.context['jobRecruiter'], self.job_recruiter)
+        self.assertEqual(response.context['next_page_url'], None)
+        self.assertEqual(response.context['last_page_url'], '?page=2')
+        count, response = self.count_queries(url, {'page': 2})
+        self.assertEqual([application.jobSeeker for application in response.context['application_list']],
+                         self.job_seekers[25:])
+        self.assertEqual(self.client.get(url, {'page': 9}).status_code, 404)
+
+
+class KeysetPaginatorTestCase(TestCase):
+    def setUp(self):
+        for i in range(30):
+            JobSeeker.objects.create(
+                first_name="Jane%d" % (i % 4),
+                last_name="Doe%d" % (i % 3),
+                disambiguator=str(i)
+            )
+        self.paginator = KeysetPaginator(JobSeeker.objects.all(), 7, JobSeeker._meta.ordering)
+
+    def test_walk_forward(self):
+        seen = []
+        page = self.paginator.page(None)
+        self.assertFalse(page.has_previous())
+        seen.extend(page)
+        while page.has_next():
+            page = self.paginator.page(page.next_cursor())
+            seen.extend(page)
+        self.assertEqual(seen, list(JobSeeker.objects.all()))
+
+    def test_walk_backward_from_last(self):
+        seen = []
+        page = self.paginator.page(self.paginator.page(None).last_cursor())
+        self.assertFalse(page.has_next())
+        seen[:0] = list(page)
+        while page.has_previous():
+            page = self.paginator.page(page.previous_cursor())
+            seen[:0] = list(page)
+        self.assertEqual(seen, list(JobSeeker.objects.all()))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.paginator.page('not-a-cursor')
+
+    def test_cursor_values_must_be_scalars(self):
+        for values in ([None, None, None], [{'a': 1}, [1, 2], None], ['Doe', 'Jane', True], ['Doe', 'Jane', 2 ** 64]):
+            with self.subTest(values=values), self.assertRaises(InvalidCursor):
+                self.paginator.page(self.paginator.encode_cursor(self.paginator.forward, values))
+
+
+class JobSeekerListKeysetTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        for i in range(60):
+            JobSeeker.objects.create(first_name="Jane", last_name="Aaa%02d" % i)
+        self.url = reverse('jobinfo_jobSeeker_list_urlpattern')
+
+    @override_settings(JOBINFO_FRAGMENT_CACHE=False)
+    def test_deep_page_costs_the_same_as_first_page(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(self.url)
+        cursor = response.context['jobSeeker_list'].last_cursor()
+        with CaptureQueriesContext(connection) as last:
+            response = self.client.get(self.url, {'cursor': cursor})
+        self.assertContains(response, str(JobSeeker.objects.last()))
+        self.assertIsNone(response.context['next_page_url'])
+        self.assertEqual(len(first), len(last))
+        for query in first.captured_queries + last.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'])
+            self.assertNotIn('OFFSET', query['sql'])
+
+    def test_first_page_link_keeps_the_query_string(self):
+        response = self.client.get(self.url, {'per': 'x'})
+        cursor = response.context['jobSeeker_list'].next_cursor()
+        response = self.client.get(self.url, {'per': 'x', 'cursor': cursor})
+        self.assertEqual(response.context['first_page_url'], '?per=x')
+        self.assertIn('per=x', response.context['next_page_url'])
+
+    def test_invalid_cursor_shows_first_page(self):
+        paginator = KeysetPaginator(JobSeeker.objects.all(), 1, JobSeeker._meta.ordering)
+        for cursor in ('!!', paginator.encode_cursor(paginator.forward, [None, None, None])):
+            response = self.client.get(self.url, {'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Aaa00')
+
+
+class PaginatedListTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        for i in range(30):
+            Position.objects.create(position_number="P%03d" % i, position_name="Engineer")
+        self.url = reverse('jobinfo_position_list_urlpattern')
+
+    def test_list_is_paginated(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['position_list']), 25)
+        self.assertContains(response, 'P000')
+        self.assertNotContains(response, 'P029')
+        self.assertEqual(response.context['next_page_url'], None)
+        self.assertEqual(response.context['last_page_url'], '?page=2')
+        response = self.client.get(self.url, {'page': 2})
+        self.assertContains(response, 'P029')
+
+    def test_stream_link_keeps_the_query_string(self):
+        response = self.client.get(self.url, {'per': 'x', 'page': 2})
+        self.assertEqual(response.context['stream_url'], '?per=x&stream=1')
+
+    def test_stream_renders_every_row(self):
+        response = self.client.get(self.url, {'stream': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        for i in range(30):
+            self.assertIn('P%03d' % i, content)
+        self.assertIn('Position List', content)
+        self.assertIn('</html>', content)
+
+
+class CountProviderTestCase(TestCase):
+    def setUp(self):
+        clear_caches()
+        for i in range(12):
+            Position.objects.create(position_number="P%03d" % i, position_name="Engineer")
+        self.queryset = Position.objects.filter(position_name="Engineer")
+
+    def test_cached_count_is_invalidated_by_save_and_delete(self):
+        provider = CachedCount()
+        self.assertEqual(provider.count(self.queryset), 12)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(provider.count(self.queryset), 12)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+        position = Position.objects.create(position_number="P100", position_name="Engineer")
+        self.assertEqual(provider.count(self.queryset), 13)
+        position.delete()
+        self.assertEqual(provider.count(self.queryset), 12)
+
+    def test_cached_count_follows_unsignalled_writes(self):
+        provider = CachedCount()
+        self.assertEqual(provider.count(self.queryset), 12)
+        Position.objects.filter(position_number="P000").update(position_name="Designer")
+        self.assertEqual(provider.count(self.queryset), 11)
+
+    def test_cached_count_reuses_the_request_generations(self):
+        provider = CachedCount()
+        provider.count(self.queryset)
+        request = RequestFactory().get('/')
+        table_changes([Position], request=request)
+        with self.assertNumQueries(0):
+            self.assertEqual(provider.count(self.queryset, request), 12)
+
+    def test_no_count_mode_fetches_one_extra_row(self):
+        paginator = CountedPaginator(self.queryset, 5, count_provider=NoCount())
+        with CaptureQueriesContext(connection) as queries:
+            page = paginator.page(2)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT(', queries[0]['sql'])
+        self.assertTrue(page.has_next())
+        self.assertEqual(len(page), 5)
+        page = paginator.page(3)
+        self.assertFalse(page.has_next())
+        self.assertEqual(len(page), 2)
+        self.assertEqual(page.end_index(), 12)
+        self.assertIsNone(paginator.num_pages)
+
+
+class DisplayLabelTestCase(TestCase):
+    def setUp(self):
+        self.year = Year.objects.create(year=2023)
+        self.season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.app_cycle = AppCycle.objects.create(year=self.year, season=self.season)
+        self.position = Position.objects.create(position_number="P001", position_name="Software Engineer")
+        self.job_recruiter = JobRecruiter.objects.create(first_name="John", last_name="Doe")
+        self.job_seeker = JobSeeker.objects.create(first_name="Jane", last_name="Doe", disambiguator="1")
+        self.company = Company.objects.create(
+            company_name="Example Corp",
+            appCycle=self.app_cycle,
+            position=self.position,
+            jobRecruiter=self.job_recruiter
+        )
+        self.application = Application.objects.create(jobSeeker=self.job_seeker, company=self.company)
+
+    def test_labels_are_stored_on_save(self):
+        self.assertEqual(self.company.display_label, "P001 - Example Corp (2023 - Winter)")
+        self.assertEqual(self.application.display_label, "P001 - Example Corp (2023 - Winter) / Doe, Jane (1)")
+        application = Application.objects.get(pk=self.application.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(application), self.application.display_label)
+
+    def test_upstream_changes_refresh_labels(self):
+        self.season.season_name = "Spring"
+        self.season.save()
+        self.job_seeker.disambiguator = ""
+        self.job_seeker.save()
+        self.company.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertEqual(self.company.display_label, "P001 - Example Corp (2023 - Spring)")
+        self.assertEqual(self.application.display_label, "P001 - Example Corp (2023 - Spring) / Doe, Jane")
+
+    def test_label_prefix_search(self):
+        self.assertQuerysetEqual(Company.objects.label_startswith("P001 - Ex"), [self.company])
+        self.assertQuerysetEqual(Company.objects.label_startswith("P002"), [])
+
+    def test_rebuild_command(self):
+        Company.objects.update(display_label='')
+        Application.objects.update(display_label='')
+        call_command('jobinfo_rebuild_labels', batch_size=1, stdout=StringIO())
+        self.company.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertEqual(self.company.display_label, self.company.build_display_label())
+        self.assertEqual(self.application.display_label, self.application.build_display_label())
+
+    def test_sort_keys_follow_upstream_changes(self):
+        self.season.season_sequence = 4
+        self.season.save()
+        self.job_seeker.last_name = "Adams"
+        self.job_seeker.save()
+        self.company.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertEqual(self.company.sort_key, "P001\x01Software Engineer\x01Example Corp\x01002023\x01000004")
+        self.assertEqual(self.company.sort_key, self.company.build_sort_key())
+        self.assertEqual(self.application.sort_key, self.application.build_sort_key())
+
+    def test_sort_key_ordering_matches_related_ordering(self):
+        position = Position.objects.create(position_number="P001", position_name="Analyst")
+        later = AppCycle.objects.create(year=Year.objects.create(year=2024), season=self.season)
+        for name, app_cycle, company_position in [("Example", self.app_cycle, self.position),
+                                                  ("Example Corp", later, self.position),
+                                                  ("Zed", self.app_cycle, position),
+                                                  ("A", later, position)]:
+            company = Company.objects.create(company_name=name, appCycle=app_cycle, position=company_position,
+                                             jobRecruiter=self.job_recruiter)
+            Application.objects.create(company=company, jobSeeker=self.job_seeker)
+        self.assertEqual(list(Company.objects.all()),
+                         list(Company.objects.order_by('position', 'company_name', 'appCycle')))
+        self.assertEqual(list(Application.objects.all()),
+                         list(Application.objects.order_by('company__position', 'company__company_name',
+                                                           'company__appCycle', 'jobSeeker')))
+
+    def test_list_orderings_use_indexes(self):
+        for queryset in (Company.objects.all()[:25], Application.objects.all()[:25],
+                         self.job_recruiter.companies.all(), self.company.applications.all(),
+                         self.job_seeker.applications.all(), self.position.companies.all()):
+            with connection.cursor() as cursor:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertEqual(plan_flags(sql, plan), [], plan)
+
+
+class AutocompleteTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames(''))
+        self.job_seekers = [
+            JobSeeker.objects.create(first_name="Jane%02d" % i, last_name="Aaa%02d" % i)
+            for i in range(30)
+        ]
+        self.year = Year.objects.create(year=2023)
+        self.season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.app_cycle = AppCycle.objects.create(year=self.year, season=self.season)
+        self.position = Position.objects.create(position_number="Q001", position_name="Software Engineer")
+        self.job_recruiter = JobRecruiter.objects.create(first_name="John", last_name="Doe")
+        self.company = Company.objects.create(
+            company_name="Example Corp",
+            appCycle=self.app_cycle,
+            position=self.position,
+            jobRecruiter=self.job_recruiter
+        )
+
+    def test_job_seeker_prefix_search(self):
+        url = reverse('jobinfo_jobSeeker_autocomplete_urlpattern')
+        response = self.client.get(url, {'q': 'Aaa1'})
+        results = response.json()['results']
+        self.assertEqual([r['text'] for r in results], ['Aaa%02d, Jane%02d' % (i, i) for i in range(10, 20)])
+        response = self.client.get(url, {'q': 'Aaa12, Jane1'})
+        self.assertEqual(response.json()['results'], [{'id': self.job_seekers[12].pk, 'text': 'Aaa12, Jane12'}])
+        response = self.client.get(url)
+        self.assertEqual(len(response.json()['results']), AutocompleteMixin.limit)
+
+    def test_company_and_position_prefix_search(self):
+        response = self.client.get(reverse('jobinfo_company_autocomplete_urlpattern'), {'q': 'Q001 - Ex'})
+        self.assertEqual(response.json()['results'], [{'id': self.company.pk, 'text': str(self.company)}])
+        response = self.client.get(reverse('jobinfo_position_autocomplete_urlpattern'), {'q': 'Q0'})
+        self.assertEqual(response.json()['results'], [{'id': self.position.pk, 'text': str(self.position)}])
+
+    def test_company_search_matches_company_names(self):
+        other = Company.objects.create(company_name="Q001 Labs", appCycle=self.app_cycle, position=self.position,
+                                       jobRecruiter=self.job_recruiter)
+        url = reverse('jobinfo_company_autocomplete_urlpattern')
+        response = self.client.get(url, {'q': 'Exam'})
+        self.assertEqual(response.json()['results'], [{'id': self.company.pk, 'text': str(self.company)}])
+        response = self.client.get(url, {'q': 'Q001'})
+        self.assertEqual([r['id'] for r in response.json()['results']], [self.company.pk, other.pk])
+        for queryset in (Company.objects.label_startswith('Q0').order_by('display_label')[:20],
+                         Company.objects.name_startswith('Ex')[:20]):
+            with connection.cursor() as cursor:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertEqual(plan_flags(sql, plan), [], plan)
+
+    def test_form_page_does_not_list_every_row(self):
+        response = self.client.get(reverse('jobinfo_application_create_urlpattern'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'data-autocomplete-url')
+        self.assertNotContains(response, 'Aaa05')
+        self.assertNotContains(response, 'Example Corp')
+
+    def test_form_resolves_submitted_keys(self):
+        form = ApplicationForm({'jobSeeker': self.job_seekers[3].pk, 'company': self.company.pk})
+        self.assertTrue(form.is_valid())
+        self.assertIn('Aaa03, Jane03', str(form['jobSeeker']))
+        form = ApplicationForm({'jobSeeker': 'nope', 'company': self.company.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('---------', str(form['jobSeeker']))
+
+
+class ImportCommandTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        year = Year.objects.create(year=2023)
+        season = Season.objects.create(season_sequence=1, season_name="Winter")
+        AppCycle.objects.create(year=year, season=season)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as target:
+            target.write(content)
+        return path
+
+    def run_import(self, *args, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('jobinfo_import', *args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_all_entities(self):
+        self.run_import('jobRecruiter', self.write('recruiters.csv', (
+            'first_name,last_name,disambiguator\n'
+            'John,Zed,\n'
+        )))
+        self.run_import('jobSeeker', self.write('seekers.csv', (
+            'first_name,last_name,disambiguator\n'
+            'Jane,Zed,1\n'
+            'Joe,Zed,2\n'
+        )))
+        self.run_import('position', self.write('positions.csv', (
+            'position_number,position_name\n'
+            'Z1,Engineer\n'
+        )))
+        self.run_import('company', self.write('companies.csv', (
+            'company_name,year,season,position_number,position_name,'
+            'recruiter_last_name,recruiter_first_name,recruiter_disambiguator\n'
+            'Acme,2023,Winter,Z1,Engineer,Zed,John,\n'
+        )))
+        stdout, stderr = self.run_import('application', self.write('applications.jsonl', '\n'.join([
+            '{"year": 2023, "season": "Winter", "position_number": "Z1", "position_name": "Engineer",'
+            ' "company_name": "Acme", "seeker_last_name": "Zed", "seeker_first_name": "Jane",'
+            ' "seeker_disambiguator": "1"}',
+            '{"year": 2023, "season": "Winter", "position_number": "Z1", "position_name": "Engineer",'
+            ' "company_name": "Acme", "seeker_last_name": "Zed", "seeker_first_name": "Nobody"}',
+            'not json',
+        ])), batch_size=2)
+        self.assertIn('1 rows written', stdout)
+        self.assertIn('2 rows rejected', stdout)
+        self.assertIn('row 2: unknown job seeker Zed / Nobody / ', stderr)
+        self.assertIn('row 3: invalid JSON', stderr)
+        application = Application.objects.get(jobSeeker__last_name='Zed')
+        self.assertEqual(application.display_label, "Z1 - Acme (2023 - Winter) / Zed, Jane (1)")
+        self.assertEqual(application.company.display_label, "Z1 - Acme (2023 - Winter)")
+
+    def test_resume_skips_checkpointed_rows(self):
+        path = self.write('positions.csv', (
+            'position_number,position_name\n'
+            'Z1,Engineer\n'
+            'Z2,Engineer\n'
+            'Z3,Engineer\n'
+        ))
+        with open(path + '.checkpoint', 'w') as target:
+            json.dump({'rows': 2}, target)
+        stdout, stderr = self.run_import('position', path, resume=True)
+        self.assertIn('Resuming after row 2.', stdout)
+        self.assertQuerysetEqual(
+            Position.objects.filter(position_number__startswith='Z').values_list('position_number', flat=True),
+            ['Z3'])
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+
+class ExportTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with([])
+        season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.app_cycles = [
+            AppCycle.objects.create(year=Year.objects.create(year=year), season=season)
+            for year in (2030, 2031)
+        ]
+        position = Position.objects.create(position_number="P001", position_name="Software Engineer")
+        job_recruiter = JobRecruiter.objects.create(first_name="John", last_name="Doe")
+        job_seeker = JobSeeker.objects.create(first_name="Jane", last_name="Doe")
+        for app_cycle in self.app_cycles:
+            company = Company.objects.create(
+                company_name="Example Corp",
+                appCycle=app_cycle,
+                position=position,
+                jobRecruiter=job_recruiter
+            )
+            Application.objects.create(jobSeeker=job_seeker, company=company)
+        self.url = reverse('jobinfo_application_export_urlpattern')
+
+    def test_export_requires_permission(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_export_csv_filtered_by_app_cycle(self):
+        self.grant('view_application')
+        response = self.client.get(self.url, {'appCycle': self.app_cycles[1].pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['application_id', 'year', 'season'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn('2031,Winter,P001,Software Engineer,Example Corp,Doe,Jane,', lines[1])
+
+    def test_export_jsonl(self):
+        self.grant('view_application')
+        response = self.client.get(self.url, {'format': 'jsonl'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['year'] for row in rows], [2030, 2031])
+        self.assertEqual(rows[0]['company_name'], 'Example Corp')
+
+    def test_export_rejects_bad_parameters(self):
+        self.grant('view_application')
+        self.assertEqual(self.client.get(self.url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'company': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'company': '99999999999999999999999'}).status_code, 400)
+
+
+class SearchTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        year = Year.objects.create(year=2023)
+        season = Season.objects.create(season_sequence=1, season_name="Winter")
+        self.position = Position.objects.create(position_number="X9", position_name="Quokka Wrangler")
+        self.job_recruiter = JobRecruiter.objects.create(first_name="Quentin", last_name="Quokkason")
+        self.job_seeker = JobSeeker.objects.create(first_name="Quinn", last_name="Quokkason")
+        self.company = Company.objects.create(
+            company_name="Quokka Corp",
+            appCycle=AppCycle.objects.create(year=year, season=season),
+            position=self.position,
+            jobRecruiter=self.job_recruiter
+        )
+
+    def search(self, term, kinds=SEARCH_INDEXES):
+        return [hit.object for hit in SearchResults(term, kinds)[0:25]]
+
+    def test_search_across_models(self):
+        self.assertEqual(
+            self.search('quokk'),
+            [self.job_recruiter, self.job_seeker, self.position, self.company])
+        self.assertEqual(self.search('quinn quokk'), [self.job_seeker])
+        self.assertEqual(self.search('quokk', ['company']), [self.company])
+        self.assertEqual(self.search('"); DROP TABLE x; --'), [])
+
+    def test_scores_only_order_hits_within_a_kind(self):
+        JobSeeker.objects.bulk_create([
+            JobSeeker(first_name="Quokka", last_name="Quokkason", disambiguator=str(i)) for i in range(20)
+        ])
+        hits = SearchResults('quokk', SEARCH_INDEXES)[0:25]
+        self.assertEqual([hit.kind for hit in hits],
+                         ['jobRecruiter'] + ['jobSeeker'] * 21 + ['position', 'company'])
+        self.assertEqual([hit.object for hit in SearchResults('quokk', SEARCH_INDEXES)[22:24]],
+                         [self.position, self.company])
+
+    def test_index_follows_updates_deletes_and_bulk_inserts(self):
+        self.job_seeker.last_name = "Wombatson"
+        self.job_seeker.save()
+        self.assertEqual(self.search('wombat'), [self.job_seeker])
+        self.assertNotIn(self.job_seeker, self.search('quokk'))
+        self.position.position_name = "Wombat Wrangler"
+        self.position.save()
+        self.assertIn(self.company, self.search('quokka corp'))
+        JobSeeker.objects.bulk_create([JobSeeker(first_name="Bulk", last_name="Wombatson")])
+        self.assertEqual(len(self.search('wombatson', ['jobSeeker'])), 2)
+        self.job_seeker.applications.all().delete()
+        self.job_seeker.delete()
+        self.assertEqual([str(o) for o in self.search('wombatson', ['jobSeeker'])], ['Wombatson, Bulk'])
+
+    def test_search_view_respects_permissions(self):
+        self.user.user_permissions.remove(Permission.objects.get(codename='view_jobseeker'))
+        response = self.client.get(reverse('jobinfo_search_urlpattern'), {'q': 'quokk'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Quokka Corp')
+        self.assertNotContains(response, 'Quinn')
+
+    def test_search_json_paginates(self):
+        JobSeeker.objects.bulk_create([
+            JobSeeker(first_name="Quillon", last_name="Quokkason", disambiguator=str(i)) for i in range(31)
+        ])
+        url = reverse('jobinfo_search_json_urlpattern')
+        data = self.client.get(url, {'q': 'quillon', 'kind': 'jobSeeker'}).json()
+        self.assertEqual(len(data['results']), 25)
+        self.assertEqual(data['next'], '?q=quillon&kind=jobSeeker&page=2')
+        data = self.client.get(url + data['next']).json()
+        self.assertEqual(len(data['results']), 6)
+        self.assertIsNone(data['next'])
+
+
+class QueryInstrumentationTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        self.url = reverse('jobinfo_position_list_urlpattern')
+
+    def test_server_timing_header_and_log_line(self):
+        with self.assertLogs('jobinfo.sql', level='INFO') as logs:
+            response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+'
+                                                   r'(, fragments;desc="\d+ hits \d+ misses")?$')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['url_name'], 'jobinfo_position_list_urlpattern')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertLessEqual(len(record['slowest']), 5)
+
+    def test_streaming_response_is_logged_after_the_body(self):
+        with self.assertLogs('jobinfo.sql', level='INFO') as logs:
+            response = self.client.get(self.url, {'stream': 1})
+            self.assertEqual(logs.records, [])
+            b''.join(response.streaming_content)
+        self.assertEqual(len(logs.records), 1)
+
+    @override_settings(JOBINFO_QUERY_BUDGETS={'jobinfo_position_list_urlpattern': 1})
+    def test_budget_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(self.url)
+
+    @override_settings(JOBINFO_QUERY_BUDGETS={'jobinfo_position_list_urlpattern': 1},
+                       JOBINFO_QUERY_BUDGET_STRICT=False)
+    def test_budget_warns_otherwise(self):
+        with self.assertLogs('jobinfo.sql', level='WARNING') as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('over its budget of 1', logs.output[0])
+
+
+class SeedBenchmarkTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        clear_caches()
+
+    def test_people_are_deterministic_and_unique(self):
+        first = [str(person) for person in build_people(JobSeeker, 500, random.Random(7))]
+        second = [str(person) for person in build_people(JobSeeker, 500, random.Random(7))]
+        self.assertEqual(first, second)
+        self.assertEqual(len(set(first)), 500)
+
+    def test_seed_command(self):
+        seekers, applications = JobSeeker.objects.count(), Application.objects.count()
+        call_command('jobinfo_seed', seekers=40, positions=5, companies=12, applications=60,
+                     first_year=2101, years=2, stdout=StringIO())
+        self.assertEqual(AppCycle.objects.filter(year__year__gte=2101).count(), 8)
+        self.assertEqual(Company.objects.count(), 12)
+        self.assertEqual(Application.objects.count(), applications + 60)
+        self.assertGreater(JobSeeker.objects.count(), seekers)
+        self.assertFalse(Application.objects.filter(display_label='').exists())
+        company = Company.objects.first()
+        self.assertEqual(company.display_label, company.build_display_label())
+
+    def test_seed_rejects_impossible_applications(self):
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_seed', applications=10, stdout=StringIO())
+
+    @override_settings(JOBINFO_QUERY_BUDGETS={})
+    def test_benchmark_command(self):
+        group, created = Group.objects.get_or_create(name='ji_user')
+        group.permissions.set(Permission.objects.filter(content_type__app_label='jobinfo', codename__startswith='view_'))
+        call_command('jobinfo_seed', seekers=20, positions=3, companies=5, applications=10, stdout=StringIO())
+        path = os.path.join(self.directory.name, 'results.json')
+        call_command('jobinfo_benchmark', iterations=3, warmup=0, only='_(list|detail)_',
+                     output=path, stdout=StringIO())
+        with open(path) as source:
+            results = json.load(source)
+        # The six HTML lists and details, and the API list and detail of all eight models.
+        self.assertEqual(len(results['results']), 28)
+        for name, result in results['results'].items():
+            self.assertEqual(result['status'], 200, name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['queries'], 0)
+            self.assertGreater(result['peak_kb'], 0)
+        self.assertEqual(results['results']['jobinfo_company_list_urlpattern']['group'], 'ji_user')
+        stdout = StringIO()
+        call_command('jobinfo_benchmark', iterations=1, warmup=0, only='^jobinfo_position_list',
+                     baseline=path, min_delta_ms=10000, stdout=stdout)
+        self.assertIn('No regressions', stdout.getvalue())
+
+    def test_regressions(self):
+        before = {'results': {'a': {'status': 200, 'p50_ms': 10.0, 'p95_ms': 20.0, 'peak_kb': 100.0, 'queries': 5}}}
+        after = {'results': {'a': {'status': 200, 'p50_ms': 10.5, 'p95_ms': 40.0, 'peak_kb': 100.0, 'queries': 6}}}
+        found = regressions(after, before, threshold=20)
+        self.assertEqual([(name, metric) for name, metric, *rest in found], [('a', 'p95_ms'), ('a', 'queries')])
+
+
+class SQLiteProfileTestCase(TestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        pragmas = get_profile()['PRAGMAS']
+        with connection.cursor() as cursor:
+            for name in ('synchronous', 'busy_timeout', 'cache_size', 'temp_store'):
+                cursor.execute('PRAGMA %s' % name)
+                value = cursor.fetchone()[0]
+                expected = {'normal': 1, 'memory': 2}.get(pragmas.get(name), pragmas.get(name))
+                if expected is not None:
+                    self.assertEqual(value, expected, name)
+
+    @override_settings(JOBINFO_SQLITE_PROFILE='missing')
+    def test_unknown_profile(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_profile()
+
+    def test_benchmark_needs_a_database_file(self):
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_sqlite_benchmark', duration=0.1, stdout=StringIO())
+
+
+class ExplainCommandTestCase(TestCase):
+    def test_flags(self):
+        self.assertEqual(plan_flags('SELECT * FROM t', ['SCAN t', 'USE TEMP B-TREE FOR ORDER BY']),
+                         ['full scan of t', 'temp sort (USE TEMP B-TREE FOR ORDER BY)'])
+        self.assertEqual(plan_flags('SELECT * FROM t', ['SCAN t USING INDEX t_sort_key',
+                                                        'SEARCH u USING INTEGER PRIMARY KEY (rowid=?)']), [])
+        self.assertEqual(plan_flags('SELECT COUNT(*) AS "__count" FROM t', ['SCAN t']), [])
+        self.assertEqual(plan_flags('SELECT * FROM t ORDER BY t.id ASC LIMIT 101', ['SCAN t']), [])
+        self.assertEqual(plan_flags('SELECT * FROM t WHERE t.x = 1 ORDER BY t.id ASC LIMIT 101', ['SCAN t']),
+                         ['full scan of t'])
+
+    def test_command(self):
+        group, created = Group.objects.get_or_create(name='ji_user')
+        group.permissions.set(Permission.objects.filter(content_type__app_label='jobinfo', codename__startswith='view_'))
+        stdout = StringIO()
+        call_command('jobinfo_explain', only='_(company|application)_list_', stdout=stdout)
+        self.assertIn('jobinfo_company_list_urlpattern:', stdout.getvalue())
+        self.assertIn('0 flagged queries.', stdout.getvalue())
+
+
+class PermissionCacheTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tester()
+        self.group = Group.objects.create(name='ji_test')
+        self.view_company = Permission.objects.get(content_type__app_label='jobinfo', codename='view_company')
+        self.view_position = Permission.objects.get(content_type__app_label='jobinfo', codename='view_position')
+
+    def permissions(self):
+        return User.objects.get(pk=self.user.pk).get_all_permissions()
+
+    def test_warm_cache_reads_only_the_generations(self):
+        self.user.user_permissions.add(self.view_company)
+        self.assertEqual(self.permissions(), {'jobinfo.view_company'})
+        user = User.objects.get(pk=self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(user.has_perm('jobinfo.view_company'))
+        self.assertEqual(len(queries), 1)
+        self.assertIn('jobinfo_tablechange', queries[0]['sql'])
+
+    # Changes that send no signal, as another worker's would look to
+    # this one, still give a new key.
+    def test_unsignalled_changes_invalidate(self):
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.view_company)
+        self.assertEqual(self.permissions(), {'jobinfo.view_company'})
+        Group.permissions.through.objects.filter(group=self.group).delete()
+        self.assertEqual(self.permissions(), set())
+        User.groups.through.objects.filter(user=self.user).delete()
+        Group.permissions.through.objects.create(group=self.group, permission=self.view_position)
+        self.assertEqual(self.permissions(), set())
+        User.objects.filter(pk=self.user.pk).update(is_superuser=True)
+        self.assertIn('jobinfo.view_position', self.permissions())
+
+    def test_login_keeps_the_cache(self):
+        self.assertEqual(self.permissions(), set())
+        key = permission_cache_key(self.user)
+        Client().login(username='tester', password='{iSchoolUI}')
+        self.assertEqual(permission_cache_key(self.user), key)
+
+    def test_group_changes_invalidate(self):
+        self.assertEqual(self.permissions(), set())
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.view_company)
+        self.assertEqual(self.permissions(), {'jobinfo.view_company'})
+        self.view_position.group_set.add(self.group)
+        self.assertEqual(self.permissions(), {'jobinfo.view_company', 'jobinfo.view_position'})
+        self.group.permissions.remove(self.view_company)
+        self.assertEqual(self.permissions(), {'jobinfo.view_position'})
+        self.group.user_set.remove(self.user)
+        self.assertEqual(self.permissions(), set())
+
+    def test_user_changes_invalidate(self):
+        self.assertEqual(self.permissions(), set())
+        self.user.user_permissions.add(self.view_position)
+        self.assertEqual(self.permissions(), {'jobinfo.view_position'})
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.permissions(), set())
+
+    def test_navigation_shows_permitted_links(self):
+        self.user.user_permissions.add(self.view_company)
+        client = Client()
+        client.login(username='tester', password='{iSchoolUI}')
+        response = client.get(reverse('about_urlpattern'))
+        self.assertContains(response, reverse('jobinfo_company_list_urlpattern'))
+        self.assertNotContains(response, reverse('jobinfo_position_list_urlpattern'))
+        with self.assertNumQueries(3):
+            client.get(reverse('about_urlpattern'))
+
+
+class FragmentCacheTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        app_cycle = AppCycle.objects.create(year=Year.objects.create(year=2023),
+                                            season=Season.objects.create(season_sequence=1, season_name='Winter'))
+        self.position = Position.objects.create(position_number='P1', position_name='Engineer')
+        Company.objects.create(company_name='Acme', appCycle=app_cycle, position=self.position,
+                               jobRecruiter=JobRecruiter.objects.create(first_name='John', last_name='Doe'))
+        self.url = reverse('jobinfo_company_list_urlpattern')
+
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(self.url)
+        self.assertIn('0 hits 1 misses', first['Server-Timing'])
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertIn('1 hits 0 misses', second['Server-Timing'])
+        self.assertEqual(first.content, second.content)
+        self.assertFalse([query for query in queries if 'FROM "jobinfo_company"' in query['sql']])
+
+    # update() sends no signal, as a write in another worker looks to
+    # this one; the change triggers still give the fragment a new key.
+    def test_unsignalled_write_invalidates(self):
+        self.assertContains(self.client.get(self.url), 'P1 - Acme')
+        Company.objects.update(display_label='Renamed')
+        self.assertContains(self.client.get(self.url), 'Renamed')
+
+    def test_hit_skips_the_page_queries(self):
+        for name in ('jobRecruiter', 'company', 'jobSeeker', 'position', 'appCycle', 'application'):
+            with self.subTest(name=name):
+                url = reverse('jobinfo_%s_list_urlpattern' % name)
+                first = self.client.get(url)
+                with CaptureQueriesContext(connection) as queries:
+                    second = self.client.get(url)
+                self.assertEqual(first.content, second.content)
+                table = '"jobinfo_%s"' % name.lower()
+                self.assertFalse([query for query in queries if 'FROM %s' % table in query['sql']])
+                self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+
+    def test_shares_the_etag_generations(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len([query for query in queries if 'jobinfo_tablechange' in query['sql']
+                              and 'jobinfo_company' in query['sql']]), 1)
+
+    def test_upstream_save_invalidates(self):
+        self.assertContains(self.client.get(self.url), 'P1 - Acme')
+        self.position.position_number = 'P2'
+        self.position.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'P2 - Acme')
+        self.assertIn('0 hits 1 misses', response['Server-Timing'])
+
+    def test_varies_on_permissions(self):
+        self.assertNotContains(self.client.get(self.url), 'Create New Company')
+        self.grant('add_company')
+        self.assertContains(self.client.get(self.url), 'Create New Company', count=2)
+
+    @override_settings(JOBINFO_FRAGMENT_CACHE=False)
+    def test_can_be_disabled(self):
+        self.client.get(self.url)
+        self.assertNotIn('fragments', self.client.get(self.url)['Server-Timing'])
+
+
+class ConditionalGetTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        self.create_fixtures()
+        self.company = self.create_company('Acme')
+        self.list_url = reverse('jobinfo_company_list_urlpattern')
+        self.detail_url = reverse('jobinfo_company_detail_urlpattern', kwargs={'pk': self.company.pk})
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_list_is_not_modified_without_querying_it(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+        with CaptureQueriesContext(connection) as queries:
+            revalidated = self.revalidate(self.list_url, response)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        self.assertFalse([query for query in queries if 'FROM "jobinfo_company"' in query['sql']])
+        modified_since = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(modified_since.status_code, 304)
+
+    def test_list_changes_with_its_tables(self):
+        response = self.client.get(self.list_url)
+        Position.objects.filter(pk=self.position.pk).update(position_name='Designer')
+        self.assertEqual(self.revalidate(self.list_url, response).status_code, 200)
+
+    def test_detail_ignores_other_objects_of_its_model(self):
+        response = self.client.get(self.detail_url)
+        self.create_company('Other')
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code, 304)
+        self.company.company_name = 'Acme Labs'
+        self.company.save()
+        response = self.revalidate(self.detail_url, response)
+        self.assertEqual(response.status_code, 200)
+        Application.objects.create(company=self.company,
+                                   jobSeeker=JobSeeker.objects.create(first_name='Jane', last_name='Doe'))
+        self.assertEqual(self.revalidate(self.detail_url, response).status_code, 200)
+
+    def test_keyset_lists(self):
+        for name in ('jobinfo_jobRecruiter_list_urlpattern', 'jobinfo_jobSeeker_list_urlpattern'):
+            with self.subTest(name=name):
+                url = reverse(name)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('ETag', response)
+                self.assertIn('Last-Modified', response)
+                self.assertEqual(self.revalidate(url, response).status_code, 304)
+        url = reverse('jobinfo_jobRecruiter_list_urlpattern')
+        response = self.client.get(url)
+        JobRecruiter.objects.create(first_name='Jane', last_name='Roe')
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_etag_varies_on_permissions(self):
+        response = self.client.get(self.list_url)
+        self.grant('add_company')
+        self.assertEqual(self.revalidate(self.list_url, response).status_code, 200)
+
+    def test_triggers_count_bulk_changes(self):
+        before = TableChange.objects.get(table_name=Company._meta.db_table)
+        Company.objects.filter(pk=self.company.pk).update(company_name='Acme Labs')
+        after = TableChange.objects.get(table_name=Company._meta.db_table)
+        self.assertEqual(after.generation, before.generation + 1)
+        self.assertGreaterEqual(after.changed_at, before.changed_at)
+
+
+class AsyncViewTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_tester(jobinfo_codenames('view_'))
+        app_cycle = AppCycle.objects.create(year=Year.objects.create(year=2023),
+                                            season=Season.objects.create(season_sequence=1, season_name='Winter'))
+        self.company = Company.objects.create(
+            company_name='Acme', appCycle=app_cycle,
+            position=Position.objects.create(position_number='P1', position_name='Engineer'),
+            jobRecruiter=JobRecruiter.objects.create(first_name='John', last_name='Doe'))
+        self.job_seeker = JobSeeker.objects.create(first_name='Jane', last_name='Doe')
+        self.application = Application.objects.create(company=self.company, jobSeeker=self.job_seeker)
+
+    def get_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def sync_get(self, view_class, **kwargs):
+        request = RequestFactory().get('/')
+        request.user = self.get_user()
+        response = view_class.as_view()(request, **kwargs)
+        return response.render() if hasattr(response, 'render') else response
+
+    async def async_get(self, view_class, user=None, headers=None, **kwargs):
+        request = AsyncRequestFactory().get('/')
+        request.META.update(headers or {})
+        request.user = user or await sync_to_async(self.get_user)()
+        response = await view_class.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            response = await sync_to_async(response.render)()
+        return response
+
+    async def test_async_views_render_like_sync_views(self):
+        for sync_view, async_view, kwargs in [
+            (CompanyList, AsyncCompanyList, {}),
+            (JobSeekerList, AsyncJobSeekerList, {}),
+            (CompanyDetail, AsyncCompanyDetail, {'pk': self.company.pk}),
+            (JobSeekerDetail, AsyncJobSeekerDetail, {'pk': self.job_seeker.pk}),
+            (ApplicationDetail, AsyncApplicationDetail, {'pk': self.application.pk}),
+        ]:
+            with self.subTest(view=async_view.__name__):
+                expected = await sync_to_async(self.sync_get)(sync_view, **kwargs)
+                response = await self.async_get(async_view, **kwargs)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response['ETag'], expected['ETag'])
+
+    async def test_access_checks(self):
+        response = await self.async_get(AsyncCompanyList, user=AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+        other = await sync_to_async(User.objects.create_user)(username='other')
+        with self.assertRaises(PermissionDenied):
+            await self.async_get(AsyncCompanyList, user=other)
+
+    async def test_not_modified_and_missing(self):
+        response = await self.async_get(AsyncCompanyDetail, pk=self.company.pk)
+        response = await self.async_get(AsyncCompanyDetail, headers={'HTTP_IF_NONE_MATCH': response['ETag']},
+                                        pk=self.company.pk)
+        self.assertEqual(response.status_code, 304)
+        with self.assertRaises(Http404):
+            await self.async_get(AsyncCompanyDetail, pk=self.company.pk + 1)
+
+    async def test_archived_details(self):
+        await sync_to_async(archive_cycle)(self.company.appCycle)
+        for sync_view, async_view, pk in [
+            (CompanyDetail, AsyncCompanyDetail, self.company.pk),
+            (ApplicationDetail, AsyncApplicationDetail, self.application.pk),
+        ]:
+            with self.subTest(view=async_view.__name__):
+                expected = await sync_to_async(self.sync_get)(sync_view, pk=pk)
+                response = await self.async_get(async_view, pk=pk)
+                self.assertContains(response, 'read only')
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response['ETag'], expected['ETag'])
+
+    async def test_middleware_records_async_queries(self):
+        async def get_response(request):
+            await Position.objects.acount()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(get_response)
+        with self.assertLogs('jobinfo.sql', level='INFO'):
+            response = await middleware(AsyncRequestFactory().get('/'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+
+@override_settings(JOBINFO_READ_REPLICA=True)
+class ReadReplicaTestCase(JobinfoTestMixin, TransactionTestCase):
+    # The replica mirrors the test database through a second connection,
+    # which only sees committed rows, so nothing here runs in a test
+    # transaction. Only the connection that ran a query tells them apart.
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        super().setUp()
+        self.login_with(['view_position', 'add_position'])
+        self.position = Position.objects.create(position_number='P1', position_name='Engineer')
+        self.list_url = reverse('jobinfo_position_list_urlpattern')
+
+    def get(self, url):
+        with CaptureQueriesContext(connections['replica']) as replica, \
+                CaptureQueriesContext(connections['default']) as default:
+            response = self.client.get(url)
+        return response, replica, default
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(Position.objects.all().db, 'default')
+        with read_intent():
+            self.assertEqual(Position.objects.all().db, 'replica')
+            self.assertEqual(User.objects.all().db, 'default')
+            self.assertEqual(router.db_for_write(Position, instance=Position.objects.get()), 'default')
+            with override_settings(JOBINFO_READ_REPLICA=False):
+                self.assertEqual(Position.objects.all().db, 'default')
+        self.assertFalse(router.allow_migrate('replica', 'jobinfo'))
+        self.assertIsNone(router.allow_migrate('default', 'jobinfo'))
+
+    def test_get_reads_from_replica(self):
+        response, replica, default = self.get(self.list_url)
+        self.assertContains(response, 'Engineer')
+        self.assertTrue([query for query in replica if 'FROM "jobinfo_position"' in query['sql']])
+        self.assertFalse([query for query in default if 'FROM "jobinfo_position"' in query['sql']])
+
+    def test_write_pins_client_to_primary(self):
+        response = self.client.post(reverse('jobinfo_position_create_urlpattern'),
+                                    {'position_number': 'P2', 'position_name': 'Designer'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.cookies['jobinfo_primary']['max-age'], 15)
+        self.assertTrue(Position.objects.using('default').filter(position_number='P2').exists())
+        response, replica, default = self.get(self.list_url)
+        self.assertContains(response, 'Designer')
+        self.assertFalse(replica)
+
+    def test_replica_reads_are_versioned_by_refresh(self):
+        version = get_model_version(Position)
+        with read_intent():
+            self.assertNotEqual(get_model_version(Position), version)
+            self.assertEqual(get_model_versions([Position]), [get_model_version(Position)])
+
+    @override_settings(JOBINFO_READ_REPLICA=False)
+    def test_disabled(self):
+        response, replica, default = self.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(replica)
+        response = self.client.post(reverse('jobinfo_position_create_urlpattern'),
+                                    {'position_number': 'P2', 'position_name': 'Designer'})
+        self.assertNotIn('jobinfo_primary', response.cookies)
+
+    def test_backup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, target = os.path.join(directory, 'a.sqlite3'), os.path.join(directory, 'b.sqlite3')
+            connection = sqlite3.connect(source)
+            connection.execute('CREATE TABLE t (x)')
+            connection.execute('INSERT INTO t VALUES (1)')
+            connection.commit()
+            connection.close()
+            backup(source, target)
+            connection = sqlite3.connect(target)
+            self.assertEqual(connection.execute('SELECT x FROM t').fetchall(), [(1,)])
+            connection.close()
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_refresh_replica', stdout=StringIO())
+
+
+class ApiTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_').exclude(codename='view_jobseeker'))
+        self.create_fixtures()
+        self.companies = [self.create_company(name) for name in ('Acme', 'Globex', 'Initech')]
+        self.list_url = reverse('jobinfo_api_company_list_urlpattern')
+
+    def detail_url(self, obj):
+        return reverse('jobinfo_api_company_detail_urlpattern', kwargs={'pk': obj.pk})
+
+    def test_sparse_fields_and_includes(self):
+        response = self.client.get(self.list_url, {
+            'fields': 'company_name', 'include': 'appCycle.year,jobRecruiter', 'fields[jobRecruiter]': 'last_name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0], {
+            'id': self.companies[0].pk,
+            'company_name': 'Acme',
+            'appCycle': {
+                'id': self.app_cycle.pk,
+                'year': {'id': self.app_cycle.year.pk, 'year': 2023,
+                         'updated_at': response.json()['results'][0]['appCycle']['year']['updated_at']},
+                'season': self.app_cycle.season.pk,
+                'updated_at': response.json()['results'][0]['appCycle']['updated_at'],
+            },
+            'jobRecruiter': {'id': self.job_recruiter.pk, 'last_name': 'Doe'},
+        })
+
+    def test_includes_are_joined(self):
+        query = {'include': 'appCycle.year,appCycle.season,position,jobRecruiter'}
+        self.client.get(self.list_url, dict(query, limit=1))
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(self.list_url, dict(query, limit=1))
+        with CaptureQueriesContext(connection) as three:
+            response = self.client.get(self.list_url, dict(query, limit=3))
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertEqual(len(one), len(three))
+        self.assertEqual(len([query for query in three if 'FROM "jobinfo_company"' in query['sql']]), 1)
+
+    def test_cursor_pagination(self):
+        first = self.client.get(self.list_url, {'limit': 2}).json()
+        self.assertEqual([row['company_name'] for row in first['results']], ['Acme', 'Globex'])
+        self.assertIsNone(first['previous'])
+        second = self.client.get(self.list_url + first['next']).json()
+        self.assertEqual([row['company_name'] for row in second['results']], ['Initech'])
+        self.assertIsNone(second['next'])
+        previous = self.client.get(self.list_url + second['previous']).json()
+        self.assertEqual(previous['results'], first['results'])
+
+    def test_filters(self):
+        other = Position.objects.create(position_number='P2', position_name='Designer')
+        Company.objects.filter(pk=self.companies[1].pk).update(position=other)
+        response = self.client.get(self.list_url, {'position': other.pk})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.companies[1].pk])
+        Application.objects.create(company=self.companies[2],
+                                   jobSeeker=JobSeeker.objects.create(first_name='Jane', last_name='Roe'))
+        response = self.client.get(reverse('jobinfo_api_application_list_urlpattern'),
+                                   {'appCycle': self.app_cycle.pk, 'include': 'company'})
+        self.assertEqual([row['company']['company_name'] for row in response.json()['results']], ['Initech'])
+        self.assertEqual(self.client.get(self.list_url, {'position': 'x'}).status_code, 400)
+
+    def test_invalid_queries(self):
+        paginator = KeysetPaginator(Company.objects.all(), 1, ['pk'])
+        for query in ({'fields': 'nope'}, {'include': 'company_name'}, {'fields[position]': 'position_name'},
+                      {'limit': '0'}, {'limit': '501'}, {'cursor': 'garbage'},
+                      {'cursor': paginator.encode_cursor(paginator.forward, ['abc'])},
+                      {'cursor': paginator.encode_cursor(paginator.forward, [{'a': 1}])},
+                      {'cursor': paginator.encode_cursor(paginator.forward, [2 ** 63])},
+                      {'appCycle': '99999999999999999999999'}):
+            response = self.client.get(self.list_url, query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('error', response.json())
+        response = self.client.get(reverse('jobinfo_api_company_detail_urlpattern', kwargs={'pk': 0}))
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('error', response.json())
+
+    def test_permissions(self):
+        self.assertEqual(Client().get(self.list_url).status_code, 401)
+        self.assertEqual(self.client.get(reverse('jobinfo_api_jobSeeker_list_urlpattern')).status_code, 403)
+        response = self.client.get(reverse('jobinfo_api_application_list_urlpattern'), {'include': 'jobSeeker'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.post(self.list_url, {}, content_type='application/json').status_code, 403)
+
+    def test_not_modified(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_create_update_delete(self):
+        self.grant('add_company', 'change_company', 'delete_company')
+        data = {'company_name': 'Hooli', 'appCycle': self.app_cycle.pk, 'position': self.position.pk,
+                'jobRecruiter': self.job_recruiter.pk}
+        response = self.client.post(self.list_url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        company = Company.objects.get(company_name='Hooli')
+        self.assertEqual(response['Location'], self.detail_url(company))
+        self.assertEqual(response.json()['display_label'], 'P1 - Hooli (2023 - Winter)')
+
+        response = self.client.patch(self.detail_url(company), {'company_name': ' Hooli XYZ '},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['company_name'], 'Hooli XYZ')
+
+        response = self.client.put(self.detail_url(company), {'company_name': 'Hooli'},
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('appCycle', response.json()['errors'])
+        self.assertEqual(self.client.post(self.list_url, '[]', content_type='application/json').status_code, 400)
+
+        Application.objects.create(company=company, jobSeeker=JobSeeker.objects.create(first_name='Jane', last_name='Roe'))
+        self.assertEqual(self.client.delete(self.detail_url(company)).status_code, 409)
+        company.applications.all().delete()
+        self.assertEqual(self.client.delete(self.detail_url(company)).status_code, 204)
+        self.assertFalse(Company.objects.filter(pk=company.pk).exists())
+
+
+class DeleteGuardTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('delete_'))
+        self.create_fixtures()
+
+    def create_companies(self, count):
+        return [self.create_company('Company %02d' % number) for number in range(count)]
+
+    def test_refusal_previews_dependents(self):
+        self.create_companies(12)
+        url = reverse('jobinfo_jobRecruiter_delete_urlpattern', kwargs={'pk': self.job_recruiter.pk})
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertTemplateUsed(response, 'jobinfo/jobRecruiter_refuse_delete.html')
+        self.assertEqual(len(response.context['companies']), 10)
+        self.assertContains(response, 'Company 09')
+        self.assertNotContains(response, 'Company 10')
+        self.assertContains(response, '?count=1')
+        company_queries = [query['sql'] for query in queries if 'FROM "jobinfo_company"' in query['sql']]
+        self.assertEqual(len(company_queries), 1)
+        self.assertIn('LIMIT 11', company_queries[0])
+        self.assertContains(self.client.get(url, {'count': 1}), '12 in total')
+
+    def test_refused_post_does_not_collect_dependents(self):
+        self.create_companies(3)
+        url = reverse('jobinfo_position_delete_urlpattern', kwargs={'pk': self.position.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url)
+        self.assertTemplateUsed(response, 'jobinfo/position_refuse_delete.html')
+        self.assertTrue(Position.objects.filter(pk=self.position.pk).exists())
+        self.assertFalse([query for query in queries
+                          if 'FROM "jobinfo_company"' in query['sql'] and 'LIMIT' not in query['sql']])
+
+    def test_company_with_applications_is_refused(self):
+        company = self.create_companies(1)[0]
+        Application.objects.create(company=company,
+                                   jobSeeker=JobSeeker.objects.create(first_name='Jane', last_name='Roe'))
+        url = reverse('jobinfo_company_delete_urlpattern', kwargs={'pk': company.pk})
+        self.assertTemplateUsed(self.client.get(url), 'jobinfo/company_refuse_delete.html')
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Roe, Jane')
+        self.assertTrue(Company.objects.filter(pk=company.pk).exists())
+
+    def test_delete_without_dependents(self):
+        url = reverse('jobinfo_appCycle_delete_urlpattern', kwargs={'pk': self.app_cycle.pk})
+        response = self.client.get(url)
+        self.assertTemplateUsed(response, 'jobinfo/appCycle_confirm_delete.html')
+        self.assertContains(response, '2023 - Winter')
+        self.assertRedirects(self.client.post(url), reverse('jobinfo_appCycle_list_urlpattern'),
+                             fetch_redirect_response=False)
+        self.assertFalse(AppCycle.objects.exists())
+
+
+class BulkApplyTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(['add_application', 'view_application'])
+        self.create_fixtures()
+        self.companies = [self.create_company('Company %d' % number) for number in range(4)]
+        self.job_seeker = JobSeeker.objects.create(first_name='Jane', last_name='Roe')
+        Application.objects.create(company=self.companies[1], jobSeeker=self.job_seeker)
+        self.url = reverse('jobinfo_application_bulk_urlpattern')
+
+    def test_bulk_apply(self):
+        result = bulk_apply(self.job_seeker, Company.objects.filter(appCycle=self.app_cycle))
+        self.assertEqual(result.created, [self.companies[0].pk, self.companies[2].pk, self.companies[3].pk])
+        self.assertEqual(result.existing, [self.companies[1].pk])
+        for application in self.job_seeker.applications.select_related('company'):
+            self.assertEqual(application.display_label, application.build_display_label())
+            self.assertEqual(application.sort_key, application.build_sort_key())
+
+    def test_unlabelled_existing_application(self):
+        # Importers write rows without a label, as bulk_create does.
+        Application.objects.bulk_create([Application(company=self.companies[2], jobSeeker=self.job_seeker)])
+        result = bulk_apply(self.job_seeker, Company.objects.filter(appCycle=self.app_cycle))
+        self.assertEqual(result.created, [self.companies[0].pk, self.companies[3].pk])
+        self.assertEqual(result.existing, [self.companies[1].pk, self.companies[2].pk])
+
+    def test_application_written_during_the_insert(self):
+        bulk_create = Application.objects.bulk_create
+
+        def concurrent_bulk_create(objs, **kwargs):
+            Application.objects.create(company=self.companies[3], jobSeeker=self.job_seeker)
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Application.objects, 'bulk_create', concurrent_bulk_create):
+            result = bulk_apply(self.job_seeker, Company.objects.filter(appCycle=self.app_cycle))
+        self.assertEqual(result.created, [self.companies[0].pk, self.companies[2].pk])
+        self.assertEqual(result.existing, [self.companies[1].pk, self.companies[3].pk])
+        self.assertFalse(self.job_seeker.applications.filter(display_label__startswith='\x00').exists())
+
+    def test_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            bulk_apply(self.job_seeker, Company.objects.filter(appCycle=self.app_cycle))
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('INSERT')]), 1)
+
+    def test_view(self):
+        self.assertContains(self.client.get(self.url, {'jobSeeker': self.job_seeker.pk}), 'Roe, Jane')
+        response = self.client.post(self.url, {'jobSeeker': self.job_seeker.pk, 'position': self.position.pk})
+        self.assertContains(response, 'Created 3 applications')
+        self.assertContains(response, self.companies[1].display_label)
+        self.assertEqual(self.job_seeker.applications.count(), 4)
+        response = self.client.post(self.url, {'jobSeeker': self.job_seeker.pk})
+        self.assertContains(response, 'Choose an application cycle')
+
+    @override_settings(JOBINFO_BULK_APPLY_MAX_COMPANIES=3)
+    def test_limit(self):
+        response = self.client.post(self.url, {'jobSeeker': self.job_seeker.pk, 'appCycle': self.app_cycle.pk})
+        self.assertContains(response, '4 companies match these filters')
+        self.assertEqual(self.job_seeker.applications.count(), 1)
+
+    def test_list_shows_new_applications(self):
+        list_url = reverse('jobinfo_application_list_urlpattern')
+        self.client.get(list_url)
+        bulk_apply(self.job_seeker, Company.objects.filter(appCycle=self.app_cycle))
+        self.assertContains(self.client.get(list_url), self.companies[3].company_name)
+
+    def test_api(self):
+        url = reverse('jobinfo_api_application_bulk_urlpattern')
+        response = self.client.post(url, {'jobSeeker': self.job_seeker.pk, 'jobRecruiter': self.job_recruiter.pk},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['existing'], [self.companies[1].pk])
+        self.assertEqual(len(response.json()['created']), 3)
+        response = self.client.post(url, {'jobSeeker': self.job_seeker.pk, 'jobRecruiter': self.job_recruiter.pk},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], [])
+        response = self.client.post(url, {'jobSeeker': 0}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('jobSeeker', response.json()['errors'])
+
+
+class RolloverTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(['add_company', 'view_appcycle', 'view_company'])
+        self.create_fixtures(seasons=('Winter', 'Spring'))
+        self.source, self.target = self.app_cycles
+        for number in range(4):
+            self.create_company('Company %d' % number, self.source)
+        self.create_company('Company 1', self.target)
+        self.url = self.source.get_rollover_url()
+
+    def test_plan(self):
+        pending, existing = rollover_plan(self.source, self.target)
+        self.assertEqual(sorted(pending.values_list('company_name', flat=True)),
+                         ['Company 0', 'Company 2', 'Company 3'])
+        self.assertEqual(list(existing.values_list('company_name', flat=True)), ['Company 1'])
+
+    def test_rollover(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = rollover(self.source, self.target)
+        self.assertEqual(result, (3, 1))
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('INSERT')]), 1)
+        companies = Company.objects.filter(appCycle=self.target).select_related('appCycle', 'position')
+        self.assertEqual(len(companies), 4)
+        for company in companies:
+            self.assertEqual(company.display_label, company.build_display_label())
+            self.assertEqual(company.sort_key, company.build_sort_key())
+            self.assertEqual(company.jobRecruiter_id, self.job_recruiter.pk)
+        self.assertEqual(rollover(self.source, self.target), (0, 4))
+        with self.assertRaises(ValueError):
+            rollover(self.source, self.source)
+
+    def test_view(self):
+        self.assertContains(self.client.get(self.url), 'Roll Over')
+        response = self.client.post(self.url, {'target': self.target.pk, 'dry_run': 'on'})
+        self.assertContains(response, '3 companies')
+        self.assertContains(response, 'would be skipped')
+        self.assertEqual(Company.objects.filter(appCycle=self.target).count(), 1)
+        response = self.client.post(self.url, {'target': self.target.pk})
+        self.assertContains(response, 'Copied 3 companies')
+        self.assertEqual(Company.objects.filter(appCycle=self.target).count(), 4)
+        response = self.client.post(self.url, {'target': self.source.pk})
+        self.assertContains(response, 'Select a valid choice')
+
+    def test_detail_shows_copies(self):
+        detail_url = self.target.get_absolute_url()
+        self.client.get(detail_url)
+        rollover(self.source, self.target)
+        self.assertContains(self.client.get(detail_url), 'Company 3')
+
+    def test_command(self):
+        out = StringIO()
+        call_command('jobinfo_rollover', self.source.pk, self.target.pk, dry_run=True, stdout=out)
+        self.assertIn('Would copy 3 companies', out.getvalue())
+        call_command('jobinfo_rollover', self.source.pk, self.target.pk, stdout=out)
+        self.assertIn('Copied 3 companies', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_rollover', self.source.pk, 0, stdout=out)
+
+
+class ReassignTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(['change_company', 'view_jobrecruiter', 'view_company'])
+        self.create_fixtures(seasons=('Winter', 'Spring'))
+        self.source = self.job_recruiter
+        self.target = JobRecruiter.objects.create(first_name='Mary', last_name='Major')
+        self.companies = [
+            self.create_company('Company %d' % number, self.app_cycles[number % 2]) for number in range(4)
+        ]
+        self.url = self.source.get_reassign_url()
+
+    def test_reassign(self):
+        labels = {company.pk: (company.display_label, company.sort_key) for company in self.companies}
+        with CaptureQueriesContext(connection) as queries:
+            result = reassign(self.source, self.target)
+        self.assertEqual(result, (4, False))
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+        for company in self.target.companies.all():
+            self.assertEqual(labels[company.pk], (company.display_label, company.sort_key))
+        self.assertTrue(JobRecruiter.objects.filter(pk=self.source.pk).exists())
+        with self.assertRaises(ValueError):
+            reassign(self.target, self.target)
+
+    def test_filtered_subset_keeps_source(self):
+        result = reassign(self.source, self.target, Company.objects.filter(appCycle=self.app_cycles[0]),
+                          delete_source=True)
+        self.assertEqual(result, (2, False))
+        self.assertEqual(self.source.companies.count(), 2)
+        result = reassign(self.source, self.target, delete_source=True)
+        self.assertEqual(result, (2, True))
+        self.assertFalse(JobRecruiter.objects.filter(pk=self.source.pk).exists())
+
+    def test_detail_shows_moved_companies(self):
+        detail_url = self.target.get_absolute_url()
+        self.assertNotContains(self.client.get(detail_url), 'Company 0')
+        reassign(self.source, self.target)
+        self.assertContains(self.client.get(detail_url), 'Company 0')
+
+    def test_view(self):
+        self.assertContains(self.client.get(self.url), 'Reassign Companies')
+        response = self.client.post(self.url, {'target': self.target.pk, 'position': self.position.pk})
+        self.assertContains(response, 'Moved 4 companies')
+        self.assertEqual(self.target.companies.count(), 4)
+        response = self.client.post(self.url, {'target': self.source.pk})
+        self.assertContains(response, 'Select a valid choice')
+
+    def test_view_delete_needs_permission(self):
+        response = self.client.post(self.url, {'target': self.target.pk, 'delete_source': 'on'})
+        self.assertContains(response, 'You may not delete job recruiters')
+        self.assertEqual(self.source.companies.count(), 4)
+        self.grant('delete_jobrecruiter')
+        response = self.client.post(self.url, {'target': self.target.pk, 'delete_source': 'on'})
+        self.assertContains(response, 'Deleted job recruiter')
+        self.assertFalse(JobRecruiter.objects.filter(pk=self.source.pk).exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('jobinfo_reassign', self.source.pk, self.target.pk, appCycle=self.app_cycles[1].pk,
+                     delete_source=True, stdout=out)
+        self.assertIn('Moved 2 companies', out.getvalue())
+        self.assertIn('Kept', out.getvalue())
+        call_command('jobinfo_reassign', self.source.pk, self.target.pk, delete_source=True, stdout=out)
+        self.assertIn('Deleted', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_reassign', self.source.pk, self.target.pk, stdout=out)
+
+
+class ArchiveTestCase(JobinfoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_with(jobinfo_codenames('view_'))
+        self.create_fixtures(year=2022, seasons=('Winter', 'Spring'))
+        self.job_seeker = JobSeeker.objects.create(first_name='Jane', last_name='Roe')
+        self.companies = [
+            self.create_company('Company %d' % number, self.app_cycles[number % 2]) for number in range(5)
+        ]
+        self.applications = [
+            Application.objects.create(company=company, jobSeeker=self.job_seeker) for company in self.companies
+        ]
+        self.cycle = self.app_cycles[0]
+
+    def snapshot(self):
+        return (list(Company.objects.order_by('pk').values_list()),
+                list(Application.objects.order_by('pk').values_list()))
+
+    def test_archive_and_restore(self):
+        before = self.snapshot()
+        result = archive_cycle(self.cycle, batch_size=2)
+        self.assertEqual(result, (3, 3))
+        self.assertIsNotNone(self.cycle.archived_at)
+        self.assertFalse(Company.objects.filter(appCycle=self.cycle).exists())
+        self.assertEqual(Application.objects.count(), 2)
+        archived = ArchivedCompany.objects.get(pk=self.companies[0].pk)
+        self.assertEqual(archived.display_label, self.companies[0].display_label)
+        self.assertEqual(archive_cycle(self.cycle), (0, 0))
+        self.assertEqual(restore_cycle(self.cycle, batch_size=2), (3, 3))
+        self.assertIsNone(self.cycle.archived_at)
+        self.assertFalse(ArchivedCompany.objects.exists() or ArchivedApplication.objects.exists())
+        self.assertEqual(self.snapshot(), before)
+
+    def test_set_based_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            archive_cycle(self.cycle, batch_size=2)
+        statements = [query['sql'].split()[0] for query in queries]
+        self.assertEqual(statements.count('INSERT'), 4)
+        self.assertEqual(statements.count('DELETE'), 4)
+
+    def test_details_read_archive(self):
+        archive_cycle(self.cycle)
+        company, application = self.companies[0], self.applications[0]
+        response = self.client.get(company.get_absolute_url())
+        self.assertContains(response, company.display_label)
+        self.assertContains(response, 'read only')
+        self.assertContains(response, application.get_absolute_url())
+        self.assertContains(self.client.get(application.get_absolute_url()), application.display_label)
+        self.assertContains(self.client.get(self.cycle.get_absolute_url()), company.display_label)
+        self.grant('change_company')
+        self.assertEqual(self.client.get(company.get_update_url()).status_code, 404)
+
+    def test_detail_etag_changes_on_restore(self):
+        archive_cycle(self.cycle)
+        url = self.companies[0].get_absolute_url()
+        etag = self.client.get(url)['ETag']
+        restore_cycle(self.cycle)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'read only')
+
+    def test_labels_follow_renames(self):
+        archive_cycle(self.cycle)
+        self.position.position_number = 'P2'
+        self.position.save()
+        self.job_seeker.first_name = 'Janet'
+        self.job_seeker.save()
+        archived = ArchivedApplication.objects.select_related('company').get(pk=self.applications[0].pk)
+        self.assertTrue(archived.company.display_label.startswith('P2 - '))
+        self.assertTrue(archived.display_label.endswith('Roe, Janet'))
+
+    def test_archived_cycle_takes_no_companies(self):
+        archive_cycle(self.cycle)
+        form = CompanyForm({'company_name': 'New', 'appCycle': self.cycle.pk, 'position': self.position.pk,
+                            'jobRecruiter': self.job_recruiter.pk})
+        self.assertIn('appCycle', form.errors)
+
+    def test_delete_refused_for_archived_dependents(self):
+        archive_cycle(self.cycle)
+        archive_cycle(self.app_cycles[1])
+        self.grant('delete_jobrecruiter')
+        response = self.client.post(self.job_recruiter.get_delete_url())
+        self.assertContains(response, self.companies[0].display_label)
+        self.assertTrue(JobRecruiter.objects.filter(pk=self.job_recruiter.pk).exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('jobinfo_archive', before=2023, batch_size=2, stdout=out)
+        self.assertIn('Archived 2022 - Winter: 3 companies, 3 applications.', out.getvalue())
+        self.assertFalse(Company.objects.exists())
+        call_command('jobinfo_archive', self.cycle.pk, restore=True, stdout=out)
+        self.assertIn('Restored 2022 - Winter: 3 companies', out.getvalue())
+        self.assertEqual(Company.objects.count(), 3)
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_archive', stdout=out)
+        with self.assertRaises(CommandError):
+            call_command('jobinfo_archive', 0, stdout=out)
+
+    def test_archived_cycle_refuses_rollover_and_import(self):
+        archive_cycle(self.cycle)
+        for source, target in ((self.app_cycles[1], self.cycle), (self.cycle, self.app_cycles[1])):
+            with self.assertRaises(ValueError):
+                rollover(source, target)
+            with self.assertRaises(CommandError):
+                call_command('jobinfo_rollover', source.pk, target.pk, stdout=StringIO())
+        self.grant('add_company')
+        self.assertEqual(self.client.get(self.cycle.get_rollover_url()).status_code, 404)
+        with self.assertRaisesMessage(RowError, 'app cycle 2022 / Winter is archived'):
+            Lookups().app_cycle({'year': '2022', 'season': 'Winter'})
+        self.assertEqual(Lookups().app_cycle({'year': '2022', 'season': 'Spring'}), self.app_cycles[1].pk)
+
+    def test_details_list_archived_children(self):
+        archive_cycle(self.cycle)
+        archived = self.companies[0]
+        for url, label in (
+                (self.job_recruiter.get_absolute_url(), archived.display_label),
+                (self.position.get_absolute_url(), archived.display_label),
+                (self.job_seeker.get_absolute_url(), self.applications[0].display_label)):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Archived')
+                self.assertContains(response, label)
+                self.assertContains(response, self.companies[1].display_label)
+        with self.settings(JOBINFO_FRAGMENT_CACHE=False):
+            response = self.client.get(self.position.get_absolute_url())
+        self.assertEqual(len(response.context['archived_child_list']), 3)
+        self.assertFalse(response.context['has_more_archived'])
+
+    def test_restore_reports_conflicts(self):
+        archive_cycle(self.cycle)
+        Company.objects.create(company_name='Company 2', appCycle=self.cycle, position=self.position,
+                               jobRecruiter=self.job_recruiter)
+        with self.assertRaises(RestoreConflict) as raised:
+            restore_cycle(self.cycle, batch_size=1)
+        self.assertEqual([company.pk for company in raised.exception.companies], [self.companies[2].pk])
+        self.assertEqual(ArchivedCompany.objects.count(), 3)
+        self.assertIsNotNone(self.cycle.archived_at)
+        with self.assertRaisesMessage(CommandError, self.companies[2].display_label):
+            call_command('jobinfo_archive', self.cycle.pk, restore=True, stdout=StringIO())
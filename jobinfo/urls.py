@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import path
 
+from jobinfo.api import API_RESOURCES
 from jobinfo.views import (
+    ApiApplicationBulkCreate, ApiDetail, ApiList,
     JobRecruiterList,
     CompanyList,
     JobSeekerList,
@@ -13,11 +16,31 @@ from jobinfo.views import (
     PositionCreate,
     AppCycleCreate,
     JobSeekerCreate,
-    ApplicationCreate,
+    ApplicationCreate, ApplicationBulkCreate,
     JobRecruiterUpdate, CompanyUpdate, PositionUpdate, AppCycleUpdate, JobSeekerUpdate, ApplicationUpdate,
     ApplicationDelete, JobRecruiterDelete, CompanyDelete, PositionDelete, AppCycleDelete, JobSeekerDelete,
+    AppCycleRollover, JobRecruiterReassign,
+    JobRecruiterAutocomplete, CompanyAutocomplete, PositionAutocomplete, JobSeekerAutocomplete,
+    JobRecruiterExport, CompanyExport, PositionExport, AppCycleExport, JobSeekerExport, ApplicationExport,
+    Search, SearchJson,
 )
 
+if settings.JOBINFO_ASYNC_VIEWS:
+    from jobinfo.views import (
+        AsyncJobRecruiterList as JobRecruiterList,
+        AsyncCompanyList as CompanyList,
+        AsyncJobSeekerList as JobSeekerList,
+        AsyncPositionList as PositionList,
+        AsyncAppCycleList as AppCycleList,
+        AsyncApplicationList as ApplicationList,
+        AsyncJobRecruiterDetail as JobRecruiterDetail,
+        AsyncCompanyDetail as CompanyDetail,
+        AsyncJobSeekerDetail as JobSeekerDetail,
+        AsyncAppCycleDetail as AppCycleDetail,
+        AsyncPositionDetail as PositionDetail,
+        AsyncApplicationDetail as ApplicationDetail,
+    )
+
 
 urlpatterns = [
     path('jobRecruiter/', JobRecruiterList.as_view(),
@@ -33,6 +56,15 @@ urlpatterns = [
     path('jobRecruiter/<int:pk>/delete/',
          JobRecruiterDelete.as_view(),
          name='jobinfo_jobRecruiter_delete_urlpattern'),
+    path('jobRecruiter/<int:pk>/reassign/',
+         JobRecruiterReassign.as_view(),
+         name='jobinfo_jobRecruiter_reassign_urlpattern'),
+    path('jobRecruiter/export/',
+         JobRecruiterExport.as_view(),
+         name='jobinfo_jobRecruiter_export_urlpattern'),
+    path('jobRecruiter/autocomplete/',
+         JobRecruiterAutocomplete.as_view(),
+         name='jobinfo_jobRecruiter_autocomplete_urlpattern'),
     path('company/', CompanyList.as_view(),
          name='jobinfo_company_list_urlpattern'),
     path('company/<int:pk>', CompanyDetail.as_view(),
@@ -46,6 +78,12 @@ urlpatterns = [
     path('company/<int:pk>/delete/',
          CompanyDelete.as_view(),
          name='jobinfo_company_delete_urlpattern'),
+    path('company/export/',
+         CompanyExport.as_view(),
+         name='jobinfo_company_export_urlpattern'),
+    path('company/autocomplete/',
+         CompanyAutocomplete.as_view(),
+         name='jobinfo_company_autocomplete_urlpattern'),
     path('position/', PositionList.as_view(),
          name='jobinfo_position_list_urlpattern'),
     path('position/<int:pk>', PositionDetail.as_view(),
@@ -59,6 +97,12 @@ urlpatterns = [
     path('position/<int:pk>/delete/',
          PositionDelete.as_view(),
          name='jobinfo_position_delete_urlpattern'),
+    path('position/export/',
+         PositionExport.as_view(),
+         name='jobinfo_position_export_urlpattern'),
+    path('position/autocomplete/',
+         PositionAutocomplete.as_view(),
+         name='jobinfo_position_autocomplete_urlpattern'),
     path('appCycle/', AppCycleList.as_view(),
          name='jobinfo_appCycle_list_urlpattern'),
     path('appCycle/<int:pk>', AppCycleDetail.as_view(),
@@ -72,6 +116,12 @@ urlpatterns = [
     path('appCycle/<int:pk>/delete/',
          AppCycleDelete.as_view(),
          name='jobinfo_appCycle_delete_urlpattern'),
+    path('appCycle/<int:pk>/rollover/',
+         AppCycleRollover.as_view(),
+         name='jobinfo_appCycle_rollover_urlpattern'),
+    path('appCycle/export/',
+         AppCycleExport.as_view(),
+         name='jobinfo_appCycle_export_urlpattern'),
     path('jobSeeker/', JobSeekerList.as_view(),
          name='jobinfo_jobSeeker_list_urlpattern'),
     path('jobSeeker/<int:pk>/', JobSeekerDetail.as_view(),
@@ -85,6 +135,12 @@ urlpatterns = [
     path('jobSeeker/<int:pk>/delete/',
          JobSeekerDelete.as_view(),
          name='jobinfo_jobSeeker_delete_urlpattern'),
+    path('jobSeeker/export/',
+         JobSeekerExport.as_view(),
+         name='jobinfo_jobSeeker_export_urlpattern'),
+    path('jobSeeker/autocomplete/',
+         JobSeekerAutocomplete.as_view(),
+         name='jobinfo_jobSeeker_autocomplete_urlpattern'),
     path('application/', ApplicationList.as_view(),
          name='jobinfo_application_list_urlpattern'),
     path('application/<int:pk>', ApplicationDetail.as_view(),
@@ -92,12 +148,38 @@ urlpatterns = [
     path('application/create/',
          ApplicationCreate.as_view(),
          name='jobinfo_application_create_urlpattern'),
+    path('application/bulk/',
+         ApplicationBulkCreate.as_view(),
+         name='jobinfo_application_bulk_urlpattern'),
     path('application/<int:pk>/update/',
          ApplicationUpdate.as_view(),
          name='jobinfo_application_update_urlpattern'),
     path('application/<int:pk>/delete/',
          ApplicationDelete.as_view(),
          name='jobinfo_application_delete_urlpattern'),
+    path('application/export/',
+         ApplicationExport.as_view(),
+         name='jobinfo_application_export_urlpattern'),
+    path('search/', Search.as_view(),
+         name='jobinfo_search_urlpattern'),
+    path('search/json/', SearchJson.as_view(),
+         name='jobinfo_search_json_urlpattern'),
 ]
 
-
+urlpatterns += [
+    path('api/application/bulk/',
+         ApiApplicationBulkCreate.as_view(resource=API_RESOURCES['application'],
+                                          permission_required='jobinfo.add_application'),
+         name='jobinfo_api_application_bulk_urlpattern'),
+] + [
+    pattern
+    for resource in API_RESOURCES.values()
+    for pattern in (
+        path('api/%s/' % resource.name,
+             ApiList.as_view(resource=resource, permission_required=resource.permission('view')),
+             name=resource.list_url_name),
+        path('api/%s/<int:pk>/' % resource.name,
+             ApiDetail.as_view(resource=resource, permission_required=resource.permission('view')),
+             name=resource.detail_url_name),
+    )
+]
@@ -1,4 +1,98 @@
-from django.shortcuts import redirect, render
+import base64
+import calendar
+import collections.abc
+import csv
+import hashlib
+import json
+import time
+from functools import lru_cache
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import PROTECT, ProtectedError, Q
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
+
+from jobinfo.changes import atable_generations, table_changes, table_generations
+from jobinfo.replica import replica_epoch
+
+
+def get_cache_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), None)
+
+
+def _model_version_key(model):
+    return 'jobinfo:version:%s' % model._meta.label_lower
+
+
+def _with_epoch(model, version):
+    epoch = replica_epoch(model)
+    return version if epoch is None else '%s.%s' % (version, epoch)
+
+
+def get_model_version(model):
+    return _with_epoch(model, get_cache_version(_model_version_key(model)))
+
+
+def get_model_versions(models):
+    keys = [_model_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    return [
+        _with_epoch(model, versions[key]) if key in versions else get_model_version(model)
+        for key, model in zip(keys, models)
+    ]
+
+
+def bump_model_version(model):
+    bump_cache_version(_model_version_key(model))
+
+
+# A model's pages show labels built from the rows its foreign keys
+# point at, and those labels are refreshed by UPDATE, which sends no
+# signal for the model itself.
+@lru_cache(maxsize=None)
+def upstream_models(model):
+    models = [model]
+    for field in model._meta.concrete_fields:
+        if field.many_to_one:
+            models += [related for related in upstream_models(field.related_model) if related not in models]
+    return tuple(models)
+
+
+# The largest primary key SQLite can bind; int() of a larger query
+# string value would raise OverflowError inside the query.
+MAX_PK = 2 ** 63 - 1
+
+
+def parse_pk(value):
+    pk = int(value)
+    if not 0 < pk <= MAX_PK:
+        raise ValueError('%r is not a primary key.' % value)
+    return pk
+
+
+def permissions_digest(user):
+    return hashlib.md5('\n'.join(sorted(user.get_all_permissions())).encode()).hexdigest()
 
 
 class ObjectCreateMixin:
@@ -23,13 +117,177 @@ class ObjectCreateMixin:
                 {'form': bound_form})
 
 
+# Delete confirmation for a model whose rows are referenced through
+# PROTECT foreign keys. The page reads at most preview_size + 1 rows per
+# relation, which both decides whether the delete is refused and fills
+# the preview; the total is counted only for ?count=1. The POST probes
+# each relation with EXISTS before deleting, so a refused delete never
+# has Django collect every dependent row to raise ProtectedError.
+class DeleteGuardMixin:
+    model = None
+    queryset = None
+    success_url = None
+    preview_size = 10
+    count_kwarg = 'count'
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model._default_manager.all()
+
+    def get_object(self):
+        return get_object_or_404(self.get_queryset(), pk=self.kwargs['pk'])
+
+    def get_context_object_name(self):
+        name = self.model._meta.object_name
+        return name[0].lower() + name[1:]
+
+    def get_protected_relations(self):
+        return [
+            relation for relation in self.model._meta.related_objects
+            if relation.on_delete is PROTECT and not relation.many_to_many
+        ]
+
+    def get_dependents(self, obj, relation):
+        model = relation.related_model
+        queryset = model._default_manager.filter(**{relation.field.name: obj})
+        if any(field.name == 'display_label' for field in model._meta.concrete_fields):
+            queryset = queryset.only(model._meta.pk.name, 'display_label', relation.field.name)
+        return queryset
+
+    # (relation, preview, has_more) for the first relation with rows
+    # pointing at obj, or None.
+    def find_dependents(self, obj):
+        for relation in self.get_protected_relations():
+            rows = list(self.get_dependents(obj, relation)[:self.preview_size + 1])
+            if rows:
+                return relation, rows[:self.preview_size], len(rows) > self.preview_size
+        return None
+
+    def has_dependents(self, obj):
+        return any(self.get_dependents(obj, relation).exists() for relation in self.get_protected_relations())
+
+    def render_page(self, obj, found):
+        name = self.get_context_object_name()
+        context = {name: obj, 'object': obj}
+        if found is None:
+            return render(self.request, 'jobinfo/%s_confirm_delete.html' % name, context)
+        relation, preview, has_more = found
+        context.update({
+            relation.get_accessor_name(): preview,
+            'dependent_preview': preview,
+            'has_more_dependents': has_more,
+            'dependent_count': None,
+            'count_url': '?%s=1' % self.count_kwarg,
+        })
+        if has_more and self.request.GET.get(self.count_kwarg):
+            context['dependent_count'] = self.get_dependents(obj, relation).count()
+        return render(self.request, 'jobinfo/%s_refuse_delete.html' % name, context)
+
+    def get(self, request, pk):
+        obj = self.get_object()
+        return self.render_page(obj, self.find_dependents(obj))
+
+    def post(self, request, pk):
+        obj = self.get_object()
+        try:
+            with transaction.atomic():
+                if self.has_dependents(obj):
+                    raise ProtectedError('Referenced by protected foreign keys.', set())
+                obj.delete()
+        except ProtectedError:
+            return self.render_page(obj, self.find_dependents(obj))
+        return redirect(self.success_url)
+
+
+class AutocompleteMixin:
+    model = None
+    search_kwarg = 'q'
+    limit = 20
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def search(self, queryset, term):
+        raise NotImplementedError
+
+    def get_objects(self, term):
+        return self.search(self.get_queryset(), term)[:self.limit]
+
+    def get(self, request):
+        term = request.GET.get(self.search_kwarg, '').strip()
+        results = [
+            {'id': obj.pk, 'text': str(obj)}
+            for obj in self.get_objects(term)
+        ]
+        return JsonResponse({'results': results})
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+class ExportMixin:
+    model = None
+    format_kwarg = 'format'
+    export_fields = ()
+    filter_kwargs = {}
+    chunk_size = 2000
+
+    def get_queryset(self, request):
+        filters = {}
+        for kwarg, lookup in self.filter_kwargs.items():
+            value = request.GET.get(kwarg)
+            if value:
+                filters[lookup] = parse_pk(value)
+        return self.model.objects.filter(**filters).order_by('pk')
+
+    def get_headers(self):
+        return [header for header, path in self.export_fields]
+
+    def csv_chunks(self, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.get_headers())
+        for chunk in iter(lambda: list(islice(rows, self.chunk_size)), []):
+            yield ''.join(writer.writerow(row) for row in chunk)
+
+    def jsonl_chunks(self, rows):
+        headers = self.get_headers()
+        for chunk in iter(lambda: list(islice(rows, self.chunk_size)), []):
+            yield ''.join(
+                json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n'
+                for row in chunk)
+
+    def get(self, request):
+        file_format = request.GET.get(self.format_kwarg, 'csv')
+        if file_format not in ('csv', 'jsonl'):
+            return HttpResponseBadRequest('Unknown export format.')
+        try:
+            queryset = self.get_queryset(request)
+        except ValueError:
+            return HttpResponseBadRequest('Filters must be primary keys.')
+        rows = queryset.values_list(
+            *[path for header, path in self.export_fields]
+        ).iterator(chunk_size=self.chunk_size)
+        if file_format == 'csv':
+            response = StreamingHttpResponse(
+                self.csv_chunks(rows), content_type='text/csv')
+        else:
+            response = StreamingHttpResponse(
+                self.jsonl_chunks(rows), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (
+            self.model._meta.model_name, file_format)
+        return response
+
+
 class PageLinksMixin:
     page_kwarg = 'page'
 
     def _page_urls(self, page_number):
-        return "?{pkw}={n}".format(
-            pkw=self.page_kwarg,
-            n=page_number)
+        query = self.request.GET.copy()
+        query[self.page_kwarg] = page_number
+        return "?{q}".format(q=query.urlencode())
 
     def first_page(self, page):
         if page.number > 1:
@@ -46,30 +304,599 @@ class PageLinksMixin:
     def next_page(self, page):
         last_page = page.paginator.num_pages
         if (page.has_next()
-                and page.number < last_page - 1):
+                and (last_page is None
+                     or page.number < last_page - 1)):
             return self._page_urls(
                 page.next_page_number())
         return None
 
     def last_page(self, page):
         last_page = page.paginator.num_pages
-        if page.number < last_page:
+        if (last_page is not None
+                and page.number < last_page):
             return self._page_urls(last_page)
         return None
 
+    def get_page_links(self, page):
+        return {
+            'first_page_url':
+                self.first_page(page),
+            'previous_page_url':
+                self.previous_page(page),
+            'next_page_url':
+                self.next_page(page),
+            'last_page_url':
+                self.last_page(page),
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(
             **kwargs)
         page = context.get('page_obj')
         if page is not None:
-            context.update({
-                'first_page_url':
-                    self.first_page(page),
-                'previous_page_url':
-                    self.previous_page(page),
-                'next_page_url':
-                    self.next_page(page),
-                'last_page_url':
-                    self.last_page(page),
-            })
+            context.update(
+                self.get_page_links(page))
         return context
+
+
+class ExactCount:
+    def count(self, queryset, request=None):
+        return queryset.count()
+
+    async def acount(self, queryset, request=None):
+        return await queryset.acount()
+
+
+# Keyed on the change generations of every table the query reads, so a
+# write from any process, including the bulk UPDATEs and INSERTs that
+# send no signals, moves every worker to a new key. Where the triggers
+# are not installed there is nothing to key on and it counts exactly.
+class CachedCount(ExactCount):
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+    def get_timeout(self):
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, 'JOBINFO_COUNT_CACHE_TIMEOUT', 300)
+
+    # Compiling the query first sets up the joins of its ordering too.
+    def get_sql(self, queryset):
+        sql = str(queryset.query)
+        return sql, {alias.table_name for alias in queryset.query.alias_map.values()}
+
+    def get_key(self, queryset, generations, sql):
+        digest = hashlib.md5(json.dumps([generations, sql]).encode()).hexdigest()
+        return 'jobinfo:count:%s:%s' % (queryset.model._meta.label_lower, digest)
+
+    def count(self, queryset, request=None):
+        try:
+            sql, tables = self.get_sql(queryset)
+        except EmptyResultSet:
+            return 0
+        generations = table_generations(tables, request=request)
+        if not generations:
+            return super().count(queryset)
+        key = self.get_key(queryset, generations, sql)
+        total = cache.get(key)
+        if total is None:
+            total = super().count(queryset)
+            cache.set(key, total, self.get_timeout())
+        return total
+
+    async def acount(self, queryset, request=None):
+        try:
+            sql, tables = self.get_sql(queryset)
+        except EmptyResultSet:
+            return 0
+        generations = await atable_generations(tables, request=request)
+        if not generations:
+            return await super().acount(queryset)
+        key = self.get_key(queryset, generations, sql)
+        total = cache.get(key)
+        if total is None:
+            total = await super().acount(queryset)
+            cache.set(key, total, self.get_timeout())
+        return total
+
+
+class NoCount:
+    def count(self, queryset, request=None):
+        return None
+
+    async def acount(self, queryset, request=None):
+        return None
+
+
+class UncountedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self) - 1
+
+
+class CountedPaginator(Paginator):
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, count_provider=None, request=None):
+        super().__init__(
+            object_list, per_page, orphans, allow_empty_first_page)
+        self.count_provider = count_provider or ExactCount()
+        self.request = request
+
+    @cached_property
+    def count(self):
+        return self.count_provider.count(self.object_list, self.request)
+
+    @cached_property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return super().num_pages
+
+    def validate_number(self, number):
+        if self.num_pages is not None:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if self.num_pages is not None:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(
+            self.object_list[bottom:bottom + self.per_page + 1])
+        return self._uncounted_page(rows, number)
+
+    def _uncounted_page(self, rows, number):
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return UncountedPage(
+            rows[:self.per_page], number, self,
+            has_next=len(rows) > self.per_page)
+
+    # page() for async views: counts with the provider's acount() and
+    # fetches the rows, since a lazy page would query while rendering.
+    async def apage(self, number):
+        if 'count' not in self.__dict__:
+            self.count = await self.count_provider.acount(self.object_list, self.request)
+        if self.num_pages is not None:
+            page = super().page(number)
+            page.object_list = [obj async for obj in page.object_list]
+            return page
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = [obj async for obj in self.object_list[bottom:bottom + self.per_page + 1]]
+        return self._uncounted_page(rows, number)
+
+
+class PaginatedListMixin(PageLinksMixin):
+    paginate_by = 25
+    paginator_class = CountedPaginator
+    count_provider = CachedCount()
+    stream_kwarg = 'stream'
+    stream_chunk_size = 500
+    stream_marker = '<!-- stream rows -->'
+    stream_row_template = 'jobinfo/object_list_rows.html'
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get(self.stream_kwarg):
+            return self.stream(request)
+        return super().get(request, *args, **kwargs)
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            count_provider=self.count_provider, request=self.request, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(
+            **kwargs)
+        if context.get('is_paginated'):
+            query = self.request.GET.copy()
+            query.pop(self.page_kwarg, None)
+            query[self.stream_kwarg] = 1
+            context['stream_url'] = "?{q}".format(q=query.urlencode())
+        return context
+
+    def stream_rows(self, queryset):
+        rows = queryset.iterator(
+            chunk_size=self.stream_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                break
+            yield render_to_string(
+                self.stream_row_template,
+                {'object_list': chunk})
+
+    def stream(self, request):
+        queryset = self.get_queryset()
+        self.object_list = queryset.none()
+        context = self.get_context_data(
+            is_streaming=True,
+            stream_marker=self.stream_marker)
+        head, tail = render_to_string(
+            self.get_template_names(),
+            context,
+            request=request).split(self.stream_marker, 1)
+
+        def content():
+            yield head
+            yield from self.stream_rows(queryset)
+            yield tail
+
+        return StreamingHttpResponse(
+            content(),
+            content_type='text/html; charset=utf-8')
+
+
+# Paginates a detail view's child list in place, one page query per
+# request, so the page costs the same however many children there are.
+# Children archived with their cycle are not in that list; views that
+# have them set get_archived_child_queryset, and the first
+# archived_preview_size are listed after it, with has_more_archived
+# when there are more.
+class ChildListMixin(PageLinksMixin):
+    child_list_name = None
+    child_paginate_by = 25
+    child_count_provider = CachedCount()
+    archived_preview_size = 10
+
+    def get_child_queryset(self):
+        raise NotImplementedError
+
+    def get_archived_child_queryset(self):
+        return None
+
+    def get_archived_children(self):
+        queryset = self.get_archived_child_queryset()
+        if queryset is None:
+            return []
+        return list(queryset[:self.archived_preview_size + 1])
+
+    def get_child_paginator(self):
+        return CountedPaginator(
+            self.get_child_queryset(), self.child_paginate_by,
+            count_provider=self.child_count_provider, request=self.request)
+
+    def get_child_page(self):
+        try:
+            return self.get_child_paginator().page(
+                self.request.GET.get(self.page_kwarg) or 1)
+        except InvalidPage:
+            raise Http404('Invalid page.')
+
+    def get_context_data(self, **kwargs):
+        page = self.get_child_page()
+        kwargs.update({
+            self.child_list_name: page.object_list,
+            'paginator': page.paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+        })
+        archived = self.get_archived_children()
+        kwargs.update({
+            'archived_child_list': archived[:self.archived_preview_size],
+            'has_more_archived': len(archived) > self.archived_preview_size,
+        })
+        return super().get_context_data(**kwargs)
+
+
+# Answers If-None-Match and If-Modified-Since before the view runs its
+# queryset. A list depends on the change markers of its model's table
+# and the tables its labels come from. A detail page depends on the
+# object's updated_at and on the tables of the rows it shows around it,
+# its own table excepted, so edits to other objects leave it valid.
+class ConditionalGetMixin:
+    def get_change_models(self):
+        if not self.is_detail():
+            return upstream_models(self.model)
+        models = list(upstream_models(self.model))
+        for relation in self.model._meta.related_objects:
+            if relation.one_to_many:
+                models += [model for model in upstream_models(relation.related_model) if model not in models]
+        return [model for model in models if model is not self.model]
+
+    def is_detail(self):
+        return 'pk' in self.kwargs
+
+    def get_updated_at(self):
+        return self.model._default_manager.filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True)
+
+    def get_changes(self):
+        generations, last_modified = table_changes(self.get_change_models(), request=self.request)
+        updated_at = self.get_updated_at().first() if self.is_detail() else None
+        return generations, last_modified, updated_at
+
+    def get_validators(self, generations, last_modified, updated_at):
+        if self.is_detail():
+            if updated_at is None:
+                return None, None
+            generations.append(updated_at)
+            last_modified = max(filter(None, [last_modified, updated_at]))
+        user = self.request.user
+        parts = [self.request.get_full_path(), user.pk, generations]
+        if user.is_authenticated:
+            parts.append(permissions_digest(user))
+        etag = hashlib.md5(json.dumps(parts, cls=DjangoJSONEncoder).encode()).hexdigest()
+        return quote_etag(etag), last_modified and calendar.timegm(last_modified.utctimetuple())
+
+    def get_not_modified(self, etag, last_modified):
+        if etag is None:
+            return None
+        return get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if etag is not None and response.status_code == 200:
+            response.headers.setdefault('ETag', etag)
+            if last_modified:
+                response.headers.setdefault('Last-Modified', http_date(last_modified))
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(*self.get_changes())
+        response = self.get_not_modified(*validators)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, *validators)
+
+
+# Detail pages that fall back to an archive model when the primary key
+# is not in the view's own table. Archived rows keep their primary keys,
+# so they keep their urls and are shown with the same template. Once the
+# conditional GET has found the row in the archive, the view's own table
+# is not asked again.
+class ArchiveDetailMixin:
+    archive_queryset = None
+    in_archive = False
+
+    def get_archive_queryset(self):
+        return self.archive_queryset.all()
+
+    def get_object(self, queryset=None):
+        if not self.in_archive:
+            try:
+                return super().get_object(queryset)
+            except Http404:
+                pass
+        return get_object_or_404(self.get_archive_queryset(), pk=self.kwargs[self.pk_url_kwarg])
+
+    def get_change_models(self):
+        models = list(super().get_change_models())
+        archive_model = self.get_archive_queryset().model
+        for model in [archive_model] + [
+            relation.related_model for relation in archive_model._meta.related_objects if relation.one_to_many
+        ]:
+            models += [related for related in upstream_models(model) if related not in models]
+        return models
+
+    def get_archive_updated_at(self):
+        return self.get_archive_queryset().filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True)
+
+    def get_changes(self):
+        generations, last_modified, updated_at = super().get_changes()
+        if updated_at is None:
+            updated_at = self.get_archive_updated_at().first()
+            self.in_archive = updated_at is not None
+        return generations, last_modified, updated_at
+
+
+class KeysetPageLinksMixin(PageLinksMixin):
+    page_kwarg = 'cursor'
+
+    def first_page(self, page):
+        if page.has_previous():
+            query = self.request.GET.copy()
+            query.pop(self.page_kwarg, None)
+            return "?{q}".format(q=query.urlencode())
+        return None
+
+    def previous_page(self, page):
+        cursor = page.previous_cursor()
+        if cursor is not None:
+            return self._page_urls(cursor)
+        return None
+
+    def next_page(self, page):
+        cursor = page.next_cursor()
+        if cursor is not None:
+            return self._page_urls(cursor)
+        return None
+
+    def last_page(self, page):
+        if page.has_next():
+            return self._page_urls(
+                page.last_cursor())
+        return None
+
+
+# A list paginated by KeysetPaginator; the view supplies
+# get_paginator() and get_context_data(page).
+class KeysetListMixin(KeysetPageLinksMixin):
+    def get(self, request, *args, **kwargs):
+        paginator = self.get_paginator()
+        try:
+            page = paginator.page(
+                request.GET.get(self.page_kwarg))
+        except InvalidCursor:
+            page = paginator.page(None)
+        return render(
+            request, self.template_name, self.get_context_data(page))
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPaginator:
+    forward = 'n'
+    backward = 'p'
+
+    def __init__(self, object_list, per_page, ordering):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = list(ordering)
+
+    @staticmethod
+    def _split(field):
+        if field.startswith('-'):
+            return field[1:], True
+        return field, False
+
+    def encode_cursor(self, direction, values):
+        data = json.dumps([direction, values], separators=(',', ':'),
+                          cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(
+            data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, values = json.loads(
+                base64.urlsafe_b64decode(padded.encode()))
+        except (TypeError, ValueError):
+            raise InvalidCursor(cursor)
+        if direction not in (self.forward, self.backward):
+            raise InvalidCursor(cursor)
+        if (values is not None
+                and (not isinstance(values, list)
+                     or len(values) != len(self.ordering)
+                     or not all(map(self.valid_value, values)))):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    # Only what encode_cursor writes for the ordering columns, and no
+    # integer SQLite cannot bind.
+    @staticmethod
+    def valid_value(value):
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, int):
+            return -2 ** 63 <= value < 2 ** 63
+        return isinstance(value, (str, float))
+
+    def keys(self, obj):
+        names = [self._split(field)[0] for field in self.ordering]
+        if isinstance(obj, dict):
+            return [obj[name] for name in names]
+        return [getattr(obj, name) for name in names]
+
+    def _seek(self, values, forward):
+        # Expands (a, b, c) > (x, y, z) into
+        # a >= x AND (a > x OR (a = x AND b > y) OR ...)
+        # so that the leading column bounds the index range scan.
+        first_name, first_descending = self._split(self.ordering[0])
+        bound = 'lte' if first_descending == forward else 'gte'
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            name, descending = self._split(field)
+            lookup = 'lt' if descending == forward else 'gt'
+            clause = Q(**{'%s__%s' % (name, lookup): values[i]})
+            for previous, value in zip(self.ordering[:i], values):
+                clause &= Q(**{self._split(previous)[0]: value})
+            condition |= clause
+        return Q(**{'%s__%s' % (first_name, bound): values[0]}) & condition
+
+    def _order(self, forward):
+        if forward:
+            return self.ordering
+        return [field[1:] if field.startswith('-') else '-' + field
+                for field in self.ordering]
+
+    def _query(self, cursor):
+        direction, values = self.forward, None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        forward = direction == self.forward
+        queryset = self.object_list.order_by(*self._order(forward))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward))
+        return queryset[:self.per_page + 1], values, forward
+
+    def page(self, cursor):
+        queryset, values, forward = self._query(cursor)
+        return self._page(list(queryset), values, forward)
+
+    async def apage(self, cursor):
+        queryset, values, forward = self._query(cursor)
+        return self._page([obj async for obj in queryset], values, forward)
+
+    def _page(self, rows, values, forward):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if forward:
+            return KeysetPage(
+                rows, self, values,
+                has_next=has_more,
+                has_previous=values is not None)
+        rows.reverse()
+        return KeysetPage(
+            rows, self, values,
+            has_next=values is not None,
+            has_previous=has_more)
+
+
+class KeysetPage(collections.abc.Sequence):
+    def __init__(self, object_list, paginator, values,
+                 has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.values = values
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return '<Keyset page of %d objects>' % len(self)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        if self.object_list:
+            values = self.paginator.keys(self.object_list[-1])
+        else:
+            values = self.values
+        return self.paginator.encode_cursor(
+            self.paginator.forward, values)
+
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        if self.object_list:
+            values = self.paginator.keys(self.object_list[0])
+        else:
+            values = self.values
+        return self.paginator.encode_cursor(
+            self.paginator.backward, values)
+
+    def last_cursor(self):
+        return self.paginator.encode_cursor(
+            self.paginator.backward, None)
@@ -1,73 +1,73 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.core.paginator import InvalidPage
+from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.views import View
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView
 
-from jobinfo.forms import JobRecruiterForm, CompanyForm, JobSeekerForm, PositionForm, AppCycleForm, ApplicationForm
+from jobinfo.api import ApiDetailMixin, ApiListMixin, ApiMixin
+from jobinfo.async_views import (
+    AsyncAccessMixin, AsyncArchiveDetailMixin, AsyncChildListMixin, AsyncConditionalGetMixin, AsyncDetailMixin,
+    AsyncKeysetListMixin, AsyncPaginatedListMixin,
+)
+from jobinfo.bulk import bulk_apply, reassign, rollover, rollover_plan
+from jobinfo.forms import (
+    JobRecruiterForm, CompanyForm, JobSeekerForm, PositionForm, AppCycleForm, ApplicationForm, BulkApplyForm,
+    ReassignForm, RolloverForm,
+)
+from jobinfo.fragments import CachedListMixin
 from jobinfo.models import (
     JobRecruiter,
-    Company, JobSeeker, Position, AppCycle, Application,
+    Company, JobSeeker, Position, AppCycle, Application, ArchivedApplication, ArchivedCompany,
+)
+from jobinfo.search import SEARCH_INDEXES, SearchResults
+from jobinfo.utils import (
+    ArchiveDetailMixin, AutocompleteMixin, ChildListMixin,
+    ConditionalGetMixin, CountedPaginator, DeleteGuardMixin, ExportMixin, KeysetListMixin, KeysetPaginator, NoCount,
+    ObjectCreateMixin, PageLinksMixin, PaginatedListMixin,
 )
-from jobinfo.utils import ObjectCreateMixin, PageLinksMixin
 
 
-class JobRecruiterList(LoginRequiredMixin, PermissionRequiredMixin, View):
-    page_kwarg = 'page'
+class JobRecruiterList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                       CachedListMixin, KeysetListMixin, View):
+    model = JobRecruiter
+    fragment_name = 'jobRecruiter_list'
     paginate_by = 25
     permission_required = 'jobinfo.view_jobrecruiter'
     template_name = 'jobinfo/jobRecruiter_list.html'
 
-    def get(self, request):
-        jobRecruiters = JobRecruiter.objects.all()
-        paginator = Paginator(
-            jobRecruiters,
-            self.paginate_by
-        )
-        page_number = request.GET.get(
-            self.page_kwarg
+    def get_paginator(self):
+        return KeysetPaginator(
+            JobRecruiter.objects.all(),
+            self.paginate_by,
+            JobRecruiter._meta.ordering
         )
-        try:
-            page = paginator.page(page_number)
-        except PageNotAnInteger:
-            page = paginator.page(1)
-        except EmptyPage:
-            page = paginator.page(
-                paginator.num_pages)
-        if page.has_previous():
-            prev_url = "?{pkw}={n}".format(
-                pkw=self.page_kwarg,
-                n=page.previous_page_number())
-        else:
-            prev_url = None
-        if page.has_next():
-            next_url = "?{pkw}={n}".format(
-                pkw=self.page_kwarg,
-                n=page.next_page_number())
-        else:
-            next_url = None
+
+    def get_context_data(self, page):
         context = {
             'is_paginated':
                 page.has_other_pages(),
-            'next_page_url': next_url,
-            'paginator': paginator,
-            'previous_page_url': prev_url,
+            'paginator': page.paginator,
             'jobRecruiter_list': page,
         }
-        return render(
-            request, self.template_name, context)
+        context.update(
+            self.get_page_links(page))
+        return context
 
 
-class JobRecruiterDetail(LoginRequiredMixin, PermissionRequiredMixin, View):
+class JobRecruiterDetail(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin, ChildListMixin, DetailView):
+    model = JobRecruiter
+    context_object_name = 'jobRecruiter'
+    template_name = 'jobinfo/jobRecruiter_detail.html'
     permission_required = 'jobinfo.view_jobrecruiter'
-    def get(self, request, pk):
-        jobRecruiter = get_object_or_404(JobRecruiter, pk=pk)
-        company_list = jobRecruiter.companies.all()
-        return render(request,
-                      'jobinfo/jobRecruiter_detail.html',
-                      {'jobRecruiter': jobRecruiter, 'company_list': company_list}
-                      )
+    child_list_name = 'company_list'
+
+    def get_child_queryset(self):
+        return self.object.companies.only('company_id', 'display_label', 'jobRecruiter')
+
+    def get_archived_child_queryset(self):
+        return self.object.archived_companies.only('company_id', 'display_label', 'jobRecruiter')
 
 
 class JobRecruiterUpdate(LoginRequiredMixin, PermissionRequiredMixin, View):
@@ -109,35 +109,68 @@ class JobRecruiterUpdate(LoginRequiredMixin, PermissionRequiredMixin, View):
                 context)
 
 
-class JobRecruiterDelete(LoginRequiredMixin, PermissionRequiredMixin, View):
+class JobRecruiterDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
+    model = JobRecruiter
+    success_url = reverse_lazy('jobinfo_jobRecruiter_list_urlpattern')
     permission_required = 'jobinfo.delete_jobrecruiter'
+
+
+class JobRecruiterReassign(LoginRequiredMixin, PermissionRequiredMixin, View):
+    form_class = ReassignForm
+    template_name = 'jobinfo/jobRecruiter_reassign.html'
+    permission_required = 'jobinfo.change_company'
+
     def get(self, request, pk):
-        jobRecruiter = self.get_object(pk)
-        companies = jobRecruiter.companies.all()
-        if companies.count() > 0:
-            return render(
-                request,
-                'jobinfo/jobRecruiter_refuse_delete.html',
-                {'jobRecruiter': jobRecruiter,
-                 'companies': companies,
-                 }
-            )
-        else:
+        source = get_object_or_404(JobRecruiter, pk=pk)
+        return render(
+            request,
+            self.template_name,
+            {'jobRecruiter': source,
+             'company_count': source.companies.count(),
+             'form': self.form_class(source, initial=request.GET.dict())})
+
+    def post(self, request, pk):
+        source = get_object_or_404(JobRecruiter, pk=pk)
+        bound_form = self.form_class(source, request.POST)
+        if bound_form.is_valid() and bound_form.cleaned_data['delete_source'] and not request.user.has_perm(
+                'jobinfo.delete_jobrecruiter'):
+            bound_form.add_error('delete_source', 'You may not delete job recruiters.')
+        if not bound_form.is_valid():
             return render(
                 request,
-                'jobinfo/jobRecruiter_confirm_delete.html',
-                {'jobRecruiter': jobRecruiter}
-            )
+                self.template_name,
+                {'jobRecruiter': source,
+                 'company_count': source.companies.count(),
+                 'form': bound_form})
+        target = bound_form.cleaned_data['target']
+        result = reassign(source, target, bound_form.get_companies(), bound_form.cleaned_data['delete_source'])
+        return render(
+            request,
+            self.template_name,
+            {'jobRecruiter': source,
+             'target': target,
+             'result': result,
+             'company_count': 0 if result.deleted else source.companies.count(),
+             })
 
-    def get_object(self, pk):
-        return get_object_or_404(
-            JobRecruiter,
-            pk=pk)
 
-    def post(self, request, pk):
-        jobRecruiter = self.get_object(pk)
-        jobRecruiter.delete()
-        return redirect('jobinfo_jobRecruiter_list_urlpattern')
+class JobRecruiterAutocomplete(LoginRequiredMixin, PermissionRequiredMixin, AutocompleteMixin, View):
+    model = JobRecruiter
+    permission_required = 'jobinfo.view_jobrecruiter'
+
+    def search(self, queryset, term):
+        return queryset.name_startswith(term)
+
+
+class JobRecruiterExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = JobRecruiter
+    permission_required = 'jobinfo.view_jobrecruiter'
+    export_fields = (
+        ('jobRecruiter_id', 'pk'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('disambiguator', 'disambiguator'),
+    )
 
 
 class JobRecruiterCreate(LoginRequiredMixin, PermissionRequiredMixin, ObjectCreateMixin, View):
@@ -146,29 +179,76 @@ class JobRecruiterCreate(LoginRequiredMixin, PermissionRequiredMixin, ObjectCrea
     permission_required = 'jobinfo.add_jobrecruiter'
 
 
-class CompanyList(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class CompanyList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                  CachedListMixin, PaginatedListMixin, ListView):
     model = Company
+    fragment_name = 'company_list'
+    template_name = 'jobinfo/company_list.html'
+    queryset = Company.objects.for_display()
     permission_required = 'jobinfo.view_company'
 
 
-class CompanyDetail(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class CompanyDetail(LoginRequiredMixin, PermissionRequiredMixin, ArchiveDetailMixin, ConditionalGetMixin,
+                    ChildListMixin, DetailView):
     model = Company
+    queryset = Company.objects.select_related('appCycle__year', 'appCycle__season', 'position', 'jobRecruiter')
+    archive_queryset = ArchivedCompany.objects.select_related(
+        'appCycle__year', 'appCycle__season', 'position', 'jobRecruiter')
+    context_object_name = 'company'
+    template_name = 'jobinfo/company_detail.html'
     permission_required = 'jobinfo.view_company'
+    child_list_name = 'application_list'
+
+    def get_child_queryset(self):
+        return self.object.applications.select_related('jobSeeker')
 
     def get_context_data(self, **kwargs):
-        context = super(DetailView, self).get_context_data(**kwargs)
-        company = self.get_object()
-        appCycle = company.appCycle
-        position = company.position
-        jobRecruiter = company.jobRecruiter
-        application_list = company.applications.all()
-        context['appCycle'] = appCycle
-        context['position'] = position
-        context['jobRecruiter'] = jobRecruiter
-        context['application_list'] = application_list
+        context = super().get_context_data(**kwargs)
+        context['appCycle'] = self.object.appCycle
+        context['position'] = self.object.position
+        context['jobRecruiter'] = self.object.jobRecruiter
         return context
 
 
+class CompanyAutocomplete(LoginRequiredMixin, PermissionRequiredMixin, AutocompleteMixin, View):
+    model = Company
+    permission_required = 'jobinfo.view_company'
+
+    def search(self, queryset, term):
+        return queryset.label_startswith(term).order_by('display_label')
+
+    # Labels start with the position number, so a company name is looked
+    # up on its own index once the label matches run out.
+    def get_objects(self, term):
+        objects = list(super().get_objects(term))
+        if len(objects) < self.limit:
+            seen = {obj.pk for obj in objects}
+            objects += [obj for obj in self.get_queryset().name_startswith(term)[:self.limit]
+                        if obj.pk not in seen]
+        return objects[:self.limit]
+
+
+class CompanyExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = Company
+    permission_required = 'jobinfo.view_company'
+    export_fields = (
+        ('company_id', 'pk'),
+        ('company_name', 'company_name'),
+        ('year', 'appCycle__year__year'),
+        ('season', 'appCycle__season__season_name'),
+        ('position_number', 'position__position_number'),
+        ('position_name', 'position__position_name'),
+        ('recruiter_last_name', 'jobRecruiter__last_name'),
+        ('recruiter_first_name', 'jobRecruiter__first_name'),
+        ('recruiter_disambiguator', 'jobRecruiter__disambiguator'),
+    )
+    filter_kwargs = {
+        'appCycle': 'appCycle',
+        'position': 'position',
+        'jobRecruiter': 'jobRecruiter',
+    }
+
+
 class CompanyCreate(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     form_class = CompanyForm
     model = Company
@@ -182,67 +262,70 @@ class CompanyUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     permission_required = 'jobinfo.change_company'
 
 
-class CompanyDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class CompanyDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
     model = Company
     success_url = reverse_lazy('jobinfo_company_list_urlpattern')
     permission_required = 'jobinfo.delete_company'
 
 
-class JobSeekerList(LoginRequiredMixin, PermissionRequiredMixin, View):
-    page_kwarg = 'page'
+class JobSeekerList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                    CachedListMixin, KeysetListMixin, View):
+    model = JobSeeker
+    fragment_name = 'jobSeeker_list'
     paginate_by = 25
-    template_name = 'jobinfo/jobSeeker_list.html'
     permission_required = 'jobinfo.view_jobseeker'
+    template_name = 'jobinfo/jobSeeker_list.html'
 
-    def get(self, request):
-        jobSeekers = JobSeeker.objects.all()
-        paginator = Paginator(
-            jobSeekers,
-            self.paginate_by
+    def get_paginator(self):
+        return KeysetPaginator(
+            JobSeeker.objects.all(),
+            self.paginate_by,
+            JobSeeker._meta.ordering
         )
-        page_number = request.GET.get(
-            self.page_kwarg
-        )
-        try:
-            page = paginator.page(page_number)
-        except PageNotAnInteger:
-            page = paginator.page(1)
-        except EmptyPage:
-            page = paginator.page(
-                paginator.num_pages)
-        if page.has_previous():
-            prev_url = "?{pkw}={n}".format(
-                pkw=self.page_kwarg,
-                n=page.previous_page_number())
-        else:
-            prev_url = None
-        if page.has_next():
-            next_url = "?{pkw}={n}".format(
-                pkw=self.page_kwarg,
-                n=page.next_page_number())
-        else:
-            next_url = None
+
+    def get_context_data(self, page):
         context = {
             'is_paginated':
                 page.has_other_pages(),
-            'next_page_url': next_url,
-            'paginator': paginator,
-            'previous_page_url': prev_url,
+            'paginator': page.paginator,
             'jobSeeker_list': page,
         }
-        return render(
-            request, self.template_name, context)
+        context.update(
+            self.get_page_links(page))
+        return context
 
 
-class JobSeekerDetail(LoginRequiredMixin, PermissionRequiredMixin, View):
+class JobSeekerDetail(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin, ChildListMixin, DetailView):
+    model = JobSeeker
+    context_object_name = 'jobSeeker'
+    template_name = 'jobinfo/jobSeeker_detail.html'
     permission_required = 'jobinfo.view_jobseeker'
-    def get(self, request, pk):
-        jobSeeker = get_object_or_404(JobSeeker, pk=pk)
-        application_list = jobSeeker.applications.all()
-        return render(request,
-                      'jobinfo/jobSeeker_detail.html',
-                      {'jobSeeker': jobSeeker, 'application_list': application_list}
-                      )
+    child_list_name = 'application_list'
+
+    def get_child_queryset(self):
+        return self.object.applications.only('application_id', 'display_label', 'jobSeeker')
+
+    def get_archived_child_queryset(self):
+        return self.object.archived_applications.only('application_id', 'display_label', 'jobSeeker')
+
+
+class JobSeekerAutocomplete(LoginRequiredMixin, PermissionRequiredMixin, AutocompleteMixin, View):
+    model = JobSeeker
+    permission_required = 'jobinfo.view_jobseeker'
+
+    def search(self, queryset, term):
+        return queryset.name_startswith(term)
+
+
+class JobSeekerExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = JobSeeker
+    permission_required = 'jobinfo.view_jobseeker'
+    export_fields = (
+        ('jobSeeker_id', 'pk'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('disambiguator', 'disambiguator'),
+    )
 
 
 class JobSeekerCreate(LoginRequiredMixin, PermissionRequiredMixin, ObjectCreateMixin, View):
@@ -289,52 +372,48 @@ class JobSeekerUpdate(LoginRequiredMixin, PermissionRequiredMixin, View):
                 context)
 
 
-class JobSeekerDelete(LoginRequiredMixin, PermissionRequiredMixin, View):
+class JobSeekerDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
+    model = JobSeeker
+    success_url = reverse_lazy('jobinfo_jobSeeker_list_urlpattern')
     permission_required = 'jobinfo.delete_jobseeker'
-    def get(self, request, pk):
-        jobSeeker = self.get_object(pk)
-        applications = jobSeeker.applications.all()
-        if applications.count() > 0:
-            return render(
-                request,
-                'jobinfo/jobSeeker_refuse_delete.html',
-                {'jobSeeker': jobSeeker,
-                 'applications': applications,
-                 }
-            )
-        else:
-            return render(
-                request,
-                'jobinfo/jobSeeker_confirm_delete.html',
-                {'jobSeeker': jobSeeker}
-            )
 
-    def get_object(self, pk):
-        return get_object_or_404(
-            JobSeeker,
-            pk=pk)
 
-    def post(self, request, pk):
-        jobSeeker = self.get_object(pk)
-        jobSeeker.delete()
-        return redirect('jobinfo_jobSeeker_list_urlpattern')
+class PositionList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                   CachedListMixin, PaginatedListMixin, ListView):
+    model = Position
+    fragment_name = 'position_list'
+    template_name = 'jobinfo/position_list.html'
+    permission_required = 'jobinfo.view_position'
 
 
-class PositionList(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class PositionDetail(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin, ChildListMixin, DetailView):
     model = Position
     permission_required = 'jobinfo.view_position'
+    child_list_name = 'company_list'
 
+    def get_child_queryset(self):
+        return self.object.companies.only('company_id', 'display_label', 'position')
 
-class PositionDetail(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+    def get_archived_child_queryset(self):
+        return self.object.archived_companies.only('company_id', 'display_label', 'position')
+
+
+class PositionAutocomplete(LoginRequiredMixin, PermissionRequiredMixin, AutocompleteMixin, View):
     model = Position
     permission_required = 'jobinfo.view_position'
 
-    def get_context_data(self, **kwargs):
-        context = super(DetailView, self).get_context_data(**kwargs)
-        position = self.get_object()
-        company_list = position.companies.all()
-        context['company_list'] = company_list
-        return context
+    def search(self, queryset, term):
+        return queryset.number_startswith(term)
+
+
+class PositionExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = Position
+    permission_required = 'jobinfo.view_position'
+    export_fields = (
+        ('position_id', 'pk'),
+        ('position_number', 'position_number'),
+        ('position_name', 'position_name'),
+    )
 
 
 class PositionCreate(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
@@ -350,27 +429,34 @@ class PositionUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     permission_required = 'jobinfo.change_position'
 
 
-class PositionDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class PositionDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
     model = Position
     success_url = reverse_lazy('jobinfo_position_list_urlpattern')
     permission_required = 'jobinfo.delete_position'
 
 
-class AppCycleList(LoginRequiredMixin, PermissionRequiredMixin, View):
+class AppCycleList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                   CachedListMixin, PaginatedListMixin, ListView):
+    model = AppCycle
+    fragment_name = 'appCycle_list'
+    queryset = AppCycle.objects.for_display()
+    context_object_name = 'appCycle_list'
+    template_name = 'jobinfo/appCycle_list.html'
     permission_required = 'jobinfo.view_appcycle'
-    def get(self, request):
-        return render(request,
-                      'jobinfo/appCycle_list.html',
-                      {'appCycle_list': AppCycle.objects.all()}
-                      )
 
 
-class AppCycleDetail(LoginRequiredMixin, PermissionRequiredMixin, View):
+class AppCycleDetail(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin, ChildListMixin, DetailView):
+    model = AppCycle
+    queryset = AppCycle.objects.for_display()
+    context_object_name = 'appCycle'
+    template_name = 'jobinfo/appCycle_detail.html'
     permission_required = 'jobinfo.view_appcycle'
-    def get(self, request, pk):
-        appCycle = get_object_or_404(AppCycle, pk=pk)
-        company_list = appCycle.companies.all()
-        return render(request, 'jobinfo/appCycle_detail.html', {'appCycle': appCycle, 'company_list': company_list})
+    child_list_name = 'company_list'
+
+    def get_child_queryset(self):
+        if self.object.archived_at is not None:
+            return self.object.archived_companies.only('company_id', 'display_label', 'appCycle')
+        return self.object.companies.only('company_id', 'display_label', 'appCycle')
 
 
 class AppCycleUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
@@ -380,43 +466,156 @@ class AppCycleUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     permission_required = 'jobinfo.change_appcycle'
 
 
-class AppCycleDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class AppCycleDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
     model = AppCycle
+    queryset = AppCycle.objects.for_display()
     success_url = reverse_lazy('jobinfo_appCycle_list_urlpattern')
     permission_required = 'jobinfo.delete_appcycle'
 
 
+class AppCycleExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = AppCycle
+    permission_required = 'jobinfo.view_appcycle'
+    export_fields = (
+        ('appCycle_id', 'pk'),
+        ('year', 'year__year'),
+        ('season', 'season__season_name'),
+    )
+
+
 class AppCycleCreate(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     form_class = AppCycleForm
     model = AppCycle
+    template_name = 'jobinfo/appCycle_form.html'
     permission_required = 'jobinfo.add_appcycle'
 
 
-class ApplicationList(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class AppCycleRollover(LoginRequiredMixin, PermissionRequiredMixin, View):
+    form_class = RolloverForm
+    template_name = 'jobinfo/appCycle_rollover.html'
+    permission_required = 'jobinfo.add_company'
+    preview_size = 25
+
+    # Archived cycles have no companies left to copy.
+    def get_source(self, pk):
+        return get_object_or_404(AppCycle.objects.for_display().active(), pk=pk)
+
+    def get(self, request, pk):
+        source = self.get_source(pk)
+        return render(
+            request,
+            self.template_name,
+            {'appCycle': source,
+             'form': self.form_class(source, initial=request.GET.dict())})
+
+    def post(self, request, pk):
+        source = self.get_source(pk)
+        bound_form = self.form_class(source, request.POST)
+        context = {'appCycle': source, 'form': bound_form}
+        if bound_form.is_valid():
+            target = bound_form.cleaned_data['target']
+            context['target'] = target
+            if bound_form.cleaned_data['dry_run']:
+                pending, existing = rollover_plan(source, target)
+                context.update({
+                    'pending_count': pending.count(),
+                    'pending_list': pending.only('company_id', 'display_label')[:self.preview_size],
+                    'existing_count': existing.count(),
+                    'existing_list': existing.only('company_id', 'display_label')[:self.preview_size],
+                    'form': self.form_class(source, initial={'target': target, 'dry_run': False}),
+                })
+            else:
+                context['result'] = rollover(source, target)
+        return render(request, self.template_name, context)
+
+
+class ApplicationList(LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin,
+                      CachedListMixin, PaginatedListMixin, ListView):
     model = Application
+    fragment_name = 'application_list'
+    template_name = 'jobinfo/application_list.html'
+    queryset = Application.objects.for_display()
     permission_required = 'jobinfo.view_application'
 
 
-class ApplicationDetail(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class ApplicationDetail(LoginRequiredMixin, PermissionRequiredMixin, ArchiveDetailMixin, ConditionalGetMixin,
+                        DetailView):
     model = Application
+    queryset = Application.objects.select_related('jobSeeker', 'company')
+    archive_queryset = ArchivedApplication.objects.select_related('jobSeeker', 'company')
+    context_object_name = 'application'
+    template_name = 'jobinfo/application_detail.html'
     permission_required = 'jobinfo.view_application'
 
     def get_context_data(self, **kwargs):
-        context = super(DetailView, self).get_context_data(**kwargs)
-        application = self.get_object()
-        jobSeeker = application.jobSeeker
-        company = application.company
-        context['jobSeeker'] = jobSeeker
-        context['company'] = company
+        context = super().get_context_data(**kwargs)
+        context['jobSeeker'] = self.object.jobSeeker
+        context['company'] = self.object.company
         return context
 
 
+class ApplicationExport(LoginRequiredMixin, PermissionRequiredMixin, ExportMixin, View):
+    model = Application
+    permission_required = 'jobinfo.view_application'
+    export_fields = (
+        ('application_id', 'pk'),
+        ('year', 'company__appCycle__year__year'),
+        ('season', 'company__appCycle__season__season_name'),
+        ('position_number', 'company__position__position_number'),
+        ('position_name', 'company__position__position_name'),
+        ('company_name', 'company__company_name'),
+        ('seeker_last_name', 'jobSeeker__last_name'),
+        ('seeker_first_name', 'jobSeeker__first_name'),
+        ('seeker_disambiguator', 'jobSeeker__disambiguator'),
+    )
+    filter_kwargs = {
+        'appCycle': 'company__appCycle',
+        'company': 'company',
+        'jobRecruiter': 'company__jobRecruiter',
+        'jobSeeker': 'jobSeeker',
+    }
+
+
 class ApplicationCreate(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
     form_class = ApplicationForm
     model = Application
     permission_required = 'jobinfo.add_application'
 
 
+class ApplicationBulkCreate(LoginRequiredMixin, PermissionRequiredMixin, View):
+    form_class = BulkApplyForm
+    template_name = 'jobinfo/application_bulk_form.html'
+    result_template_name = 'jobinfo/application_bulk_result.html'
+    permission_required = 'jobinfo.add_application'
+    preview_size = 25
+
+    def get(self, request):
+        return render(
+            request,
+            self.template_name,
+            {'form': self.form_class(initial=request.GET.dict())})
+
+    def post(self, request):
+        bound_form = self.form_class(request.POST)
+        if not bound_form.is_valid():
+            return render(
+                request,
+                self.template_name,
+                {'form': bound_form})
+        jobSeeker = bound_form.cleaned_data['jobSeeker']
+        result = bulk_apply(jobSeeker, bound_form.get_companies())
+        existing = Company.objects.filter(
+            pk__in=result.existing[:self.preview_size]).only('company_id', 'display_label')
+        return render(
+            request,
+            self.result_template_name,
+            {'jobSeeker': jobSeeker,
+             'created_count': len(result.created),
+             'existing_count': len(result.existing),
+             'existing_list': existing,
+             })
+
+
 class ApplicationUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView):
     form_class = ApplicationForm
     model = Application
@@ -424,7 +623,143 @@ class ApplicationUpdate(LoginRequiredMixin, PermissionRequiredMixin, UpdateView)
     permission_required = 'jobinfo.change_application'
 
 
-class ApplicationDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class ApplicationDelete(LoginRequiredMixin, PermissionRequiredMixin, DeleteGuardMixin, View):
     model = Application
     success_url = reverse_lazy('jobinfo_application_list_urlpattern')
     permission_required = 'jobinfo.delete_application'
+
+
+class Search(LoginRequiredMixin, PageLinksMixin, View):
+    paginate_by = 25
+    template_name = 'jobinfo/search.html'
+
+    def get_kinds(self, request):
+        kinds = [
+            kind for kind, index in SEARCH_INDEXES.items()
+            if request.user.has_perm('jobinfo.view_%s' % index.model._meta.model_name)
+        ]
+        kind = request.GET.get('kind')
+        if kind in kinds:
+            return [kind], kinds
+        return kinds, kinds
+
+    def get_page(self, request, query, kinds):
+        paginator = CountedPaginator(
+            SearchResults(query, kinds),
+            self.paginate_by,
+            count_provider=NoCount()
+        )
+        try:
+            return paginator.page(
+                request.GET.get(self.page_kwarg, 1))
+        except InvalidPage:
+            return paginator.page(1)
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        kinds, allowed_kinds = self.get_kinds(request)
+        page = self.get_page(request, query, kinds)
+        context = {
+            'is_paginated':
+                page.has_other_pages(),
+            'query': query,
+            'kind': request.GET.get('kind', ''),
+            'kind_list': [(kind, SEARCH_INDEXES[kind].model._meta.verbose_name) for kind in allowed_kinds],
+            'result_list': page,
+        }
+        context.update(
+            self.get_page_links(page))
+        return render(
+            request, self.template_name, context)
+
+
+class SearchJson(Search):
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        kinds, allowed_kinds = self.get_kinds(request)
+        page = self.get_page(request, query, kinds)
+        results = [
+            {'kind': hit.kind, 'id': hit.object.pk, 'text': str(hit.object),
+             'url': hit.object.get_absolute_url()}
+            for hit in page
+        ]
+        return JsonResponse({
+            'results': results,
+            'next': self.next_page(page),
+        })
+
+
+# The JSON API; jobinfo/urls.py makes one list and one detail url per
+# resource in jobinfo.api.API_RESOURCES.
+class ApiList(ConditionalGetMixin, ApiListMixin, View):
+    pass
+
+
+class ApiDetail(ConditionalGetMixin, ApiDetailMixin, View):
+    pass
+
+
+class ApiApplicationBulkCreate(ApiMixin, View):
+    def post(self, request):
+        form = BulkApplyForm(self.get_body())
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+        result = bulk_apply(form.cleaned_data['jobSeeker'], form.get_companies())
+        return JsonResponse({
+            'jobSeeker': form.cleaned_data['jobSeeker'].pk,
+            'created': result.created,
+            'existing': result.existing,
+        }, status=201 if result.created else 200)
+
+
+# Async list and detail views, used under ASGI when
+# JOBINFO_ASYNC_VIEWS is set; see jobinfo/urls.py.
+
+class AsyncJobRecruiterList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncKeysetListMixin, JobRecruiterList):
+    pass
+
+
+class AsyncJobRecruiterDetail(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncChildListMixin, JobRecruiterDetail):
+    pass
+
+
+class AsyncCompanyList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncPaginatedListMixin, CompanyList):
+    pass
+
+
+class AsyncCompanyDetail(AsyncAccessMixin, AsyncArchiveDetailMixin, AsyncConditionalGetMixin, AsyncChildListMixin,
+                         CompanyDetail):
+    pass
+
+
+class AsyncJobSeekerList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncKeysetListMixin, JobSeekerList):
+    pass
+
+
+class AsyncJobSeekerDetail(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncChildListMixin, JobSeekerDetail):
+    pass
+
+
+class AsyncPositionList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncPaginatedListMixin, PositionList):
+    pass
+
+
+class AsyncPositionDetail(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncChildListMixin, PositionDetail):
+    pass
+
+
+class AsyncAppCycleList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncPaginatedListMixin, AppCycleList):
+    pass
+
+
+class AsyncAppCycleDetail(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncChildListMixin, AppCycleDetail):
+    pass
+
+
+class AsyncApplicationList(AsyncAccessMixin, AsyncConditionalGetMixin, AsyncPaginatedListMixin, ApplicationList):
+    pass
+
+
+class AsyncApplicationDetail(AsyncAccessMixin, AsyncArchiveDetailMixin, AsyncConditionalGetMixin, AsyncDetailMixin,
+                             ApplicationDetail):
+    pass
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mathur_nimish_final_project.settings')
+# Set JOBINFO_ASYNC_VIEWS=1 to serve the list and detail views with their
+# async versions; compare both with manage.py jobinfo_asgi_benchmark.
 
 application = get_asgi_application()
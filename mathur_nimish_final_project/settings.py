@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -43,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'jobinfo.middleware.QueryInstrumentationMiddleware',
+    'jobinfo.middleware.ReadReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -65,6 +69,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'jobinfo.context_processors.navigation',
             ],
         },
     },
@@ -83,6 +88,182 @@ DATABASES = {
     }
 }
 
+# SQLite tuning
+# The selected profile's pragmas are applied to every new SQLite
+# connection. 'default' keeps SQLite's own settings and opens a
+# connection per request. 'production' uses WAL so readers and the
+# writer stop blocking each other, waits on locks instead of failing
+# with "database is locked", and keeps connections open between
+# requests. Compare them with 'manage.py jobinfo_sqlite_benchmark'.
+# Switching to WAL rewrites the database file's header, so 'production'
+# is opt-in: set JOBINFO_SQLITE_PROFILE=production for the server
+# process only, and leave management commands on the tracked
+# db.sqlite3 with 'default'.
+
+JOBINFO_SQLITE_PROFILE = os.environ.get('JOBINFO_SQLITE_PROFILE', 'default')
+
+JOBINFO_SQLITE_PROFILES = {
+    'default': {
+        'CONN_MAX_AGE': 0,
+        'PRAGMAS': {},
+    },
+    'production': {
+        'CONN_MAX_AGE': 600,
+        'PRAGMAS': {
+            'journal_mode': 'wal',
+            'synchronous': 'normal',
+            'busy_timeout': 5000,
+            'cache_size': -64000,
+            'mmap_size': 268435456,
+            'temp_store': 'memory',
+        },
+    },
+}
+
+DATABASES['default']['CONN_MAX_AGE'] = JOBINFO_SQLITE_PROFILES[JOBINFO_SQLITE_PROFILE]['CONN_MAX_AGE']
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replica
+# With JOBINFO_READ_REPLICA on, GET and HEAD requests read jobinfo rows
+# from the 'replica' alias and everything else goes to 'default'. After
+# a write the client reads from 'default' for
+# JOBINFO_REPLICA_STICKY_SECONDS. Locally the replica is a second SQLite
+# file kept current by 'manage.py jobinfo_refresh_replica'.
+
+JOBINFO_READ_REPLICA = os.environ.get('JOBINFO_READ_REPLICA', '0') != '0'
+JOBINFO_REPLICA_STICKY_SECONDS = 15
+
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'NAME': os.environ.get('JOBINFO_REPLICA_NAME', BASE_DIR / 'db.replica.sqlite3'),
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['jobinfo.replica.PrimaryReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Rendered list pages, one per url, page and permission set; kept
+    # apart so they cannot cull the counts and permission sets.
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'jobinfo-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# Seconds a list view's total row count is served from the cache
+# before it is recounted; any write to the tables it counts invalidates
+# it sooner.
+JOBINFO_COUNT_CACHE_TIMEOUT = 300
+
+# List pages cache their rendered content in the 'fragments' cache under
+# the change generations of the listed model's table and the tables its
+# foreign keys reach, so a write to any of them, from any worker,
+# invalidates it. The views look the page up before they paginate, so a
+# hit runs neither the page nor the count query. Set
+# JOBINFO_FRAGMENT_CACHE=0 to render every time.
+# Hits and misses show in Server-Timing.
+JOBINFO_FRAGMENT_CACHE = os.environ.get('JOBINFO_FRAGMENT_CACHE', '1') != '0'
+
+JOBINFO_FRAGMENT_CACHE_TIMEOUT = 600
+
+
+# Async views
+# The list and detail views have async versions that use the async ORM.
+# They are off unless the JOBINFO_ASYNC_VIEWS=1 environment variable is
+# set, which only pays off under ASGI: under WSGI an async view costs an
+# event loop per request.
+
+JOBINFO_ASYNC_VIEWS = os.environ.get('JOBINFO_ASYNC_VIEWS', '0') == '1'
+
+
+# Bulk operations
+# Most companies one bulk apply may submit a job seeker to.
+
+JOBINFO_BULK_APPLY_MAX_COMPANIES = 5000
+
+
+# Permission cache
+# Each user's permission set is cached under the generations the change
+# triggers keep for the auth tables, which live in the database and so
+# are shared by every worker: a grant or revocation reaches them all on
+# their next request. Migration 0012 moves existing sessions over from
+# ModelBackend, which would otherwise log everyone out.
+
+AUTHENTICATION_BACKENDS = ['jobinfo.permissions.CachedModelBackend']
+
+JOBINFO_PERMISSION_CACHE_TIMEOUT = 3600
+
+
+# SQL instrumentation
+# Every request logs its query count and database time to the
+# 'jobinfo.sql' logger and returns them in a Server-Timing header.
+# A view that runs more queries than its budget logs a warning, or
+# raises QueryBudgetExceeded when JOBINFO_QUERY_BUDGET_STRICT is set,
+# as JobinfoTestCase does for the test suite. Each budget
+# includes the one query that reads the permission generations; the
+# job recruiter, position and job seeker details also list the first of
+# their archived children.
+
+# Only quietens the request log under manage.py test.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+JOBINFO_QUERY_BUDGET_STRICT = False
+
+JOBINFO_QUERY_BUDGET_DEFAULT = None
+
+JOBINFO_QUERY_BUDGETS = {
+    'jobinfo_jobRecruiter_list_urlpattern': 9,
+    'jobinfo_company_list_urlpattern': 9,
+    'jobinfo_position_list_urlpattern': 9,
+    'jobinfo_appCycle_list_urlpattern': 9,
+    'jobinfo_jobSeeker_list_urlpattern': 9,
+    'jobinfo_application_list_urlpattern': 9,
+    'jobinfo_jobRecruiter_detail_urlpattern': 12,
+    'jobinfo_company_detail_urlpattern': 11,
+    'jobinfo_position_detail_urlpattern': 12,
+    'jobinfo_appCycle_detail_urlpattern': 11,
+    'jobinfo_jobSeeker_detail_urlpattern': 12,
+    'jobinfo_application_detail_urlpattern': 11,
+    'jobinfo_jobRecruiter_autocomplete_urlpattern': 7,
+    'jobinfo_company_autocomplete_urlpattern': 7,
+    'jobinfo_position_autocomplete_urlpattern': 7,
+    'jobinfo_jobSeeker_autocomplete_urlpattern': 7,
+    'jobinfo_jobRecruiter_export_urlpattern': 7,
+    'jobinfo_company_export_urlpattern': 7,
+    'jobinfo_position_export_urlpattern': 7,
+    'jobinfo_appCycle_export_urlpattern': 7,
+    'jobinfo_jobSeeker_export_urlpattern': 7,
+    'jobinfo_application_export_urlpattern': 7,
+    'jobinfo_search_urlpattern': 9,
+    'jobinfo_search_json_urlpattern': 9,
+}
+
+JOBINFO_SLOW_QUERY_COUNT = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'jobinfo': {
+            'handlers': ['console'],
+            'level': 'WARNING' if TESTING else 'INFO',
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators